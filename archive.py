@@ -0,0 +1,187 @@
+from board import Board
+from errors import FileException
+from typing import Optional
+import mmap, os, pathlib, struct, serde
+
+# Save "directories" ending in this are single archive files, instead of real directories
+ARCHIVE_EXT: str = ".archive"
+
+# Every archive starts with a magic number and a format version
+MAGIC: bytes = b"SDKA"
+VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sB3x")
+
+# Every board is a fixed-size record: ID, type, difficulty, flags, then the 81 cells
+# packed 2 per byte (4 bits each, 0 = Empty)
+RECORD: struct.Struct = struct.Struct("<QBBB41s")
+FLAG_DELETED: int = 1  # The record marks its board as deleted
+
+
+def is_archive(save_dir: str) -> bool:
+    """Checks if a save location is an archive file, instead of a directory"""
+    return save_dir.endswith(ARCHIVE_EXT)
+
+
+def pack_record(board: Board, flags: int = 0) -> bytes:
+    """Packs a board into a single archive record"""
+    if not board.id.isdigit() or str(int(board.id)) != board.id:
+        raise FileException(f"Board ID '{board.id}' can't be stored in an archive!")
+    if int(board.id) >= 1 << 64:
+        raise FileException(f"Board ID '{board.id}' is too large for an archive!")
+
+    return RECORD.pack(
+        int(board.id),
+        int(board.type),
+        int(board.difficulty),
+        flags,
+        serde.pack_cells(board.board),
+    )
+
+
+def unpack_record(record: bytes) -> Board:
+    """Unpacks an archive record made by `pack_record()` into a board"""
+    board_id, board_type, board_difficulty, _, cells = RECORD.unpack(record)
+    serde.validate_header(str(board_id), board_type, board_difficulty)
+    return serde.build_board(
+        str(board_id), board_type, board_difficulty, serde.unpack_cells(cells)
+    )
+
+
+class BoardArchive:
+    """An append-only file of fixed-size board records, read through `mmap`.
+
+    Saving or deleting a board appends a record, so the latest record for an ID
+    always wins. `compact()` rewrites the archive with only the live records.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        # Offset of every live board's record, keyed by ID
+        self.index: dict[str, int] = {}
+        self.mapped: Optional[mmap.mmap] = None  # Read-only view of the archive
+        self.mapped_size: int = 0  # Size of the archive when it was last mapped
+
+        # Make sure the archive actually exists, and has a header
+        pathlib.Path(os.path.dirname(os.path.abspath(path))).mkdir(
+            parents=True, exist_ok=True
+        )
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "wb") as file:
+                file.write(HEADER.pack(MAGIC, VERSION))
+
+        self.file = open(path, "r+b")
+        magic, version = HEADER.unpack(self.file.read(HEADER.size).ljust(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            self.file.close()
+            raise FileException(f"'{path}' is not a version {VERSION} board archive!")
+
+        # Drop a partial record left behind by an interrupted write
+        size: int = os.fstat(self.file.fileno()).st_size
+        whole_size: int = size - (size - HEADER.size) % RECORD.size
+        if whole_size != size:
+            self.file.truncate(whole_size)
+
+        self.__build_index()
+
+    def __enter__(self) -> "BoardArchive":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the archive"""
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+        self.file.close()
+
+    def __view(self) -> mmap.mmap:
+        """Returns a read-only view of the whole archive, remapping it if it's grown"""
+        size: int = os.fstat(self.file.fileno()).st_size
+        if self.mapped is None or self.mapped_size != size:
+            if self.mapped is not None:
+                self.mapped.close()
+            self.file.flush()
+            self.mapped = mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_READ)
+            self.mapped_size = size
+
+        return self.mapped
+
+    def __build_index(self) -> None:
+        """Builds the ID -> offset index by scanning every record once"""
+        view: mmap.mmap = self.__view()
+        self.index = {}
+        offset: int = HEADER.size
+        for board_id, _, _, flags, _ in RECORD.iter_unpack(view[HEADER.size :]):
+            if flags & FLAG_DELETED:
+                self.index.pop(str(board_id), None)
+            else:
+                self.index[str(board_id)] = offset
+            offset += RECORD.size
+
+    def __append(self, record: bytes, fsync: bool = False) -> int:
+        """Appends a record to the archive, returning its offset"""
+        offset: int = self.file.seek(0, os.SEEK_END)
+        self.file.write(record)
+        self.file.flush()
+        if fsync:
+            os.fsync(self.file.fileno())
+
+        return offset
+
+    def __contains__(self, board_id: str) -> bool:
+        return board_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def ids(self) -> list[str]:
+        """Returns the IDs of every saved board, sorted by numerical value"""
+        return sorted(self.index, key=int)
+
+    def save(self, board: Board, fsync: bool = False) -> None:
+        """Saves a board, replacing any earlier save of it"""
+        if not board.generated:
+            raise FileException("Called `BoardArchive.save()` on an ungenerated board!")
+
+        self.index[board.id] = self.__append(pack_record(board), fsync=fsync)
+
+    def load(self, board_id: str) -> Optional[Board]:
+        """Loads a single saved board (None if it isn't saved)"""
+        offset: Optional[int] = self.index.get(board_id)
+        if offset is None:
+            return None
+
+        return unpack_record(self.__view()[offset : offset + RECORD.size])
+
+    def delete(self, board_id: str, fsync: bool = False) -> None:
+        """Deletes a saved board"""
+        offset: Optional[int] = self.index.pop(board_id, None)
+        if offset is None:
+            raise FileException(f"Board {board_id} isn't saved in '{self.path}'!")
+
+        # The tombstone only needs the ID, but keeping the old record makes it obvious
+        record: bytearray = bytearray(self.__view()[offset : offset + RECORD.size])
+        record[
+            10
+        ] |= FLAG_DELETED  # Byte 10 is the flags (After the ID, type, and difficulty)
+        self.__append(bytes(record), fsync=fsync)
+
+    def compact(self) -> None:
+        """Rewrites the archive with only its live records"""
+        view: mmap.mmap = self.__view()
+        tmp_path: str = f"{self.path}.tmp"
+        index: dict[str, int] = {}
+        with open(tmp_path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION))
+            for board_id in self.ids():
+                index[board_id] = file.tell()
+                offset: int = self.index[board_id]
+                file.write(view[offset : offset + RECORD.size])
+
+        # Swap the compacted archive in
+        self.close()
+        os.replace(tmp_path, self.path)
+        self.file = open(self.path, "r+b")
+        self.index = index
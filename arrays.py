@@ -0,0 +1,112 @@
+from board import Board
+from errors import BoardException
+from typing import Any, Iterable
+from optional_numpy import HAS_NUMPY, np
+import serde
+
+if HAS_NUMPY:
+    # Value of each cell's character code (" " = 0), and the character of each value
+    TO_VALUE: Any = np.zeros(256, dtype=np.uint8)
+    TO_VALUE[np.frombuffer(b"123456789", dtype=np.uint8)] = np.arange(1, 10)
+    TO_CHAR: Any = np.frombuffer(b" 123456789", dtype=np.uint8)
+    TO_BIT: Any = np.array([0] + [1 << value for value in range(9)], dtype=np.uint16)
+
+
+def require_numpy() -> None:
+    """Raises an `ImportError` if NumPy isn't installed"""
+    if not HAS_NUMPY:
+        raise ImportError("NumPy is needed for `arrays`, but it isn't installed!")
+
+
+def to_stack(boards: Iterable[Board]) -> Any:
+    """Returns boards as one `(N, 9, 9)` uint8 array (0 = Empty).
+
+    Every board's cells are joined into a single buffer, which is viewed as an
+    array without copying, and only then converted to values in one go.
+    """
+    require_numpy()
+    rows: list[str] = ["".join(row) for board in boards for row in board.board]
+
+    return TO_VALUE[np.frombuffer("".join(rows).encode(), dtype=np.uint8)].reshape(
+        -1, 9, 9
+    )
+
+
+def to_array(board: Board) -> Any:
+    """Returns a board as a `(9, 9)` uint8 array (0 = Empty)"""
+    return to_stack([board])[0]
+
+
+def to_cells(array: Any) -> list[list[str]]:
+    """Returns a `(9, 9)` array as the rows of cells `Board.board` holds"""
+    require_numpy()
+    if array.shape != (9, 9) or array.max() > 9:
+        raise BoardException("Called `arrays.to_cells()` on an invalid array!")
+
+    values: str = TO_CHAR[array].tobytes().decode()
+    return [list(values[row * 9 : (row + 1) * 9]) for row in range(9)]
+
+
+def from_array(
+    array: Any, board_id: str, board_type: Board.Type, difficulty: Board.Difficulty
+) -> Board:
+    """Creates a generated board from a `(9, 9)` array"""
+    return serde.build_board(board_id, board_type, difficulty, to_cells(array))
+
+
+def check_stack(stack: Any, full: Any) -> Any:
+    """Checks if every board in a stack follows the rules, see `checker.is_valid()`.
+
+    `full` marks which boards are FULL boards (One per board, or one for all),
+    and the result is an `(N,)` bool array.
+    """
+    require_numpy()
+    # Every value as a bit, so a unit repeats a value exactly when the sum of its
+    # bits differs from their union
+    bits: Any = TO_BIT[stack]
+    repeated: Any = np.zeros(len(stack), dtype=bool)
+    for units, axes in [
+        (bits, 2),  # Rows
+        (bits, 1),  # Columns
+        (bits.reshape(-1, 3, 3, 3, 3), (2, 4)),  # Boxes
+    ]:
+        unions: Any = np.bitwise_or.reduce(units, axis=axes)
+        repeated |= (
+            (units.sum(axis=axes, dtype=np.uint16) != unions)
+            .reshape(len(stack), -1)
+            .any(axis=1)
+        )
+    # Without any repeats, a board with no empty cells has every value everywhere
+    empty: Any = (stack == 0).any(axis=(1, 2))
+
+    return ~repeated & ~(empty & full)
+
+
+def to_removal_masks(stack: Any) -> list[int]:
+    """Returns every board's removal mask, see `Board.get_removal_mask()`"""
+    require_numpy()
+    packed: Any = np.packbits((stack == 0).reshape(-1, 81), axis=1, bitorder="little")
+    return [int.from_bytes(mask.tobytes(), "little") for mask in packed]
+
+
+def apply_removal_masks(stack: Any, masks: Iterable[int]) -> Any:
+    """Returns a copy of a stack with every board's removal mask emptied"""
+    require_numpy()
+    packed: Any = np.frombuffer(
+        b"".join(mask.to_bytes(11, "little") for mask in masks), dtype=np.uint8
+    ).reshape(-1, 11)
+    removed: Any = np.unpackbits(packed, axis=1, count=81, bitorder="little")
+
+    return np.where(removed.reshape(-1, 9, 9) == 1, 0, stack).astype(np.uint8)
+
+
+def count_values(stack: Any) -> Any:
+    """Returns how many times each value (0 = Empty) is in every board, as `(N, 10)`"""
+    require_numpy()
+    return (stack.reshape(-1, 81, 1) == np.arange(10, dtype=np.uint8)).sum(axis=1)
+
+
+def empty_frequency(stack: Any) -> Any:
+    """Returns how often each cell is empty across a stack, as a `(9, 9)` array"""
+    require_numpy()
+    return (stack == 0).mean(axis=0)
@@ -0,0 +1,253 @@
+from board import Board
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from errors import BoardException
+from typing import Iterable, Iterator, Optional, TextIO
+import itertools, arrays, checker, serde, wfc_stack
+
+# A generated board, stripped down to what's needed to rebuild it in another process
+PackedBoard = tuple[str, int, int, list[list[str]]]
+
+# Boards the `STACK` engine generates at once, when it isn't given chunks
+STACK_CHUNK: int = 1024
+
+
+def generate_board(
+    seed: int,
+    difficulty: Optional[Board.Difficulty] = None,
+    engine: Board.Engine = Board.Engine.BITMASK,
+    unique: bool = False,
+) -> Board:
+    """Generates a single board, and gameifies it if `difficulty` is provided"""
+    board: Board = Board()
+    board.generate(seed, engine)
+    if difficulty is not None:
+        board.gameify(difficulty, unique=unique)
+
+    return board
+
+
+def generate_stack(
+    seeds: list[int],
+    difficulty: Optional[Board.Difficulty] = None,
+    unique: bool = False,
+) -> list[Board]:
+    """Generates a board for every seed at once with the `STACK` engine (Needs NumPy).
+
+    The boards are identical to generating them one at a time, and are then
+    gameified one at a time if `difficulty` is provided.
+    """
+    if len(seeds) == 0:
+        return []
+
+    wave: wfc_stack.WaveStack = wfc_stack.generate(seeds)
+    boards: list[Board] = []
+    for seed, values, resets in zip(seeds, wave.values, wave.resets.tolist()):
+        board: Board = arrays.from_array(
+            values.reshape(9, 9), str(seed), Board.Type.FULL, Board.Difficulty.NONE
+        )
+        board.resets = resets
+        if difficulty is not None:
+            board.gameify(difficulty, unique=unique)
+        boards.append(board)
+
+    return boards
+
+
+def _pack(board: Board) -> PackedBoard:
+    """Packs a board so it can be cheaply sent between processes"""
+    return (board.id, int(board.type), int(board.difficulty), board.board)
+
+
+def _unpack(packed: PackedBoard) -> Board:
+    """Rebuilds a board packed by `_pack()`"""
+    board: Board = Board()
+    board.id, board_type, board_difficulty, board.board = packed
+    board.type = Board.Type(board_type)
+    board.difficulty = Board.Difficulty(board_difficulty)
+    board.generated = True
+    Board.note_seed(int(board.id))
+
+    return board
+
+
+def check_generated(boards: list[Board]) -> None:
+    """Raises a `BoardException` describing the first generated board that breaks the rules"""
+    for board, valid in zip(boards, checker.check_many(boards)):
+        if not valid:
+            raise BoardException(
+                f"Generated board '{board.id}' breaks the rules!\n"
+                + "\n".join(checker.find_problems(board))
+            )
+
+
+def _generate_chunk(
+    seeds: list[int],
+    difficulty: Optional[Board.Difficulty],
+    engine: Board.Engine,
+    unique: bool = False,
+) -> list[PackedBoard]:
+    """Generates a chunk of boards inside a worker process"""
+    # `Board.generate()` creates its own seeded RNG for every board, so the boards
+    # don't depend on which worker generated them
+    if engine == Board.Engine.STACK:
+        return [_pack(board) for board in generate_stack(seeds, difficulty, unique)]
+    return [_pack(generate_board(seed, difficulty, engine, unique)) for seed in seeds]
+
+
+def generate_many(
+    seeds: Iterable[int],
+    workers: int = 1,
+    difficulty: Optional[Board.Difficulty] = None,
+    chunk_size: int = 64,
+    engine: Board.Engine = Board.Engine.BITMASK,
+    threads: bool = False,
+    unique: bool = False,
+    validate: bool = False,
+) -> list[Board]:
+    """Generates a board for every seed, spread over `workers` processes.
+
+    Boards are returned in the same order as `seeds`, and are identical to
+    generating them one at a time with `Board.generate()`. With `threads`, a
+    thread pool is used instead of a process pool. `unique` is passed on to
+    `Board.gameify()`. The `STACK` engine generates every chunk at once. With
+    `validate`, every board is checked (See `check_generated()`) before returning.
+    """
+    seeds = list(seeds)
+    boards: list[Board] = []
+    if workers <= 1:
+        if engine == Board.Engine.STACK:
+            boards = [
+                board
+                for start in range(0, len(seeds), STACK_CHUNK)
+                for board in generate_stack(
+                    seeds[start : start + STACK_CHUNK], difficulty, unique
+                )
+            ]
+        else:
+            boards = [
+                generate_board(seed, difficulty, engine, unique) for seed in seeds
+            ]
+        if validate:
+            check_generated(boards)
+        return boards
+
+    # Split the seeds into chunks, so each worker gets a decent amount of work per task
+    chunks: list[list[int]] = [
+        seeds[start : start + chunk_size] for start in range(0, len(seeds), chunk_size)
+    ]
+
+    executor: Executor = (
+        ThreadPoolExecutor(max_workers=workers)
+        if threads
+        else ProcessPoolExecutor(max_workers=workers)
+    )
+    with executor:
+        for packed_chunk in executor.map(
+            _generate_chunk,
+            chunks,
+            [difficulty] * len(chunks),
+            [engine] * len(chunks),
+            [unique] * len(chunks),
+        ):
+            boards.extend(_unpack(packed) for packed in packed_chunk)
+
+    if validate:
+        check_generated(boards)
+    return boards
+
+
+def _iter_generated(
+    seeds: Iterable[int],
+    difficulty: Optional[Board.Difficulty],
+    engine: Board.Engine,
+    workers: int,
+    chunk_size: int,
+    unique: bool = False,
+) -> Iterator[Board]:
+    """Lazily generates a board for every seed, in order, over `workers` processes"""
+    if workers <= 1 and engine != Board.Engine.STACK:
+        for seed in seeds:
+            yield generate_board(seed, difficulty, engine, unique)
+        return
+
+    seeds_iter: Iterator[int] = iter(seeds)
+    if workers <= 1:
+        # The `STACK` engine still needs chunks, only without any workers
+        while True:
+            stack_chunk: list[int] = list(itertools.islice(seeds_iter, STACK_CHUNK))
+            if len(stack_chunk) == 0:
+                return
+            yield from generate_stack(stack_chunk, difficulty, unique)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded window of chunks in flight, and yield them in submission order
+        pending: deque[Future[list[PackedBoard]]] = deque()
+        while True:
+            while len(pending) < workers * 2:
+                chunk: list[int] = list(itertools.islice(seeds_iter, chunk_size))
+                if len(chunk) == 0:
+                    break
+                pending.append(
+                    executor.submit(_generate_chunk, chunk, difficulty, engine, unique)
+                )
+
+            if len(pending) == 0:
+                return
+
+            for packed in pending.popleft().result():
+                yield _unpack(packed)
+
+
+def iter_boards(
+    start_seed: int = 0,
+    difficulty: Optional[Board.Difficulty] = None,
+    count: Optional[int] = None,
+    sink: Optional[TextIO] = None,
+    engine: Board.Engine = Board.Engine.BITMASK,
+    workers: int = 1,
+    chunk_size: int = 64,
+    unique: bool = False,
+    validate: bool = False,
+) -> Iterator[Board]:
+    """Lazily generates boards with consecutive seeds, starting at `start_seed`.
+
+    Runs forever unless `count` is provided. If a `sink` is provided, every
+    board is also written to it as a line of JSON, before it's yielded. With
+    more than 1 worker, boards are generated ahead in a process pool, but
+    only a couple of chunks per worker are ever held in memory. `unique` is
+    passed on to `Board.gameify()`. With `validate`, every board is checked
+    (See `check_generated()`) before it's written or yielded.
+    """
+    seeds: Iterable[int] = (
+        itertools.count(start_seed)
+        if count is None
+        else range(start_seed, start_seed + count)
+    )
+    for board in _iter_generated(
+        seeds, difficulty, engine, workers, chunk_size, unique
+    ):
+        if validate:
+            check_generated([board])
+        if sink is not None:
+            sink.write(serde.serialize(board) + "\n")
+        yield board
+
+
+def write_boards(boards: Iterable[Board], sink: TextIO) -> int:
+    """Writes every board to `sink` as a line of JSON, returning how many were written"""
+    written: int = 0
+    for board in boards:
+        sink.write(serde.serialize(board) + "\n")
+        written += 1
+
+    return written
+
+
+def derive_many(base_board: Board, n: int, start_seed: int = 0) -> list[Board]:
+    """Derives `n` boards from `base_board`, with consecutive transform seeds.
+
+    Every derived board is a rearranged copy (See `Board.transform()`), so it's
+    far cheaper than generating a new board, and takes the next unused ID.
+    """
+    return [base_board.transform(seed) for seed in range(start_seed, start_seed + n)]
@@ -0,0 +1,380 @@
+# ======================================================================================
+# BENCHMARKS
+# ======================================================================================
+# Run with `python benchmarks.py [NAME ...]`. Without any names, every benchmark runs.
+# Each benchmark prints its own results; numbers are only comparable on the same machine.
+
+import sys, time
+
+
+def bench_generate_modes(count: int = 2000) -> None:
+    """Times `Board.generate()` in every engine mode, with reset/backtrack counts"""
+    from board import Board
+
+    modes: list[tuple[str, Board.Engine, bool, bool]] = [
+        ("cell", Board.Engine.CELL, False, False),
+        ("bitmask", Board.Engine.BITMASK, False, False),
+        ("bitmask+backtrack", Board.Engine.BITMASK, True, False),
+        ("bitmask+propagate", Board.Engine.BITMASK, False, True),
+        ("bitmask+backtrack+propagate", Board.Engine.BITMASK, True, True),
+    ]
+
+    print(f"generate_modes: {count} seeds")
+    for name, engine, backtrack, propagate in modes:
+        times: list[float] = []
+        resets: int = 0
+        backtracks: int = 0
+        for seed in range(count):
+            board: Board = Board()
+            start: float = time.perf_counter()
+            board.generate(seed, engine, backtrack=backtrack, propagate=propagate)
+            times.append(time.perf_counter() - start)
+            resets += board.resets
+            backtracks += board.backtracks
+
+        times.sort()
+        print(
+            f"  {name:<28} mean {sum(times) / count * 1000:6.2f} ms"
+            f"  p99 {times[int(count * 0.99)] * 1000:6.2f} ms"
+            f"  max {times[-1] * 1000:6.2f} ms"
+            f"  resets {resets:>6}  backtracks {backtracks:>6}"
+        )
+
+
+def bench_generate_many(count: int = 4000) -> None:
+    """Times `batch.generate_many()` with an increasing number of workers"""
+    import batch, os
+
+    print(f"generate_many: {count} seeds, {os.cpu_count()} CPUs")
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start: float = time.perf_counter()
+        batch.generate_many(range(count), workers=workers)
+        elapsed: float = time.perf_counter() - start
+        print(f"  workers {workers:>3}  {count / elapsed:9.1f} boards/sec")
+
+
+def bench_save_board(count: int = 500) -> None:
+    """Times `files.save_board()` with, and without, fsync"""
+    import batch, files, tempfile
+
+    boards = batch.generate_many(range(count))
+    print(f"save_board: {count} boards")
+    for fsync in [False, True]:
+        with tempfile.TemporaryDirectory() as save_dir:
+            start: float = time.perf_counter()
+            for board in boards:
+                files.save_board(board, save_dir=save_dir, fsync=fsync)
+            elapsed: float = time.perf_counter() - start
+        print(f"  fsync {str(fsync):<5}  {count / elapsed:9.1f} saves/sec")
+
+
+def bench_list_saves(counts: tuple[int, ...] = (1_000, 10_000, 100_000)) -> None:
+    """Times `files.get_all_saved_board_files()` as the number of saves grows"""
+    import files, os, tempfile
+
+    print("list_saves:")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as save_dir:
+            # Listing never opens the saves, so empty files are enough
+            for board_id in range(count):
+                os.close(os.open(f"{save_dir}/{board_id}.board", os.O_CREAT))
+
+            start: float = time.perf_counter()
+            files.get_all_saved_board_files(save_dir=save_dir)
+            elapsed: float = time.perf_counter() - start
+        print(f"  {count:>7} files  {elapsed * 1000:9.1f} ms")
+
+
+def bench_load_saves(count: int = 10_000) -> None:
+    """Times `files.load_saved_boards()` with a save directory, and with an archive"""
+    import batch, files, tempfile
+
+    boards = batch.generate_many(range(count))
+    print(f"load_saves: {count} boards")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, save_dir in [
+            ("directory", f"{tmp_dir}/saved_boards"),
+            ("archive", f"{tmp_dir}/saved_boards.archive"),
+        ]:
+            files.save_boards(boards, save_dir=save_dir)
+            start: float = time.perf_counter()
+            files.load_saved_boards(save_dir=save_dir)
+            elapsed: float = time.perf_counter() - start
+            print(f"  {name:<10}  {count / elapsed:9.1f} loads/sec")
+
+
+def bench_serde(count: int = 2000) -> None:
+    """Compares the size, and encode/decode time, of every serialized form"""
+    import batch, serde
+    from board import Board
+    from typing import Any, Callable
+
+    boards = batch.generate_many(range(count), difficulty=Board.Difficulty.MEDIUM)
+    # The forms are text or bytes, so each form's codec only takes its own serials
+    forms: list[tuple[str, Callable[[Board], Any], Callable[[Any], Board]]] = [
+        ("json", serde.serialize, serde.deserialize),
+        ("binary", serde.serialize_binary, serde.deserialize_binary),
+        ("string", serde.serialize_string, serde.deserialize_string),
+    ]
+
+    print(f"serde: {count} boards")
+    for name, encode, decode in forms:
+        start: float = time.perf_counter()
+        serials = [encode(board) for board in boards]
+        encode_time: float = time.perf_counter() - start
+
+        start: float = time.perf_counter()
+        for serial in serials:
+            decode(serial)
+        decode_time: float = time.perf_counter() - start
+
+        print(
+            f"  {name:<7}  {len(serials[0]):>4} bytes"
+            f"  encode {encode_time / count * 1e6:6.1f} us"
+            f"  decode {decode_time / count * 1e6:6.1f} us"
+        )
+
+
+def bench_check(count: int = 10_000) -> None:
+    """Times `checker.check_many()` over full, and game, boards"""
+    import batch, checker
+    from board import Board
+
+    print(f"check: {count} boards")
+    for difficulty in [None, Board.Difficulty.HARD]:
+        boards = batch.generate_many(range(count), difficulty=difficulty)
+        start: float = time.perf_counter()
+        checker.check_many(boards)
+        elapsed: float = time.perf_counter() - start
+        name: str = "full" if difficulty is None else "game"
+        print(f"  {name:<5}  {count / elapsed:9.1f} boards/sec")
+
+
+def bench_solve(count: int = 1000) -> None:
+    """Times `Board.solve()` and `Board.count_solutions()` on generated puzzles"""
+    import batch
+    from board import Board
+
+    print(f"solve: {count} puzzles")
+    for difficulty in [Board.Difficulty.EASY, Board.Difficulty.HARD]:
+        boards = batch.generate_many(range(count), difficulty=difficulty)
+        for name, method in [
+            ("solve", Board.solve),
+            ("count_solutions", Board.count_solutions),
+        ]:
+            times: list[float] = []
+            for board in boards:
+                start: float = time.perf_counter()
+                method(board)
+                times.append(time.perf_counter() - start)
+
+            times.sort()
+            print(
+                f"  {str(difficulty):<6}  {name:<15}"
+                f"  mean {sum(times) / count * 1000:6.3f} ms"
+                f"  p99 {times[int(count * 0.99)] * 1000:6.3f} ms"
+            )
+
+
+def bench_gameify_unique(count: int = 500) -> None:
+    """Times `Board.gameify()` with, and without, `unique`, and counts ambiguous puzzles"""
+    import batch
+    from board import Board
+    from copy import deepcopy
+
+    full_boards = batch.generate_many(range(count))
+    print(f"gameify_unique: {count} boards")
+    for difficulty in [Board.Difficulty.EASY, Board.Difficulty.HARD]:
+        for unique in [False, True]:
+            boards = deepcopy(full_boards)
+            start: float = time.perf_counter()
+            for board in boards:
+                board.gameify(difficulty, unique=unique)
+            elapsed: float = time.perf_counter() - start
+
+            ambiguous: int = sum(board.count_solutions() > 1 for board in boards)
+            empty: int = sum(row.count(" ") for board in boards for row in board.board)
+            print(
+                f"  {str(difficulty):<6}  unique {str(unique):<5}"
+                f"  mean {elapsed / count * 1000:6.2f} ms"
+                f"  removed {empty / count:5.1f}  ambiguous {ambiguous:>4}"
+            )
+
+
+def bench_grade(count: int = 1000) -> None:
+    """Times `Board.grade()`, and graded `Board.gameify()`, on generated seeds"""
+    import batch, collections
+    from board import Board
+
+    print(f"grade: {count} puzzles")
+    for unique in [False, True]:
+        boards = batch.generate_many(
+            range(count), difficulty=Board.Difficulty.HARD, unique=unique
+        )
+        start: float = time.perf_counter()
+        grades = [board.grade() for board in boards]
+        elapsed: float = time.perf_counter() - start
+
+        hardest = collections.Counter(grade.hardest.name for grade in grades)
+        print(
+            f"  hard unique {str(unique):<5}  {count / elapsed * 60:9.0f} boards/min"
+            f"  {dict(hardest.most_common())}"
+        )
+
+    for difficulty in [
+        Board.Difficulty.EASY,
+        Board.Difficulty.MEDIUM,
+        Board.Difficulty.HARD,
+    ]:
+        boards = batch.generate_many(range(count // 10))
+        start: float = time.perf_counter()
+        for board in boards:
+            board.gameify(difficulty, graded=True)
+        elapsed: float = time.perf_counter() - start
+
+        # Boards that missed the target are labeled with the difficulty they reached
+        reached: int = sum(board.difficulty == difficulty for board in boards)
+        print(
+            f"  gameify graded {str(difficulty):<6}"
+            f"  mean {elapsed / len(boards) * 1000:6.2f} ms"
+            f"  reached {reached}/{len(boards)}"
+        )
+
+
+def bench_derive(count: int = 10_000) -> None:
+    """Compares deriving boards by symmetry against generating new ones"""
+    import batch
+    from board import Board
+
+    base: Board = Board()
+    base.generate(0, Board.Engine.BITMASK)
+
+    print(f"derive: {count} boards")
+    start: float = time.perf_counter()
+    batch.derive_many(base, count)
+    elapsed: float = time.perf_counter() - start
+    print(f"  derive_many    mean {elapsed / count * 1e6:8.1f} us")
+
+    start: float = time.perf_counter()
+    batch.generate_many(range(count // 10))
+    elapsed: float = time.perf_counter() - start
+    print(f"  generate_many  mean {elapsed / (count // 10) * 1e6:8.1f} us")
+
+
+def bench_dedup(count: int = 1_000) -> None:
+    """Times canonical forms, and saving with duplicates skipped"""
+    import batch, dedup, files, tempfile
+    from board import Board
+
+    boards: list[Board] = batch.generate_many(range(count))
+    # Every other board repeats an earlier one up to symmetry
+    derived: list[Board] = [
+        boards[index].transform(index, board_id=str(count + index))
+        for index in range(0, count, 2)
+    ]
+
+    print(f"dedup: {count} boards + {len(derived)} repeats")
+    start: float = time.perf_counter()
+    for board in boards:
+        board.canonical_form()
+    elapsed: float = time.perf_counter() - start
+    print(f"  canonical_form  mean {elapsed / count * 1e3:8.2f} ms")
+
+    with tempfile.TemporaryDirectory() as save_dir:
+        start: float = time.perf_counter()
+        files.save_boards(boards + derived, save_dir=save_dir, skip_duplicates=True)
+        elapsed: float = time.perf_counter() - start
+        dedup_index: dedup.DedupIndex = dedup.get_index(save_dir)
+        print(
+            f"  save_boards     {len(boards + derived) / elapsed:8.1f} boards/sec"
+            f" ({dedup_index.get_duplicate_rate():.1%} duplicates)"
+        )
+
+        # Checking a board is then just a lookup
+        key: str = dedup.get_canonical_key(derived[0])
+        start: float = time.perf_counter()
+        for _ in range(count):
+            dedup_index.find(derived[0].id, key)
+        elapsed: float = time.perf_counter() - start
+        print(f"  find            mean {elapsed / count * 1e6:8.2f} us")
+
+
+def bench_arrays(count: int = 10_000) -> None:
+    """Compares the NumPy stack against the pure Python path over many boards"""
+    import arrays, batch, checker
+    from board import Board
+
+    if not arrays.HAS_NUMPY:
+        print("arrays: skipped, NumPy isn't installed")
+        return
+
+    boards: list[Board] = batch.generate_many(
+        range(count), difficulty=Board.Difficulty.HARD
+    )
+    print(f"arrays: {count} boards")
+
+    start: float = time.perf_counter()
+    stack = arrays.to_stack(boards)
+    elapsed: float = time.perf_counter() - start
+    print(f"  to_stack          {count / elapsed:10.1f} boards/sec")
+
+    for name, python, numpy in [
+        (
+            "check",
+            lambda: [checker.is_valid(board) for board in boards],
+            lambda: arrays.check_stack(stack, False),
+        ),
+        (
+            "removal masks",
+            lambda: [board.get_removal_mask() for board in boards],
+            lambda: arrays.to_removal_masks(stack),
+        ),
+    ]:
+        for path, method in [("python", python), ("numpy", numpy)]:
+            start: float = time.perf_counter()
+            method()
+            elapsed: float = time.perf_counter() - start
+            print(f"  {name:<13} {path:<6} {count / elapsed:10.1f} boards/sec")
+
+
+def bench_generate_stack(count: int = 4000) -> None:
+    """Compares the `STACK` engine against generating boards one at a time"""
+    import batch, wfc_stack
+    from board import Board
+
+    if not wfc_stack.HAS_NUMPY:
+        print("generate_stack: skipped, NumPy isn't installed")
+        return
+
+    print(f"generate_stack: {count} seeds")
+    for name, engine in [
+        ("bitmask", Board.Engine.BITMASK),
+        ("stack", Board.Engine.STACK),
+    ]:
+        start: float = time.perf_counter()
+        batch.generate_many(range(count), engine=engine)
+        elapsed: float = time.perf_counter() - start
+        print(f"  {name:<8} {count / elapsed:9.1f} boards/sec")
+
+
+BENCHMARKS = {
+    "generate_modes": bench_generate_modes,
+    "generate_many": bench_generate_many,
+    "generate_stack": bench_generate_stack,
+    "save_board": bench_save_board,
+    "list_saves": bench_list_saves,
+    "load_saves": bench_load_saves,
+    "serde": bench_serde,
+    "check": bench_check,
+    "solve": bench_solve,
+    "gameify_unique": bench_gameify_unique,
+    "grade": bench_grade,
+    "derive": bench_derive,
+    "dedup": bench_dedup,
+    "arrays": bench_arrays,
+}
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or list(BENCHMARKS):
+        BENCHMARKS[name]()
@@ -1,13 +1,15 @@
 from enum import IntEnum
 from cell import Cell
 from copy import deepcopy
-from rand_man import Rand
+from rand_man import Rng
 from errors import BoardException
-import random
+from typing import Optional
+import threading, grader, solver, symmetry, wfc
 
 
 class Board:
     last_seed: int = 0  # Tracks the last seed used for board generation
+    last_seed_lock: threading.Lock = threading.Lock()  # Guards `last_seed` updates
 
     class Type(IntEnum):
         """Enum for board types."""
@@ -36,6 +38,15 @@ class Board:
 
             return text
 
+    class Engine(IntEnum):
+        """Enum for board generation engines."""
+
+        CELL = 0  # `Cell` objects with list-backed options
+        BITMASK = 1  # Integer bitmasks of options (See `wfc.py`)
+        # Many boards at once, as arrays of options (See `wfc_stack.py`). Only
+        # `batch` generates with it, a single board is generated like `BITMASK`.
+        STACK = 2
+
     def __eq__(self, value: object) -> bool:
         """Checks if two boards are equal."""
         if type(value) != Board:  # Ensure the other object is a Board
@@ -60,13 +71,29 @@ class Board:
             [" " for _ in range(9)] for _ in range(9)
         ]  # Public board representation
         # CORE CONCEPT: Instance of a hidden attribute
-        self.__board: list[list[Cell]] = [
-            [Cell() for _ in range(9)] for _ in range(9)
-        ]  # Internal board representation
+        # Internal board representation, only built when generating with the `Cell`
+        # engine (Loaded boards never need it)
+        self.__board: list[list[Cell]] = []
         self.generated: bool = False  # Flag indicating if the board has been generated
-
-    def gameify(self, difficulty: Difficulty) -> None:
-        """Convert a full board into a game board by removing cells."""
+        self.resets: int = 0  # Full resets needed during generation
+        self.backtracks: int = 0  # Collapse decisions undone during generation
+        self.base_id: str = (
+            ""  # ID of the board this was derived from ("" = Not derived)
+        )
+        self.transform_seed: int = 0  # Seed of the transform it was derived with
+
+    def gameify(
+        self, difficulty: Difficulty, unique: bool = False, graded: bool = False
+    ) -> None:
+        """Convert a full board into a game board by removing cells.
+
+        With `unique`, a cell is only removed if the puzzle still has exactly one
+        solution, so fewer cells may end up removed than the difficulty asks for.
+        With `graded`, removals are also kept only while `grade()` stays at or
+        below `difficulty`, stopping once it's reached (And the usual number of
+        cells are removed). If no removal reaches it, the board is labeled with
+        the difficulty it does grade as instead.
+        """
         if not self.generated:
             raise BoardException(
                 "Called `Board.gameify()` on an ungenerated board!"
@@ -94,14 +121,228 @@ class Board:
             for x in range(len(self.board[y])):
                 # CORE CONCEPT: Instance of a `tuple` or `list` with methods used on them
                 cells.append((x, y))
-        removed_cells: list[tuple[int, int]] = random.sample(
-            cells, num_to_remove
-        )  # Randomly select cells to remove
+
+        # Seed the removals from the board's ID and difficulty, so the same board is
+        # always gameified the same way
+        rng: Rng = Rng(Board.get_gameify_seed(self.id, difficulty))
+        if graded:
+            removed_cells: list[tuple[int, int]] = self.__sample_graded_removals(
+                rng, cells, num_to_remove, difficulty
+            )
+        elif unique:
+            removed_cells: list[tuple[int, int]] = self.__sample_unique_removals(
+                rng, cells, num_to_remove
+            )
+        else:
+            removed_cells: list[tuple[int, int]] = rng.local_random.sample(
+                cells, num_to_remove
+            )  # Randomly select cells to remove
 
         # Remove the selected cells from the board
         for x, y in removed_cells:
             self.board[y][x] = " "  # Clear the cell
 
+        if graded:
+            # The target isn't always reachable, so label the board by its grade
+            self.difficulty = Board.Difficulty(self.grade().get_difficulty())
+
+    def __sample_unique_removals(
+        self, rng: Rng, cells: list[tuple[int, int]], num_to_remove: int
+    ) -> list[tuple[int, int]]:
+        """Randomly selects up to `num_to_remove` cells, keeping the solution unique."""
+        # The solver's state is updated cell by cell, instead of being rebuilt for
+        # every removal it checks
+        board_solver: solver.Solver = solver.Solver(self.__get_values())
+        removed_cells: list[tuple[int, int]] = []
+        for x, y in rng.local_random.sample(cells, len(cells)):
+            if len(removed_cells) == num_to_remove:
+                break
+
+            index: int = (y * 9) + x
+            value: int = board_solver.values[index]
+            board_solver.remove(index)
+            if len(board_solver.solve(2)) == 1:
+                removed_cells.append((x, y))
+            else:
+                board_solver.place(
+                    index, value
+                )  # Removing it made the puzzle ambiguous
+
+        return removed_cells
+
+    def __sample_graded_removals(
+        self,
+        rng: Rng,
+        cells: list[tuple[int, int]],
+        num_to_remove: int,
+        difficulty: Difficulty,
+    ) -> list[tuple[int, int]]:
+        """Randomly selects cells to remove, until the puzzle grades as `difficulty`."""
+        board_solver: solver.Solver = solver.Solver(self.__get_values())
+        removed_cells: list[tuple[int, int]] = []
+        for x, y in rng.local_random.sample(cells, len(cells)):
+            index: int = (y * 9) + x
+            value: int = board_solver.values[index]
+            board_solver.remove(index)
+            if len(board_solver.solve(2)) == 1:
+                # Nothing grades above hard, so hard puzzles are only graded once
+                # enough cells are removed to possibly stop
+                if (
+                    difficulty == Board.Difficulty.HARD
+                    and len(removed_cells) + 1 < num_to_remove
+                ):
+                    removed_cells.append((x, y))
+                    continue
+
+                level: int = grader.grade(board_solver.values).get_difficulty()
+                if level <= difficulty:
+                    removed_cells.append((x, y))
+                    if level == difficulty and len(removed_cells) >= num_to_remove:
+                        break
+                    continue
+
+            board_solver.place(index, value)  # Removing it went too far
+
+        return removed_cells
+
+    def transform(self, seed: int, board_id: Optional[str] = None) -> "Board":
+        """Returns a copy of the board, rearranged by the transform with `seed`.
+
+        The copy is just as valid, and is recorded as derived from this board. It
+        takes the next unused ID, unless `board_id` is provided.
+        """
+        if not self.generated:
+            raise BoardException("Called `Board.transform()` on an ungenerated board!")
+        if self.base_id != "":
+            raise BoardException("Called `Board.transform()` on a derived board!")
+
+        if board_id is None:
+            with Board.last_seed_lock:
+                Board.last_seed += 1
+                board_id = str(Board.last_seed)
+
+        values: list[str] = symmetry.Transform(seed).apply(
+            [value for row in self.board for value in row]
+        )
+        board: Board = Board()
+        board.id = board_id
+        board.type = self.type
+        board.difficulty = self.difficulty
+        board.board = [values[row * 9 : (row + 1) * 9] for row in range(9)]
+        board.generated = True
+        board.base_id = self.id
+        board.transform_seed = seed
+
+        return board
+
+    def grade(self) -> grader.Grade:
+        """Grades the board by the hardest solving technique, and steps, it needs."""
+        if not self.generated:
+            raise BoardException("Called `Board.grade()` on an ungenerated board!")
+
+        return grader.grade(self.__get_values())
+
+    def canonical_form(self) -> str:
+        """Returns the board's form shared by every board that's the same up to symmetry.
+
+        See `symmetry.canonical_form()`.
+        """
+        if not self.generated:
+            raise BoardException(
+                "Called `Board.canonical_form()` on an ungenerated board!"
+            )
+
+        return symmetry.canonical_form(self.__get_values())
+
+    @staticmethod
+    def note_seed(seed: int) -> None:
+        """Raises `Board.last_seed` to `seed`, if it's greater, under its lock."""
+        with Board.last_seed_lock:
+            if seed > Board.last_seed:
+                Board.last_seed = seed
+
+    @staticmethod
+    def get_gameify_seed(board_id: str, difficulty: Difficulty) -> int:
+        """Returns the seed `gameify()` removes a board's cells with."""
+        # Every ID and difficulty pair gets its own seed
+        return (int(board_id) * 4) + int(difficulty)
+
+    def get_removal_mask(self) -> int:
+        """Returns an 81-bit mask of the empty cells (Bit `y * 9 + x` set = Empty)."""
+        mask: int = 0
+        for index, value in enumerate(value for row in self.board for value in row):
+            if value == " ":
+                mask |= 1 << index
+
+        return mask
+
+    @staticmethod
+    def from_removal_mask(seed: int, difficulty: Difficulty, mask: int) -> "Board":
+        """Rebuilds a game board from its seed, difficulty, and removal mask."""
+        board: Board = Board()
+        board.generate(seed, Board.Engine.BITMASK)
+        board.__apply_removal_mask(difficulty, mask)
+
+        return board
+
+    @staticmethod
+    def from_derivation(
+        board_id: str,
+        base_id: str,
+        transform_seed: int,
+        difficulty: Difficulty,
+        mask: int,
+    ) -> "Board":
+        """Rebuilds a derived board from its base's seed, transform, and removal mask."""
+        base: Board = Board()
+        base.generate(int(base_id), Board.Engine.BITMASK)
+        board: Board = base.transform(transform_seed, board_id=board_id)
+        board.__apply_removal_mask(difficulty, mask)
+        Board.note_seed(int(board_id))  # Keep new IDs after the derived board's
+
+        return board
+
+    def __apply_removal_mask(self, difficulty: Difficulty, mask: int) -> None:
+        """Empties the cells in `mask`, turning the board into a game board."""
+        if difficulty != Board.Difficulty.NONE:
+            self.type = Board.Type.GAME
+            self.difficulty = difficulty
+        for index in range(81):
+            if mask >> index & 1:
+                self.board[index // 9][index % 9] = " "
+
+    def __get_values(self) -> list[int]:
+        """Returns the board's cells as 81 row-major values (0 = Empty)."""
+        return [
+            0 if value == " " else int(value) for row in self.board for value in row
+        ]
+
+    def solve(self) -> Optional["Board"]:
+        """Returns a solved, full, copy of the board (None if it has no solution)."""
+        if not self.generated:
+            raise BoardException("Called `Board.solve()` on an ungenerated board!")
+
+        values: Optional[list[int]] = solver.solve(self.__get_values())
+        if values is None:
+            return None
+
+        board: Board = Board()
+        board.id = self.id
+        board.type = Board.Type.FULL
+        board.__load_values(values)
+        board.generated = True
+
+        return board
+
+    def count_solutions(self, limit: int = 2) -> int:
+        """Counts the board's solutions, stopping once `limit` are found."""
+        if not self.generated:
+            raise BoardException(
+                "Called `Board.count_solutions()` on an ungenerated board!"
+            )
+
+        return solver.count_solutions(self.__get_values(), limit)
+
     def format(self) -> str:
         """Returns the stored Sudoku board as a formatted string table."""
         # Define the table components
@@ -130,26 +371,52 @@ class Board:
 
         return text  # Return the formatted board as a string
 
-    def generate(self, seed: int) -> None:
-        """Generate a board with the provided seed."""
+    def generate(
+        self,
+        seed: int,
+        engine: Engine = Engine.CELL,
+        backtrack: bool = False,
+        propagate: bool = False,
+    ) -> None:
+        """Generate a board with the provided seed, using the chosen engine.
+
+        `backtrack` rewinds collapse decisions on a contradiction instead of
+        resetting the whole board, and `propagate` collapses naked and hidden
+        singles after every collapse. Both generate a different board per seed.
+        """
         if self.generated:
             # Prevent generating a board that has already been generated
             raise BoardException(
                 "Called `Board.generate()` on an already generated board!"
             )
 
-        # Set the random seed for board generation
-        Rand.set_seed(seed)  # type: ignore
-        self.id: str = str(seed)  # Assign the seed as the board's unique ID
-        if (
-            seed > Board.last_seed
-        ):  # Update the last seed if the current seed is greater
-            Board.last_seed: int = seed
+        if (backtrack or propagate) and engine != Board.Engine.BITMASK:
+            raise BoardException(
+                f"Called `Board.generate()` with `backtrack` or `propagate` on the `{engine.name}` engine!"
+            )
 
+        # Create this generation's own seeded RNG, so concurrent generations can't
+        # interfere with each other
+        rng: Rng = Rng(seed)
+        self.id: str = str(seed)  # Assign the seed as the board's unique ID
+        Board.note_seed(seed)  # Update the last seed if the current seed is greater
+
+        if engine != Board.Engine.CELL:
+            # Every engine consumes `rng` identically, so they generate the same board
+            wave: wfc.Wave = wfc.generate(rng, backtrack=backtrack, propagate=propagate)
+            self.__load_values(wave.values)
+            self.resets = wave.resets
+            self.backtracks = wave.backtracks
+            self.generated = True
+            self.type = Board.Type.FULL
+            return
+
+        self.__reset()  # Build the internal board
         while True:
             # Check for contradictions in the board
             if self.__has_contradiction():
                 self.__reset()  # Reset the board if contradictions are found
+                self.resets += 1
 
             # Get the lowest entropy value among all cells
             lowest_entropy: int = self.__get_lowest_entropy()
@@ -169,12 +436,12 @@ class Board:
 
             # Randomly select one of the cells with the lowest entropy
             # `coords` is guaranteed to be populated because the board is not solved
-            selected_cell_index: int = Rand.random() % len(coords)  # type: ignore
+            selected_cell_index: int = rng.random() % len(coords)
             # CORE CONCEPT: Instance of unpacking
             x, y = coords[selected_cell_index]
 
             # Collapse the selected cell to a single value
-            self.__board[y][x].collapse()
+            self.__board[y][x].collapse(rng)
             value = self.__board[y][x].get_value()
 
             # Propagate the collapsed value to other cells
@@ -199,6 +466,12 @@ class Board:
         # Mark the board as fully filled
         self.type = Board.Type.FULL
 
+    def __load_values(self, values: list[int]) -> None:
+        """Loads 81 row-major collapsed values into the public board."""
+        for y in range(9):
+            for x in range(9):
+                self.board[y][x] = str(values[(y * 9) + x])
+
     def __get_lowest_entropy(self) -> int:
         """Returns the lowest, non-zero, cell entropy."""
         lowest_entropy: int = 10  # Start with the maximum possible entropy
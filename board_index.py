@@ -0,0 +1,178 @@
+from board import Board
+from errors import DeserializerException
+from typing import Any, Optional
+import json, os, pathlib, zlib, disk, files, serde
+
+# The index lives alongside the saves. It doesn't end in `.board`, so it's never
+# mistaken for a save itself.
+INDEX_FILENAME: str = "index.json"
+INDEX_VERSION: int = 2
+
+
+class BoardMeta:
+    """Everything needed to list a saved board, without loading its grid"""
+
+    def __init__(
+        self,
+        id: str,
+        type: Board.Type,
+        difficulty: Board.Difficulty,
+        size: int,
+        mtime_ns: int,
+        checksum: int,
+    ) -> None:
+        self.id: str = id  # The board's unique ID
+        self.type: Board.Type = type  # Board type
+        self.difficulty: Board.Difficulty = difficulty  # Difficulty level
+        self.size: int = size  # Size of the board's data, in bytes
+        self.mtime_ns: int = mtime_ns  # Modification time of the save file
+        self.checksum: int = checksum  # CRC-32 of the board's data
+
+    def __eq__(self, value: object) -> bool:
+        """Checks if two board metadata entries are equal."""
+        if type(value) != BoardMeta:
+            return False
+
+        return self.to_list() == value.to_list() and self.id == value.id
+
+    def to_list(self) -> list[int]:
+        """Returns the metadata as a compact list, for the index file"""
+        return [
+            int(self.type),
+            int(self.difficulty),
+            self.size,
+            self.mtime_ns,
+            self.checksum,
+        ]
+
+    @staticmethod
+    def from_list(board_id: str, data: list[int]) -> "BoardMeta":
+        """Creates metadata from a list made by `BoardMeta.to_list()`"""
+        return BoardMeta(
+            board_id,
+            Board.Type(data[0]),
+            Board.Difficulty(data[1]),
+            data[2],
+            data[3],
+            data[4],
+        )
+
+
+def read_metadata(filename: str, save_dir: str = files.save_dir) -> Optional[BoardMeta]:
+    """Reads the metadata of a single save file (None if it's corrupted)"""
+    file_path: str = f"{save_dir}/{filename}"
+    with open(file_path, "rb") as file:
+        data_bytes: bytes = file.read()
+        mtime_ns: int = os.fstat(file.fileno()).st_mtime_ns
+
+    # Only the fields needed for listing are checked. The grid is fully validated
+    # by `serde.deserialize_any()` when the board is actually loaded.
+    try:
+        if data_bytes.lstrip().startswith(b"{"):
+            data: Any = json.loads(data_bytes)
+            board_id: str = data["id"]
+            board_type: Board.Type = Board.Type(data["type"])
+            board_difficulty: Board.Difficulty = Board.Difficulty(data["difficulty"])
+        else:
+            # The other forms are small enough to just be deserialized
+            board: Board = serde.deserialize_any(data_bytes)
+            board_id, board_type, board_difficulty = (
+                board.id,
+                board.type,
+                board.difficulty,
+            )
+    except (ValueError, TypeError, KeyError, DeserializerException):
+        return None
+    # The index is keyed by filename, so a save under another ID's name is corrupted
+    if f"{board_id}.board" != filename:
+        return None
+
+    return BoardMeta(
+        board_id,
+        board_type,
+        board_difficulty,
+        len(data_bytes),
+        mtime_ns,
+        zlib.crc32(data_bytes),
+    )
+
+
+def load_index(save_dir: str = files.save_dir) -> dict[str, BoardMeta]:
+    """Loads the persisted index (Empty if it's missing or unreadable)"""
+    try:
+        with open(f"{save_dir}/{INDEX_FILENAME}", "r") as file:
+            data: Any = json.loads(file.read())
+        if data["version"] != INDEX_VERSION:
+            return {}
+
+        return {
+            board_id: BoardMeta.from_list(board_id, entry)
+            for board_id, entry in data["boards"].items()
+        }
+    except (OSError, ValueError, TypeError, KeyError, IndexError):
+        # The index is only a cache, so it's simply rebuilt from scratch
+        return {}
+
+
+def write_index(entries: dict[str, BoardMeta], save_dir: str = files.save_dir) -> None:
+    """Persists the index to disk"""
+    pathlib.Path(save_dir).mkdir(parents=True, exist_ok=True)
+    data: dict[str, Any] = {
+        "version": INDEX_VERSION,
+        "boards": {board_id: meta.to_list() for board_id, meta in entries.items()},
+    }
+    disk.write_file_atomic(f"{save_dir}/{INDEX_FILENAME}", json.dumps(data))
+
+
+def sync_index(entries: dict[str, BoardMeta], save_dir: str = files.save_dir) -> bool:
+    """Brings `entries` up to date with the save files, returning True if anything changed.
+
+    Only save files whose modification time or size changed are opened.
+    """
+    pathlib.Path(save_dir).mkdir(parents=True, exist_ok=True)
+
+    changed: bool = False
+    seen: set[str] = set()
+    for entry in os.scandir(save_dir):
+        board_id, ext = os.path.splitext(entry.name)
+        if ext != ".board" or not board_id.isdigit() or not entry.is_file():
+            continue
+
+        stat: os.stat_result = entry.stat()
+        meta: Optional[BoardMeta] = entries.get(board_id)
+        if (
+            meta is not None
+            and meta.mtime_ns == stat.st_mtime_ns
+            and meta.size == stat.st_size
+        ):
+            seen.add(board_id)
+            continue
+
+        meta = read_metadata(entry.name, save_dir=save_dir)
+        if meta is None:
+            # Let the usual corrupted save handling report (And delete) it
+            files.load_board_file(entry.name, save_dir=save_dir)
+            continue
+
+        seen.add(board_id)
+        entries[board_id] = meta
+        changed = True
+
+    # Forget about any boards whose save files are gone
+    for board_id in list(entries):
+        if board_id not in seen:
+            del entries[board_id]
+            changed = True
+
+    return changed
+
+
+def update_index(save_dir: str = files.save_dir) -> dict[str, BoardMeta]:
+    """Loads the index, brings it up to date, and persists it if anything changed"""
+    entries: dict[str, BoardMeta] = load_index(save_dir)
+    if sync_index(entries, save_dir) or not os.path.exists(
+        f"{save_dir}/{INDEX_FILENAME}"
+    ):
+        write_index(entries, save_dir)
+
+    return entries
@@ -0,0 +1,180 @@
+from board import Board
+from board_index import BoardMeta
+from typing import Optional
+import bisect, os, pathlib, time, zlib, board_index, files
+
+
+class BoardCatalog:
+    """An in-memory index of the saved boards, refreshed incrementally from disk.
+
+    Only each board's metadata is kept up to date. Grids are loaded on demand,
+    by `load()`, when a board is actually viewed.
+    """
+
+    def __init__(self, save_dir: str = files.save_dir) -> None:
+        self.save_dir: str = save_dir
+        self.entries: dict[str, BoardMeta] = {}  # Saved boards' metadata, keyed by ID
+        self.boards: dict[str, Board] = {}  # Boards loaded so far, keyed by ID
+        # Modification time of `save_dir` at the last full scan (-1 = Scan next time)
+        self.dir_mtime: int = -1
+        self.loaded_index: bool = False  # Has the persisted index been read yet?
+        self.index_dirty: bool = False  # Does the persisted index need rewriting?
+
+        # Metadata sorted by ID, kept up to date by `refresh()`, `save()`, and `delete()`
+        self.saved_boards: list[BoardMeta] = []
+        self.filled_boards: list[BoardMeta] = []
+        self.game_boards: list[BoardMeta] = []
+
+    def refresh(self, force: bool = False) -> None:
+        """Brings the catalog up to date with the save directory.
+
+        Nothing is scanned if the directory hasn't changed since the last scan,
+        and only new or changed save files are opened. Use `force` to scan for
+        save files edited in place, which don't change the directory.
+        """
+        # Make sure the save directory actually exists
+        pathlib.Path(self.save_dir).mkdir(parents=True, exist_ok=True)
+
+        dir_mtime: int = os.stat(self.save_dir).st_mtime_ns
+        if dir_mtime == self.dir_mtime and not force:
+            return
+
+        if not self.loaded_index:
+            self.entries = board_index.load_index(self.save_dir)
+            self.loaded_index = True
+            self.index_dirty = not os.path.exists(
+                f"{self.save_dir}/{board_index.INDEX_FILENAME}"
+            )
+            self.__rebuild_lists()
+
+        # Stat every save file, only reading those that are new or changed
+        old_entries: dict[str, BoardMeta] = dict(self.entries)
+        if board_index.sync_index(self.entries, save_dir=self.save_dir):
+            # Drop any loaded boards that are outdated, or gone
+            for board_id, meta in old_entries.items():
+                if self.entries.get(board_id) != meta:
+                    self.boards.pop(board_id, None)
+            self.__rebuild_lists()
+            self.index_dirty = True
+
+        # Boards are generated after the last saved seed, so catch up to it, just
+        # like deserializing every save used to
+        if len(self.saved_boards) != 0:
+            Board.note_seed(int(self.saved_boards[-1].id))
+
+        if self.index_dirty:
+            board_index.write_index(self.entries, save_dir=self.save_dir)
+            self.index_dirty = False
+            dir_mtime = os.stat(self.save_dir).st_mtime_ns
+
+        # A directory changed within the last second might change again without its
+        # mtime moving on coarse filesystems, so don't trust it until it's settled
+        if time.time_ns() - dir_mtime > 1_000_000_000:
+            self.dir_mtime = dir_mtime
+        else:
+            self.dir_mtime = -1
+
+    def load(self, board_id: str) -> Optional[Board]:
+        """Loads a saved board's grid (None if it's gone, or was corrupted)"""
+        filename: str = f"{board_id}.board"
+        file_path: str = f"{self.save_dir}/{filename}"
+        if board_id in self.boards:
+            # The save might've been deleted behind our back since it was loaded
+            if os.path.exists(file_path):
+                return self.boards[board_id]
+            self.__forget(board_id)
+            return None
+        if board_id not in self.entries:
+            return None
+
+        try:
+            with open(file_path, "rb") as file:
+                data: bytes = file.read()
+                mtime_ns: int = os.fstat(file.fileno()).st_mtime_ns
+        except FileNotFoundError:
+            self.__forget(board_id)
+            return None
+
+        board: Optional[Board] = files.load_board_data(
+            data, filename, save_dir=self.save_dir
+        )
+        if board is None:
+            self.__forget(board_id)
+            return None
+
+        # The save changed since it was indexed, so index it again
+        meta: BoardMeta = self.entries[board_id]
+        checksum: int = zlib.crc32(data)
+        if checksum != meta.checksum:
+            new_meta: BoardMeta = BoardMeta(
+                board.id, board.type, board.difficulty, len(data), mtime_ns, checksum
+            )
+            self.__remove_from_lists(meta)
+            self.entries[board_id] = new_meta
+            self.__insert_into_lists(new_meta)
+            self.index_dirty = True
+
+        self.boards[board_id] = board
+        return board
+
+    def save(self, board: Board, fsync: bool = False, sleep: bool = False) -> None:
+        """Saves a board to disk, and adds it to the catalog"""
+        if not files.save_board(
+            board, save_dir=self.save_dir, fsync=fsync, sleep=sleep
+        ):
+            return  # The user declined to overwrite an existing save
+
+        meta: Optional[BoardMeta] = board_index.read_metadata(
+            f"{board.id}.board", save_dir=self.save_dir
+        )
+        if meta is None:
+            return
+
+        if board.id in self.entries:
+            self.__remove_from_lists(self.entries[board.id])
+        self.entries[board.id] = meta
+        self.boards[board.id] = board
+        self.__insert_into_lists(meta)
+        self.index_dirty = True
+
+    def delete(self, board: Board, sleep: bool = False) -> None:
+        """Deletes a board from disk, and removes it from the catalog"""
+        files.delete_board(board, save_dir=self.save_dir, sleep=sleep)
+        self.__forget(board.id)
+
+    def __forget(self, board_id: str) -> None:
+        """Removes a board from the catalog"""
+        self.boards.pop(board_id, None)
+        if board_id in self.entries:
+            self.__remove_from_lists(self.entries.pop(board_id))
+            self.index_dirty = True
+
+    def __rebuild_lists(self) -> None:
+        """Rebuilds the sorted metadata lists from scratch"""
+        self.saved_boards = sorted(self.entries.values(), key=lambda m: int(m.id))
+        self.filled_boards = [m for m in self.saved_boards if m.type == Board.Type.FULL]
+        self.game_boards = [m for m in self.saved_boards if m.type == Board.Type.GAME]
+
+    def __lists_for(self, meta: BoardMeta) -> list[list[BoardMeta]]:
+        """Returns the sorted metadata lists that `meta` belongs in"""
+        lists: list[list[BoardMeta]] = [self.saved_boards]
+        if meta.type == Board.Type.FULL:
+            lists.append(self.filled_boards)
+        elif meta.type == Board.Type.GAME:
+            lists.append(self.game_boards)
+
+        return lists
+
+    def __insert_into_lists(self, meta: BoardMeta) -> None:
+        """Inserts metadata into the sorted metadata lists"""
+        for entries in self.__lists_for(meta):
+            bisect.insort(entries, meta, key=lambda m: int(m.id))
+
+    def __remove_from_lists(self, meta: BoardMeta) -> None:
+        """Removes metadata from the sorted metadata lists"""
+        for entries in self.__lists_for(meta):
+            index: int = bisect.bisect_left(
+                entries, int(meta.id), key=lambda m: int(m.id)
+            )
+            if index < len(entries) and entries[index].id == meta.id:
+                del entries[index]
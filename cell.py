@@ -1,5 +1,5 @@
 from typing import Optional
-from rand_man import Rand
+from rand_man import Rand, Rng
 from copy import deepcopy
 from errors import CellException
 
@@ -31,12 +31,15 @@ class Cell:
         if val in self.options:
             self.options.remove(val)
 
-    def collapse(self) -> None:
-        """Collapses the cell into a random, valid, option"""
+    def collapse(self, rng: Optional[Rng] = None) -> None:
+        """Collapses the cell into a random, valid, option (Using `Rand` if no `rng`)"""
         if (len(self.options) == 0) and (self.value == None):
             raise CellException("Cell has no valid states, the universe will explode!")
 
-        choice_index: int = Rand.random() % len(self.options)  # type: ignore
+        if rng is None:
+            choice_index: int = Rand.random() % len(self.options)  # type: ignore
+        else:
+            choice_index: int = rng.random() % len(self.options)
         choice = deepcopy(self.options[choice_index])
         self.options = []
 
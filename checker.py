@@ -0,0 +1,78 @@
+from board import Board
+from errors import DeserializerException
+from operator import itemgetter
+from typing import Callable, Iterable, cast
+import arrays, wfc
+
+# Every row, column, and 3x3 box, as a getter of its 9 cells from a flattened board
+UNIT_GETTERS: tuple[Callable[[str], tuple[str, ...]], ...] = tuple(
+    cast(Callable[[str], tuple[str, ...]], itemgetter(*unit)) for unit in wfc.UNITS
+)
+UNIT_NAMES: tuple[str, ...] = tuple(
+    f"{kind} {n + 1}" for kind in ["Row", "Column", "Box"] for n in range(9)
+)
+FULL_UNIT: frozenset[str] = frozenset("123456789")
+# Fewest boards `check_many()` checks as a NumPy stack, when NumPy is installed
+STACK_THRESHOLD: int = 64
+
+
+def flatten(board: Board) -> str:
+    """Returns a board's 81 cells as a single row-major string"""
+    return "".join(value for row in board.board for value in row)
+
+
+def is_valid(board: Board) -> bool:
+    """Checks if a board follows the rules.
+
+    FULL boards must have every value exactly once in every row, column, and box.
+    GAME boards must never repeat a value in a row, column, or box.
+    """
+    cells: str = flatten(board)
+    if board.type == Board.Type.FULL:
+        for get_unit in UNIT_GETTERS:
+            if FULL_UNIT.symmetric_difference(get_unit(cells)):
+                return False
+    else:
+        for get_unit in UNIT_GETTERS:
+            unit: tuple[str, ...] = get_unit(cells)
+            empty: int = unit.count(" ")
+            # Every value must be unique, apart from the empty cells
+            if len(set(unit)) != 9 - empty + (1 if empty > 0 else 0):
+                return False
+
+    return True
+
+
+def check_many(boards: Iterable[Board]) -> list[bool]:
+    """Checks if every board follows the rules, see `is_valid()`.
+
+    Large batches are checked all at once as a NumPy stack, if NumPy is installed.
+    """
+    boards = list(boards)
+    if not arrays.HAS_NUMPY or len(boards) < STACK_THRESHOLD:
+        return [is_valid(board) for board in boards]
+
+    full: list[bool] = [board.type == Board.Type.FULL for board in boards]
+    return arrays.check_stack(arrays.to_stack(boards), arrays.np.array(full)).tolist()
+
+
+def find_problems(board: Board) -> list[str]:
+    """Describes every way a board breaks the rules (Empty if it's valid)"""
+    cells: str = flatten(board)
+    problems: list[str] = []
+    for name, get_unit in zip(UNIT_NAMES, UNIT_GETTERS):
+        unit: tuple[str, ...] = get_unit(cells)
+        for value in sorted(set(unit)):
+            if value == " ":
+                if board.type == Board.Type.FULL:
+                    problems.append(f"{name} of a full board has an empty cell!")
+            elif unit.count(value) > 1:
+                problems.append(f"{name} contains '{value}' {unit.count(value)} times!")
+
+    return problems
+
+
+def validate(board: Board) -> None:
+    """Raises a `DeserializerException` describing every problem with an invalid board"""
+    if not is_valid(board):
+        raise DeserializerException("\n".join(find_problems(board)))
@@ -0,0 +1,258 @@
+from board import Board
+from errors import DeserializerException
+from typing import Any, Optional
+import atexit, hashlib, json, os, pathlib, time, archive, disk, serde
+
+# The index lives alongside the saves (Next to them, for an archive). It doesn't end
+# in `.board`, so it's never mistaken for a save itself.
+DEDUP_FILENAME: str = "dedup.json"
+DEDUP_VERSION: int = 2
+# Saves changed within this long might change again without their stamp moving on
+# coarse filesystems, so such a stamp is checked once more after it's settled
+SETTLE_NS: int = 1_000_000_000
+# Changes `write_batched()` lets build up before persisting the index. The index is
+# only a cache, so any changes lost in a crash are simply redone by `refresh()`.
+WRITE_EVERY: int = 100
+
+
+def get_canonical_key(board: Board) -> str:
+    """Returns a hash of a board's canonical form, shared by all of its symmetries"""
+    return hashlib.blake2b(board.canonical_form().encode(), digest_size=16).hexdigest()
+
+
+def get_index_path(save_dir: str) -> str:
+    """Returns where the dedup index of a save directory, or archive, is persisted"""
+    if archive.is_archive(save_dir):
+        return f"{save_dir}.{DEDUP_FILENAME}"
+    return f"{save_dir}/{DEDUP_FILENAME}"
+
+
+class DedupIndex:
+    """The canonical key of every saved board, to spot boards that repeat one up to symmetry.
+
+    Saves are only scanned again when the save directory (Or archive) changed,
+    and only the boards that changed are canonicalized. Keys are stamped with
+    their save's modification time and size (Or archive record offset).
+    """
+
+    def __init__(self, save_dir: str) -> None:
+        self.save_dir: str = save_dir
+        self.keys: dict[str, str] = {}  # Canonical key of every saved board, by ID
+        # Stamp of every board's save when it was keyed (None = Key it again)
+        self.stamps: dict[str, Optional[list[int]]] = {}
+        self.owners: dict[str, set[str]] = {}  # IDs of the boards with each key
+        # Stamp of the saves the index last caught up to (Empty = Scan next time)
+        self.save_stamp: list[int] = []
+        # Had `save_stamp` settled when it was taken? (False = Scan once it has)
+        self.settled: bool = False
+        # Were the saves up to date when each unconfirmed board was claimed?
+        self.claimed: dict[str, bool] = {}
+        self.checked: int = 0  # Boards checked by `claim()`, across every run
+        self.duplicates: int = 0  # How many of those were duplicates
+        self.dirty: bool = False  # Does the persisted index need rewriting?
+        self.pending: int = 0  # Changes `write_batched()` hasn't persisted yet
+
+        self.__load()
+
+    def __load(self) -> None:
+        """Loads the persisted index, if there's a readable one"""
+        try:
+            with open(get_index_path(self.save_dir), "r") as file:
+                data: Any = json.loads(file.read())
+            if data["version"] != DEDUP_VERSION:
+                return
+
+            for board_id, entry in data["boards"].items():
+                self.__set_key(board_id, entry[0], entry[1:] or None)
+            self.save_stamp = data["stamp"]
+            self.settled = data["settled"]
+            self.checked = data["checked"]
+            self.duplicates = data["duplicates"]
+        except (OSError, ValueError, TypeError, KeyError, IndexError):
+            # The index is only a cache, so it's simply rebuilt from scratch
+            self.keys, self.stamps, self.owners = {}, {}, {}
+            self.save_stamp = []
+            self.dirty = True
+
+    def write(self) -> None:
+        """Persists the index to disk, if anything changed"""
+        if not self.dirty:
+            return
+
+        data: dict[str, Any] = {
+            "version": DEDUP_VERSION,
+            "stamp": self.save_stamp,
+            "settled": self.settled,
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "boards": {
+                board_id: [key] + (self.stamps[board_id] or [])
+                for board_id, key in self.keys.items()
+            },
+        }
+        # Writing the index changes the save directory it's in, which doesn't make
+        # the saves any less up to date, if they were beforehand
+        up_to_date: bool = self.__is_up_to_date()
+        disk.write_file_atomic(get_index_path(self.save_dir), json.dumps(data))
+        if up_to_date:
+            self.__catch_up(self.__get_save_stamp())
+        self.dirty = False
+        self.pending = 0
+
+    def write_batched(self) -> None:
+        """Persists the index once every `WRITE_EVERY` calls, instead of every time"""
+        self.pending += 1
+        if self.pending >= WRITE_EVERY:
+            self.write()
+
+    def __set_key(self, board_id: str, key: str, stamp: Optional[list[int]]) -> None:
+        """Records the key of a saved board"""
+        self.__drop_key(board_id)
+        self.keys[board_id] = key
+        self.stamps[board_id] = stamp
+        self.owners.setdefault(key, set()).add(board_id)
+
+    def __drop_key(self, board_id: str) -> None:
+        """Forgets about a board that's no longer saved"""
+        key: Optional[str] = self.keys.pop(board_id, None)
+        self.stamps.pop(board_id, None)
+        if key is not None:
+            self.owners[key].discard(board_id)
+            if len(self.owners[key]) == 0:
+                del self.owners[key]
+
+    def __get_save_stamp(self) -> list[int]:
+        """Returns a stamp that changes whenever a board is saved or deleted.
+
+        The stamp starts with the saves' modification time.
+        """
+        if archive.is_archive(self.save_dir):
+            if not os.path.exists(self.save_dir):
+                return [0, 0]
+            stat: os.stat_result = os.stat(self.save_dir)
+            return [stat.st_mtime_ns, stat.st_size]
+
+        pathlib.Path(self.save_dir).mkdir(parents=True, exist_ok=True)
+        return [os.stat(self.save_dir).st_mtime_ns]
+
+    def __is_settled(self, save_stamp: list[int]) -> bool:
+        """Checks if a save stamp is old enough that the saves can't change unnoticed"""
+        return time.time_ns() - save_stamp[0] > SETTLE_NS
+
+    def __is_up_to_date(self) -> bool:
+        """Checks if the saves haven't changed since the index last caught up to them"""
+        return len(self.save_stamp) != 0 and self.save_stamp == self.__get_save_stamp()
+
+    def __catch_up(self, save_stamp: list[int]) -> None:
+        """Records that the index is up to date with the saves as of `save_stamp`"""
+        if save_stamp != self.save_stamp:
+            self.save_stamp = save_stamp
+            self.settled = self.__is_settled(save_stamp)
+
+    def refresh(self) -> None:
+        """Brings the index up to date with the saves, if they changed.
+
+        Changes the index made itself, through `confirm()` and `write()`, don't
+        need a scan. But a stamp taken before it settled is scanned once more
+        after it has, in case the saves changed again without it moving.
+        """
+        save_stamp: list[int] = self.__get_save_stamp()
+        if save_stamp == self.save_stamp and (
+            self.settled or not self.__is_settled(save_stamp)
+        ):
+            return
+
+        # Corrupted saves are skipped here, and left for the loaders to report
+        seen: set[str] = set()
+        if archive.is_archive(self.save_dir):
+            with archive.BoardArchive(self.save_dir) as board_archive:
+                for board_id, offset in board_archive.index.items():
+                    seen.add(board_id)
+                    if self.stamps.get(board_id) != [offset]:
+                        try:
+                            board: Optional[Board] = board_archive.load(board_id)
+                        except DeserializerException:
+                            continue
+                        if board is not None:
+                            self.__set_key(board_id, get_canonical_key(board), [offset])
+        else:
+            for filename in disk.iter_saved_board_files(self.save_dir):
+                board_id: str = filename[:-6]
+                seen.add(board_id)
+                file_path: str = f"{self.save_dir}/{filename}"
+                stat: os.stat_result = os.stat(file_path)
+                stamp: list[int] = [stat.st_mtime_ns, stat.st_size]
+                if self.stamps.get(board_id) != stamp:
+                    try:
+                        with open(file_path, "rb") as file:
+                            board = serde.deserialize_any(file.read())
+                    except DeserializerException:
+                        continue
+                    self.__set_key(board_id, get_canonical_key(board), stamp)
+
+        # Forget about any boards whose saves are gone
+        for board_id in list(self.keys):
+            if board_id not in seen:
+                self.__drop_key(board_id)
+
+        self.save_stamp = save_stamp
+        self.settled = self.__is_settled(save_stamp)
+        self.dirty = True
+
+    def find(self, board_id: str, key: str) -> Optional[str]:
+        """Returns the lowest ID of another saved board with `key` (None if there isn't one)"""
+        owners: set[str] = self.owners.get(key, set())
+        others: list[str] = [owner for owner in owners if owner != board_id]
+        return min(others, key=int) if len(others) != 0 else None
+
+    def claim(self, board_id: str, key: str) -> Optional[str]:
+        """Checks a board about to be saved, counting it towards the duplicate rate.
+
+        Returns the ID of a saved board it duplicates, or None after recording
+        its key for `confirm()` to stamp once it's been saved.
+        """
+        self.checked += 1
+        self.dirty = True
+        duplicate: Optional[str] = self.find(board_id, key)
+        if duplicate is not None:
+            self.duplicates += 1
+            return duplicate
+
+        self.__set_key(board_id, key, None)
+        self.claimed[board_id] = self.__is_up_to_date()
+        return None
+
+    def confirm(self, board_id: str, stamp: list[int]) -> None:
+        """Stamps a claimed board's key, now that it's been saved"""
+        self.stamps[board_id] = stamp
+        # Saving the board doesn't make the saves any less up to date, but only if
+        # nothing else changed them before it was saved
+        if self.claimed.pop(board_id, False):
+            self.__catch_up(self.__get_save_stamp())
+        self.dirty = True
+
+    def get_duplicate_rate(self) -> float:
+        """Returns the share of checked boards that were duplicates, across every run"""
+        return self.duplicates / self.checked if self.checked != 0 else 0.0
+
+
+# Dedup indexes loaded so far, keyed by save directory
+indexes: dict[str, DedupIndex] = {}
+
+
+def get_index(save_dir: str) -> DedupIndex:
+    """Returns the up to date dedup index of a save directory, loading it only once"""
+    if save_dir not in indexes:
+        indexes[save_dir] = DedupIndex(save_dir)
+    indexes[save_dir].refresh()
+
+    return indexes[save_dir]
+
+
+@atexit.register
+def write_indexes() -> None:
+    """Persists every loaded dedup index, including changes `write_batched()` held back"""
+    for dedup_index in indexes.values():
+        # Saves that are gone by now don't need an index
+        if os.path.exists(dedup_index.save_dir):
+            dedup_index.write()
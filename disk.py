@@ -0,0 +1,58 @@
+from typing import Iterator
+import os, pathlib
+
+
+def write_file_atomic(file_path: str, data: str, fsync: bool = False) -> None:
+    """Writes `data` to `file_path`, so it's never seen half-written.
+
+    The data is written to a temporary file in the same directory, which then
+    replaces `file_path`. With `fsync`, the data is flushed to the disk first.
+    """
+    dir_path: str = os.path.dirname(os.path.abspath(file_path))
+    # Created with the same mode `open()` uses (0666, less the umask), unlike
+    # `tempfile` which always uses 0600
+    tmp_path: str = (
+        f"{dir_path}/.{os.path.basename(file_path)}.{os.urandom(8).hex()}.tmp"
+    )
+    fd: int = os.open(
+        tmp_path,
+        os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+        0o666,
+    )
+
+    # CORE CONCEPT: Instance of Try and Except
+    # Make sure the temporary file doesn't stick around if anything goes wrong
+    try:
+        with os.fdopen(fd, "w") as file:
+            file.write(data)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    # Also flush the directory entry, so the rename itself survives a crash
+    if fsync and os.name == "posix":
+        dir_fd: int = os.open(dir_path, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def iter_saved_board_files(save_dir: str, abs_path: bool = False) -> Iterator[str]:
+    """Lazily yields the *NAME* of every valid board save, in no particular order"""
+    # Make sure the save directory actually exists
+    pathlib.Path(save_dir).mkdir(parents=True, exist_ok=True)
+
+    # `os.scandir()` already knows each entry's type, so nothing needs to be stat'd
+    with os.scandir(save_dir) as entries:
+        for entry in entries:
+            name, ext = os.path.splitext(entry.name)
+            if ext != ".board" or not name.isdigit() or not entry.is_file():
+                continue
+
+            # Return the Absolute Path of the file if requested
+            yield os.path.abspath(entry.path) if abs_path else entry.name
@@ -1,13 +1,14 @@
 from board import Board
-import os, pathlib, shutil, time, serde
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
+import os, pathlib, shutil, time, archive, checker, dedup, disk, serde
 from errors import FileException, DeserializerException
 
 # Directory to save boards
 save_dir: str = os.path.abspath("./saved_boards")
 
 
-def delete_path(file_path: str):
+def delete_path(file_path: str, sleep: bool = False):
     """Deletes a path on the disk"""
     abs_file_path: str = os.path.abspath(file_path)
     if (
@@ -18,81 +19,315 @@ def delete_path(file_path: str):
         os.remove(abs_file_path)
     else:
         shutil.rmtree(abs_file_path)
-    # Sleep for just a bit to avoid and potential weird behavior on slow systems
-    time.sleep(0.100)  # 0.100 Seconds == 100 Milliseconds
 
+    if sleep:
+        # Sleep for just a bit, so the interactive UI doesn't flash by
+        time.sleep(0.100)  # 0.100 Seconds == 100 Milliseconds
+
+
+def delete_paths(file_paths: Iterable[str], sleep: bool = False) -> None:
+    """Deletes multiple paths on the disk, sleeping at most once afterwards"""
+    for file_path in file_paths:
+        delete_path(file_path)
+
+    if sleep:
+        time.sleep(0.100)  # 0.100 Seconds == 100 Milliseconds
+
+
+def prompt_overwrite(board: Board) -> bool:
+    """Asks the user whether to overwrite an already saved board"""
+    print(f"WARNING: Board {board.id} has already been saved!")
+    if not "y" in input("Overwrite it? [y/N] ").lower():
+        print("Not overwriting saved board!")
+        return False
+
+    return True
 
-def save_board(board: Board, save_dir: str = save_dir) -> None:
-    """Write serialized board data to disk"""
-    # Make sure the save directory actually exists
-    pathlib.Path(save_dir).mkdir(parents=True, exist_ok=True)
-    file_path = os.path.abspath(f"{save_dir}/{board.id}.board")
 
+def save_board(
+    board: Board,
+    save_dir: str = save_dir,
+    fsync: bool = False,
+    sleep: bool = False,
+    skip_duplicates: bool = False,
+) -> bool:
+    """Write serialized board data to disk, returning False if the user declined to.
+
+    With `skip_duplicates`, a board that's the same as another saved board, up
+    to symmetry, isn't saved either.
+    """
     if not board.generated:
         raise FileException("Called `files.save_board()` on an ungenerated board!")
 
-    # CORE CONCEPT: Instance of Try and Except
-    # Create the save file, and prompt user if it already exists
-    try:
-        open(file_path, "x").close()
-    except FileExistsError:
-        print(f"WARNING: Board {board.id} has already been saved!")
-        if "y" in input("Overwrite it? [y/N] ").lower():
-            pass
-        else:
-            print("Not overwriting saved board!")
+    dedup_index: Optional[dedup.DedupIndex] = None
+    if skip_duplicates:
+        dedup_index = dedup.get_index(save_dir)
+
+    if archive.is_archive(save_dir):
+        with archive.BoardArchive(save_dir) as board_archive:
+            # Prompt user if the board has already been saved
+            if board.id in board_archive and not prompt_overwrite(board):
+                return False
+            if dedup_index is not None and not claim_unique(board, dedup_index):
+                return False
+            board_archive.save(board, fsync=fsync)
+            stamp: list[int] = [board_archive.index[board.id]]
+    else:
+        # Make sure the save directory actually exists
+        pathlib.Path(save_dir).mkdir(parents=True, exist_ok=True)
+        file_path = os.path.abspath(f"{save_dir}/{board.id}.board")
+
+        # Prompt user if the board has already been saved
+        if os.path.exists(file_path) and not prompt_overwrite(board):
+            return False
+        if dedup_index is not None and not claim_unique(board, dedup_index):
+            return False
+
+        # Write serialized board data to save file
+        disk.write_file_atomic(file_path, serde.serialize(board), fsync=fsync)
+        stat: os.stat_result = os.stat(file_path)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+
+    if dedup_index is not None:
+        dedup_index.confirm(board.id, stamp)
+        dedup_index.write_batched()
+
+    if sleep:
+        # Sleep for just a bit, so the interactive UI doesn't flash by
+        time.sleep(0.100)  # 0.100 Seconds == 100 Milliseconds
 
-    # Write serialized board data to save file
-    with open(file_path, "w+") as file:
-        file.write(serde.serialize(board))
+    return True
 
-    # Sleep for just a bit to avoid and potential weird behavior on slow systems
-    time.sleep(0.100)  # 0.100 Seconds == 100 Milliseconds
+
+def claim_unique(board: Board, dedup_index: "dedup.DedupIndex") -> bool:
+    """Warns the user, returning False, if a board repeats a saved one up to symmetry"""
+    duplicate: Optional[str] = dedup_index.claim(
+        board.id, dedup.get_canonical_key(board)
+    )
+    if duplicate is not None:
+        print(f"WARNING: Board {board.id} is the same as saved board {duplicate}!")
+        print("Not saving duplicate board!")
+        dedup_index.write_batched()
+        return False
+
+    return True
+
+
+def pick_boards_to_save(
+    boards: Iterable[Board], existing: set[str], on_conflict: str
+) -> dict[str, Board]:
+    """Decides which boards `save_boards()` writes, before anything is written"""
+    to_save: dict[str, Board] = {}
+    for board in boards:
+        if not board.generated:
+            raise FileException(
+                "Called `files.save_boards()` with an ungenerated board!"
+            )
+
+        filename: str = f"{board.id}.board"
+        if filename in existing or filename in to_save:
+            if on_conflict == "error":
+                raise FileException(f"Board {board.id} has already been saved!")
+            elif on_conflict == "skip":
+                continue
+        to_save[filename] = board
+
+    return to_save
+
+
+def save_boards(
+    boards: Iterable[Board],
+    save_dir: str = save_dir,
+    on_conflict: str = "overwrite",
+    workers: int = 1,
+    fsync: bool = False,
+    skip_duplicates: bool = False,
+) -> int:
+    """Write multiple boards to disk without ever prompting, returning how many were written.
+
+    `on_conflict` decides what happens to boards that are already saved (Or
+    repeated within `boards`): "overwrite" them, "skip" them, or raise an
+    "error" before anything is written. With more than 1 worker, the files
+    are written from a thread pool so their I/O overlaps. With
+    `skip_duplicates`, boards that are the same as a saved board (Or an earlier
+    one in `boards`), up to symmetry, are skipped.
+    """
+    if on_conflict not in ["overwrite", "skip", "error"]:
+        raise FileException(
+            f"Called `files.save_boards()` with an invalid `on_conflict` of '{on_conflict}'!"
+        )
+
+    dedup_index: Optional[dedup.DedupIndex] = None
+    if skip_duplicates:
+        dedup_index = dedup.get_index(save_dir)
+
+    if archive.is_archive(save_dir):
+        with archive.BoardArchive(save_dir) as board_archive:
+            existing: set[str] = {
+                f"{board_id}.board" for board_id in board_archive.ids()
+            }
+            to_save: dict[str, Board] = pick_boards_to_save(
+                boards, existing, on_conflict
+            )
+            if dedup_index is not None:
+                to_save = pick_unique_boards(to_save, dedup_index)
+            for board in to_save.values():
+                board_archive.save(board)
+            if fsync:
+                os.fsync(board_archive.file.fileno())
+            offsets: dict[str, int] = dict(board_archive.index)
+
+        if dedup_index is not None:
+            for board in to_save.values():
+                dedup_index.confirm(board.id, [offsets[board.id]])
+            dedup_index.write()
+        return len(to_save)
+
+    # Make sure the save directory actually exists, and list it just once
+    pathlib.Path(save_dir).mkdir(parents=True, exist_ok=True)
+    existing: set[str] = set(os.listdir(save_dir))
+    to_save: dict[str, Board] = pick_boards_to_save(boards, existing, on_conflict)
+    if dedup_index is not None:
+        to_save = pick_unique_boards(to_save, dedup_index)
+
+    def write(item: tuple[str, Board]) -> None:
+        filename, board = item
+        disk.write_file_atomic(
+            os.path.abspath(f"{save_dir}/{filename}"), serde.serialize(board), fsync
+        )
+
+    if workers <= 1:
+        for item in to_save.items():
+            write(item)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume the results, so any exceptions are raised here
+            for _ in executor.map(write, to_save.items()):
+                pass
+
+    if dedup_index is not None:
+        for filename, board in to_save.items():
+            stat: os.stat_result = os.stat(f"{save_dir}/{filename}")
+            dedup_index.confirm(board.id, [stat.st_mtime_ns, stat.st_size])
+        dedup_index.write()
+
+    return len(to_save)
+
+
+def pick_unique_boards(
+    to_save: dict[str, Board], dedup_index: "dedup.DedupIndex"
+) -> dict[str, Board]:
+    """Drops the boards that repeat a saved (Or earlier) board up to symmetry"""
+    return {
+        filename: board
+        for filename, board in to_save.items()
+        if dedup_index.claim(board.id, dedup.get_canonical_key(board)) is None
+    }
+
+
+def iter_saved_board_files(
+    save_dir: str = save_dir, abs_path: bool = False
+) -> Iterator[str]:
+    """Lazily yields the *NAME* of every valid board save, in no particular order"""
+    return disk.iter_saved_board_files(save_dir, abs_path=abs_path)
 
 
 def get_all_saved_board_files(
     save_dir: str = save_dir, abs_path: bool = False
 ) -> list[str]:
     """Returns a list of all *NAME* valid board saves, sorted by numerical value"""
+    # Sort the files based on numerical value instead of characters
+    return sorted(
+        iter_saved_board_files(save_dir=save_dir, abs_path=abs_path),
+        key=lambda filename: int(os.path.basename(filename)[:-6]),
+    )
 
-    # Make sure the save directory actually exists
-    pathlib.Path(save_dir).mkdir(parents=True, exist_ok=True)
 
-    # Get list of all filenames within `save_dir`
-    filenames: list[str] = next(os.walk(save_dir), (None, None, []))[2]  # type: ignore
+def report_corrupted_save(name: str, err: DeserializerException) -> None:
+    """Tells the user a save is corrupted, and about to be deleted"""
+    print(f"ERROR: A board save file is corrupted! ('{name}')\nPROBLEMS:")
+    print(f"\t{'\t'.join(f'{line}\n' for line in str(err).splitlines())}")
+    input("Press enter to continue...")
+    print("Deleting the board save...\n")
+    time.sleep(2)
 
-    # There are no saved boards, so return early
-    if len(filenames) == 0:
-        return []
 
-    # Remove any invalid files from `filenames`
-    filenames_copy: list[str] = deepcopy(filenames)
-    for filename in filenames:
-        name: str = os.path.splitext(filename)[0]
-        ext: str = os.path.splitext(filename)[1]
+def load_board_file(
+    filename: str, save_dir: str = save_dir, strict: bool = False
+) -> Optional[Board]:
+    """Load a single saved board from disk, deleting it if it's corrupted.
 
-        if ext != ".board" or not name.isdigit():
-            filenames_copy.remove(filename)
-    filenames: list[str] = filenames_copy
+    With `strict`, a board that breaks the rules of Sudoku counts as corrupted.
+    """
+    with open(f"{save_dir}/{filename}", "rb") as file:
+        data: bytes = file.read()
+
+    return load_board_data(data, filename, save_dir=save_dir, strict=strict)
+
+
+def load_board_data(
+    data: bytes, filename: str, save_dir: str = save_dir, strict: bool = False
+) -> Optional[Board]:
+    """Load a board from a save's already read data, deleting the save if it's corrupted"""
+    delete_board: bool = False
+    tmp_board: Optional[Board] = None
+    try:
+        # Saves may be in any of the serialized forms
+        tmp_board = serde.deserialize_any(data)
+        if f"{tmp_board.id}.board" != filename:
+            raise DeserializerException(
+                f"The board's ID of '{tmp_board.id}' doesn't match its save's name!"
+            )
+        if strict:
+            checker.validate(tmp_board)
+    except DeserializerException as err:
+        report_corrupted_save(filename, err)
+        tmp_board = None
+        delete_board = True
+    if delete_board:
+        try:
+            delete_path(f"{save_dir}/{filename}")
+        except Exception as e:
+            print(f"ERROR: Failed to delete the corrupted save '{filename}': {e}")
+            input("Press enter to continue...")
+
+    return tmp_board
 
-    # Sort the files based on numerical value instead of characters
-    for i in range(len(filenames)):
-        for j in range(i + 1, len(filenames)):
-            if int(filenames[i][:-6]) > int(filenames[j][:-6]):
-                filenames[i], filenames[j] = filenames[j], filenames[i]
 
-    # Return the Absolute Paths of the files if requested
-    if abs_path:
-        filenames_copy: list[str] = []
-        for filename in filenames:
-            filenames_copy.append(os.path.abspath(f"{save_dir}/{filename}"))
-        filenames: list[str] = filenames_copy
+def load_saved_boards(save_dir: str = save_dir, strict: bool = False) -> list[Board]:
+    """Load all saved boards from disk.
 
-    return filenames
+    With `strict`, boards that break the rules of Sudoku are treated just like
+    corrupted saves, and deleted.
+    """
+    if archive.is_archive(save_dir):
+        with archive.BoardArchive(save_dir) as board_archive:
+            # Records are unpacked one at a time, so a corrupted one is dealt with
+            # just like a corrupted save file, without losing the rest
+            boards: list[Board] = []
+            for board_id in board_archive.ids():
+                try:
+                    board: Optional[Board] = board_archive.load(board_id)
+                except DeserializerException as err:
+                    report_corrupted_save(f"{save_dir}:{board_id}", err)
+                    board_archive.delete(board_id)
+                    continue
+                if board is not None:
+                    boards.append(board)
+            if not strict:
+                return boards
 
+            # Check every board in one go, then deal with the invalid ones
+            valid: list[bool] = checker.check_many(boards)
+            for board, is_valid in zip(boards, valid):
+                if not is_valid:
+                    report_corrupted_save(
+                        f"{save_dir}:{board.id}",
+                        DeserializerException("\n".join(checker.find_problems(board))),
+                    )
+                    board_archive.delete(board.id)
+            return [board for board, is_valid in zip(boards, valid) if is_valid]
 
-def load_saved_boards(save_dir: str = save_dir) -> list[Board]:
-    """Load all saved boards from disk"""
     # Make sure the save directory actually exists
     pathlib.Path(save_dir).mkdir(parents=True, exist_ok=True)
 
@@ -102,31 +337,37 @@ def load_saved_boards(save_dir: str = save_dir) -> list[Board]:
     # Loop `filenames` and initialize + deserialize each save file
     boards: list[Board] = []
     for filename in filenames:
-        delete_board: bool = False
-        with open(f"{save_dir}/{filename}", "r") as file:
-            try:
-                tmp_board: Board = serde.deserialize(file.read())
-                boards.append(tmp_board)
-            except DeserializerException as err:
-                print(
-                    f"ERROR: A board save file is corrupted! ('{filename}')\nPROBLEMS:"
-                )
-                print(f"\t{'\t'.join(f'{line}\n' for line in str(err).splitlines())}")
-                input("Press enter to continue...")
-                print("Deleting the board save...\n")
-                time.sleep(2)
-                delete_board: bool = True
-        if delete_board:
-            try:
-                delete_path(f"{save_dir}/{filename}")
-            except Exception as e:
-                print(f"ERROR: Failed to delete the corrupted save '{filename}': {e}")
-                input("Press enter to continue...")
+        tmp_board: Optional[Board] = load_board_file(
+            filename, save_dir=save_dir, strict=strict
+        )
+        if tmp_board is not None:
+            boards.append(tmp_board)
 
     return boards
 
 
-def delete_board(board: Board, save_dir: str = save_dir) -> None:
+def delete_board(board: Board, save_dir: str = save_dir, sleep: bool = False) -> None:
+    if archive.is_archive(save_dir):
+        with archive.BoardArchive(save_dir) as board_archive:
+            if len(board_archive) == 0:
+                raise FileException(
+                    "Called `files.delete_board()` when there are no boards actively saved!"
+                )
+            if not board.generated:
+                raise FileException(
+                    "Called `files.delete_board()` on an ungenerated board!"
+                )
+            if not board.id in board_archive:
+                raise FileException(
+                    "Called `files.delete_board()` on a board the hasn't been saved!"
+                )
+            board_archive.delete(board.id)
+
+        if sleep:
+            # Sleep for just a bit, so the interactive UI doesn't flash by
+            time.sleep(0.100)  # 0.100 Seconds == 100 Milliseconds
+        return
+
     # Make sure the save directory actually exists
     pathlib.Path(save_dir).mkdir(parents=True, exist_ok=True)
 
@@ -150,4 +391,4 @@ def delete_board(board: Board, save_dir: str = save_dir) -> None:
         )
 
     # Required checks have passed, go ahead and delete the file (Which must exist now)
-    delete_path(f"{save_dir}/{board.id}.board")
+    delete_path(f"{save_dir}/{board.id}.board", sleep=sleep)
@@ -0,0 +1,308 @@
+from enum import IntEnum
+from wfc import ALL_OPTIONS, BOX_OF, COL_OF, PEERS, ROW_OF, UNITS
+
+
+class Technique(IntEnum):
+    """Enum for solving techniques, from easiest to hardest."""
+
+    NONE = 0  # Nothing was left to solve
+    NAKED_SINGLE = 1  # A cell with only 1 candidate left
+    HIDDEN_SINGLE = 2  # A value with only 1 possible cell left in a unit
+    LOCKED_CANDIDATES = 3  # A value confined to 1 box and 1 row/column
+    NAKED_PAIR = 4  # 2 cells in a unit with the same 2 candidates
+    HIDDEN_PAIR = 5  # 2 values confined to the same 2 cells of a unit
+    X_WING = 6  # A value confined to the same 2 columns of 2 rows, or the reverse
+    GUESS = 7  # None of the above help, so solving needs trial and error
+
+
+# Score added for every step taken with each technique
+TECHNIQUE_SCORES: dict[Technique, int] = {
+    Technique.NONE: 0,
+    Technique.NAKED_SINGLE: 1,
+    Technique.HIDDEN_SINGLE: 2,
+    Technique.LOCKED_CANDIDATES: 5,
+    Technique.NAKED_PAIR: 8,
+    Technique.HIDDEN_PAIR: 10,
+    Technique.X_WING: 15,
+    Technique.GUESS: 50,
+}
+
+# Scores from which a puzzle is at least medium, or hard, whatever techniques it needs.
+# Only singles add up to these, as a long chain of them is hard in its own right.
+MEDIUM_SCORE: int = 45
+HARD_SCORE: int = 70
+
+# Every row, column, and 3x3 box, split out of `UNITS`
+ROWS: tuple[tuple[int, ...], ...] = UNITS[0:9]
+COLS: tuple[tuple[int, ...], ...] = UNITS[9:18]
+BOXES: tuple[tuple[int, ...], ...] = UNITS[18:27]
+
+
+class Grade:
+    """How hard a puzzle is to solve by logic alone"""
+
+    def __init__(self, hardest: Technique, steps: int, score: int) -> None:
+        self.hardest: Technique = hardest  # Hardest technique needed
+        self.steps: int = steps  # Number of placements and eliminations made
+        self.score: int = score  # Sum of every step's technique score
+
+    def __eq__(self, value: object) -> bool:
+        """Checks if two grades are equal."""
+        if type(value) != Grade:
+            return False
+
+        return (self.hardest, self.steps, self.score) == (
+            value.hardest,
+            value.steps,
+            value.score,
+        )
+
+    def __repr__(self) -> str:
+        return f"Grade({self.hardest.name}, steps={self.steps}, score={self.score})"
+
+    def get_difficulty(self) -> int:
+        """Returns the `Board.Difficulty` value the grade corresponds to.
+
+        Easy puzzles only need naked singles, medium puzzles also need hidden
+        singles, and hard puzzles need anything beyond that. A puzzle scoring
+        at least `MEDIUM_SCORE`, or `HARD_SCORE`, is raised to that difficulty.
+        """
+        if self.hardest > Technique.HIDDEN_SINGLE or self.score >= HARD_SCORE:
+            return 3
+        elif self.hardest == Technique.HIDDEN_SINGLE or self.score >= MEDIUM_SCORE:
+            return 2
+        return 1
+
+
+class Grader:
+    """A logical Sudoku solver, which only ever applies the easiest technique that helps"""
+
+    def __init__(self, values: list[int]) -> None:
+        self.values: list[int] = list(values)  # Value of each cell (0 = Empty)
+        # Candidates of each empty cell as a 9-bit mask (0 for filled cells)
+        self.candidates: list[int] = [0] * 81
+        self.hardest: Technique = Technique.NONE
+        self.steps: int = 0
+        self.score: int = 0
+        # Set when a cell runs out of candidates, so the puzzle can't be solved
+        self.contradiction: bool = False
+
+        for index, value in enumerate(self.values):
+            if value == 0:
+                taken: int = 0
+                for peer in PEERS[index]:
+                    if self.values[peer] != 0:
+                        taken |= 1 << (self.values[peer] - 1)
+                self.candidates[index] = ALL_OPTIONS & ~taken
+                if self.candidates[index] == 0:
+                    self.contradiction = True
+
+    def grade(self) -> Grade:
+        """Solves the puzzle as far as logic allows, and grades it"""
+        techniques = [
+            self.__naked_single,
+            self.__hidden_single,
+            self.__locked_candidates,
+            self.__naked_pair,
+            self.__hidden_pair,
+            self.__x_wing,
+        ]
+        while not self.contradiction and 0 in self.values:
+            # Always restart from the easiest technique after making progress
+            for technique in techniques:
+                if technique():
+                    break
+            else:
+                break
+
+        if self.contradiction or 0 in self.values:
+            self.__record(Technique.GUESS)
+
+        return Grade(self.hardest, self.steps, self.score)
+
+    def __record(self, technique: Technique) -> None:
+        """Records a step taken with a technique"""
+        self.steps += 1
+        self.score += TECHNIQUE_SCORES[technique]
+        if technique > self.hardest:
+            self.hardest = technique
+
+    def __place(self, index: int, value: int) -> None:
+        """Fills a cell, and removes its value from the candidates of its peers"""
+        bit: int = 1 << (value - 1)
+        self.values[index] = value
+        self.candidates[index] = 0
+        candidates: list[int] = self.candidates
+        for peer in PEERS[index]:
+            if candidates[peer] & bit:
+                candidates[peer] ^= bit
+                if candidates[peer] == 0:
+                    self.contradiction = True
+
+    def __eliminate(self, cells: list[int], mask: int) -> bool:
+        """Removes `mask` from the candidates of `cells`, returning True if any were"""
+        changed: bool = False
+        for index in cells:
+            if self.candidates[index] & mask:
+                self.candidates[index] &= ~mask
+                changed = True
+                if self.candidates[index] == 0:
+                    self.contradiction = True
+
+        return changed
+
+    def __naked_single(self) -> bool:
+        """Fills every cell that has a single candidate"""
+        found: bool = False
+        for index in range(81):
+            candidates: int = self.candidates[index]
+            if candidates and candidates & (candidates - 1) == 0:
+                self.__place(index, candidates.bit_length())
+                self.__record(Technique.NAKED_SINGLE)
+                found = True
+
+        return found
+
+    def __hidden_single(self) -> bool:
+        """Fills the only cell in a unit that can still hold a value"""
+        candidates: list[int] = self.candidates
+        for unit in UNITS:
+            # Values that are candidates at least once, and at least twice, in the unit
+            once: int = 0
+            twice: int = 0
+            for index in unit:
+                twice |= once & candidates[index]
+                once |= candidates[index]
+            single: int = once & ~twice
+            if single:
+                bit: int = single & -single
+                for index in unit:
+                    if candidates[index] & bit:
+                        self.__place(index, bit.bit_length())
+                        self.__record(Technique.HIDDEN_SINGLE)
+                        return True
+
+        return False
+
+    def __locked_candidates(self) -> bool:
+        """Removes a value confined to a box and line from the rest of the other"""
+        candidates: list[int] = self.candidates
+        for box_cells in BOXES:
+            for value in range(9):
+                bit: int = 1 << value
+                cells: list[int] = [
+                    index for index in box_cells if candidates[index] & bit
+                ]
+                if len(cells) < 2:
+                    continue
+
+                # Pointing: The box's cells for the value all share a row or column
+                for line_of, lines in [(ROW_OF, ROWS), (COL_OF, COLS)]:
+                    line: int = line_of[cells[0]]
+                    if all(line_of[index] == line for index in cells):
+                        others: list[int] = [
+                            index
+                            for index in lines[line]
+                            if BOX_OF[index] != BOX_OF[cells[0]]
+                        ]
+                        if self.__eliminate(others, bit):
+                            self.__record(Technique.LOCKED_CANDIDATES)
+                            return True
+
+        # Claiming: A row's or column's cells for the value all share a box
+        for line_cells in ROWS + COLS:
+            for value in range(9):
+                bit: int = 1 << value
+                cells: list[int] = [
+                    index for index in line_cells if candidates[index] & bit
+                ]
+                if len(cells) < 2:
+                    continue
+                box: int = BOX_OF[cells[0]]
+                if all(BOX_OF[index] == box for index in cells):
+                    others: list[int] = [
+                        index for index in BOXES[box] if index not in line_cells
+                    ]
+                    if self.__eliminate(others, bit):
+                        self.__record(Technique.LOCKED_CANDIDATES)
+                        return True
+
+        return False
+
+    def __naked_pair(self) -> bool:
+        """Removes the candidates of 2 cells that share the same 2 from their unit"""
+        candidates: list[int] = self.candidates
+        for unit in UNITS:
+            pairs: dict[int, int] = {}
+            for index in unit:
+                mask: int = candidates[index]
+                if mask.bit_count() != 2:
+                    continue
+                if mask in pairs:
+                    others: list[int] = [
+                        other for other in unit if other not in (index, pairs[mask])
+                    ]
+                    if self.__eliminate(others, mask):
+                        self.__record(Technique.NAKED_PAIR)
+                        return True
+                pairs[mask] = index
+
+        return False
+
+    def __hidden_pair(self) -> bool:
+        """Strips 2 cells down to the 2 values that can only go in them"""
+        candidates: list[int] = self.candidates
+        for unit in UNITS:
+            # The cells every value can go in, for values with exactly 2
+            places: dict[tuple[int, ...], int] = {}
+            for value in range(9):
+                bit: int = 1 << value
+                cells: tuple[int, ...] = tuple(
+                    index for index in unit if candidates[index] & bit
+                )
+                if len(cells) != 2:
+                    continue
+                if cells in places:
+                    mask: int = places[cells] | bit
+                    if any(candidates[index] & ~mask for index in cells):
+                        for index in cells:
+                            candidates[index] &= mask
+                        self.__record(Technique.HIDDEN_PAIR)
+                        return True
+                places[cells] = places.get(cells, 0) | bit
+
+        return False
+
+    def __x_wing(self) -> bool:
+        """Removes a value from 2 lines, when 2 crossing lines confine it to them"""
+        candidates: list[int] = self.candidates
+        for lines, cross_of, crosses in [(ROWS, COL_OF, COLS), (COLS, ROW_OF, ROWS)]:
+            for value in range(9):
+                bit: int = 1 << value
+                # Lines where the value has exactly 2 places, by those places' crosses
+                seen: dict[tuple[int, int], int] = {}
+                for line_index, line in enumerate(lines):
+                    cells: list[int] = [
+                        index for index in line if candidates[index] & bit
+                    ]
+                    if len(cells) != 2:
+                        continue
+                    key: tuple[int, int] = (cross_of[cells[0]], cross_of[cells[1]])
+                    if key in seen:
+                        others: list[int] = [
+                            index
+                            for cross in key
+                            for index in crosses[cross]
+                            if index not in line and index not in lines[seen[key]]
+                        ]
+                        if self.__eliminate(others, bit):
+                            self.__record(Technique.X_WING)
+                            return True
+                    seen[key] = line_index
+
+        return False
+
+
+def grade(values: list[int]) -> Grade:
+    """Grades a grid of 81 values (0 = Empty) by the techniques needed to solve it"""
+    return Grader(values).grade()
@@ -15,22 +15,25 @@
 # ======================================================================================
 # Core concept comments are prefixed with `CORE CONCEPT:`
 #
-# - Instance of a function with parameters    (main.py:423:1)
-# - Instance of Try and Except    (files.py:36:5)
+# - Instance of a function with parameters    (main.py:427:1)
+# - Instance of Try and Except    (disk.py:25:5)
 # - Instance of the `in` keyword    (ui.py:44:13)
-# - Instance of a `tuple` or `list` with methods used on them    (board.py:86:17)
-# - Instance of a 2D list    (board.py:57:9)
-# - Instance of packing    (board.py:151:25)
-# - Instance of unpacking    (board.py:156:13)
-# - Instance of a dictionary    (serde.py:115:5)
+# - Instance of a `tuple` or `list` with methods used on them    (board.py:123:17)
+# - Instance of a 2D list    (board.py:70:9)
+# - Instance of packing    (board.py:435:25)
+# - Instance of unpacking    (board.py:441:13)
+# - Instance of a dictionary    (serde.py:224:5)
 # - Instance of comparing the equivalence of two items    (tests.py:118:9)
-# - Instance of a hidden attribute    (board.py:59:9)
+# - Instance of a hidden attribute    (board.py:76:9)
 
 
 from board import Board
+from board_index import BoardMeta
+from catalog import BoardCatalog
+from errors import BoardException
 from ui import UI
-import files, tools, math, time
-
+from typing import Optional, TextIO
+import argparse, batch, dedup, files, optional_numpy, tools, math, os, sys, time
 
 # tools.clear_all_saved_boards()
 # for cycle in range(0, 31):
@@ -45,10 +48,14 @@ import files, tools, math, time
 # input("DONE")
 
 
-# Load saved boards into separate lists for filled and game boards
-saved_boards: list[Board] = files.load_saved_boards()
-filled_boards: list[Board] = []
-game_boards: list[Board] = []
+# Cache of the saved boards, only reloading what changed on disk
+catalog: BoardCatalog = BoardCatalog()
+
+# Saved boards' metadata, split into separate lists for filled and game boards.
+# Populated by `update_board_lists()` once the interactive menu starts.
+saved_boards: list[BoardMeta] = []
+filled_boards: list[BoardMeta] = []
+game_boards: list[BoardMeta] = []
 
 boards_per_page: int = 10
 
@@ -56,15 +63,10 @@ boards_per_page: int = 10
 def update_board_lists() -> None:
     """Updates the lists keeping track of all the saved boards"""
     global saved_boards, filled_boards, game_boards
-    saved_boards = files.load_saved_boards()
-    filled_boards = []
-    game_boards = []
-
-    for board in saved_boards:
-        if board.type == Board.Type.FULL:
-            filled_boards.append(board)
-        elif board.type == Board.Type.GAME:
-            game_boards.append(board)
+    catalog.refresh()
+    saved_boards = catalog.saved_boards
+    filled_boards = catalog.filled_boards
+    game_boards = catalog.game_boards
 
 
 def main_menu() -> None:
@@ -168,7 +170,7 @@ def generate_boards__filled_boards() -> None:
 
         # GENERATE FILLED BOARDS: Save
         elif user_choice == "1":
-            files.save_board(board)
+            catalog.save(board, sleep=True)
             print("Saved board!")
             time.sleep(1)
 
@@ -228,7 +230,7 @@ def generate_boards__game_boards() -> None:
 
         # GENERATE GAME BOARDS: Save
         elif user_choice == "1":
-            files.save_board(board)
+            catalog.save(board, sleep=True)
             print("Saved board!")
             time.sleep(1)
 
@@ -338,7 +340,7 @@ def view_boards__filled_boards() -> None:
 
         # VIEW FILLED BOARDS: BOARD NUM
         elif int(user_choice) - 1 in page_range:
-            view_boards__show_board_ui(filled_boards[int(user_choice) - 1])
+            view_boards__show_board_ui(filled_boards[int(user_choice) - 1].id)
 
 
 def view_boards__game_boards() -> None:
@@ -417,13 +419,18 @@ def view_boards__game_boards() -> None:
         # VIEW GAME BOARDS: BOARD NUM
         elif int(user_choice) - 1 in page_range:
             view_boards__show_board_ui(
-                game_boards[int(user_choice) - 1], difficulty=True
+                game_boards[int(user_choice) - 1].id, difficulty=True
             )
 
 
 # CORE CONCEPT: Instance of a function with parameters
-def view_boards__show_board_ui(board: Board, difficulty: bool = False) -> None:
+def view_boards__show_board_ui(board_id: str, difficulty: bool = False) -> None:
     """Displays a single board with options to delete or go back."""
+    # Only now is the board's grid actually loaded from disk
+    board: Optional[Board] = catalog.load(board_id)
+    if board is None:
+        return  # The save was corrupted, or deleted behind our back
+
     # Display the board details, including difficulty if applicable
     show_board_ui: UI = UI(
         title=f"Viewing Board #{board.id}"
@@ -451,7 +458,7 @@ def view_boards__show_board_ui(board: Board, difficulty: bool = False) -> None:
 
     # SHOW BOARD UI OPTIONS: Delete
     elif user_choice == "D":
-        files.delete_board(board)  # Delete the board from storage
+        catalog.delete(board, sleep=True)  # Delete the board from storage
 
         # Update the saved boards lists to reflect the deletion
         update_board_lists()
@@ -460,8 +467,174 @@ def view_boards__show_board_ui(board: Board, difficulty: bool = False) -> None:
         time.sleep(1)
 
 
-def main() -> None:
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parses the command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Sudoku board generator. Starts the interactive menu without a command."
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    generate_parser = commands.add_parser(
+        "generate", help="Generate boards without any prompts"
+    )
+    generate_parser.add_argument(
+        "--count", type=int, required=True, help="Number of boards to generate"
+    )
+    generate_parser.add_argument(
+        "--difficulty",
+        choices=["easy", "medium", "hard"],
+        default=None,
+        help="Gameify the boards at this difficulty (Default: Filled boards)",
+    )
+    generate_parser.add_argument(
+        "--unique",
+        action="store_true",
+        help="Only remove cells that keep each game board's solution unique",
+    )
+    generate_parser.add_argument(
+        "--start",
+        type=int,
+        default=None,
+        help="Seed of the first board (Default: After the last saved board)",
+    )
+    generate_parser.add_argument(
+        "--workers", type=int, default=1, help="Number of worker processes"
+    )
+    generate_parser.add_argument(
+        "--stack",
+        action="store_true",
+        help="Generate many boards at once with NumPy (The same boards, only faster)",
+    )
+    generate_parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check every board follows the rules, stopping at the first that doesn't",
+    )
+    generate_parser.add_argument(
+        "--out",
+        default=None,
+        help="Write the boards to this file as JSON lines ('-' = stdout)",
+    )
+    generate_parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Save the boards to the saved boards directory",
+    )
+    generate_parser.add_argument(
+        "--skip-duplicates",
+        action="store_true",
+        help="Don't save boards that are the same as a saved board up to symmetry",
+    )
+
+    args: argparse.Namespace = parser.parse_args(argv)
+    if args.command == "generate" and args.skip_duplicates and not args.save:
+        generate_parser.error("--skip-duplicates only applies with --save")
+    if args.command == "generate" and args.stack and not optional_numpy.HAS_NUMPY:
+        generate_parser.error("--stack needs NumPy, but it isn't installed")
+
+    return args
+
+
+def cli_generate(args: argparse.Namespace) -> None:
+    """Generates, gameifies and saves boards headlessly, reporting progress to stderr"""
+    difficulty: Optional[Board.Difficulty] = (
+        None if args.difficulty is None else Board.Difficulty[args.difficulty.upper()]
+    )
+
+    # Continue after the last saved board, like the interactive menu does
+    start: Optional[int] = args.start
+    if start is None:
+        # Listing the saves would create the save directory, even when not saving
+        saved_files: list[str] = []
+        if os.path.isdir(files.save_dir):
+            saved_files = files.get_all_saved_board_files()
+        start = int(saved_files[-1][:-6]) + 1 if len(saved_files) != 0 else 0
+
+    sink: Optional[TextIO] = None
+    if args.out == "-":
+        sink = sys.stdout
+    elif args.out is not None:
+        sink = open(args.out, "w")
+
+    # Duplicate counts before this run, to report this run's duplicate rate
+    dedup_index: Optional[dedup.DedupIndex] = None
+    if args.save and args.skip_duplicates:
+        dedup_index = dedup.get_index(files.save_dir)
+    checked: int = dedup_index.checked if dedup_index is not None else 0
+    duplicates: int = dedup_index.duplicates if dedup_index is not None else 0
+
+    start_time: float = time.perf_counter()
+    generated: int = 0
+    to_save: list[Board] = []
+    try:
+        for board in batch.iter_boards(
+            start,
+            difficulty,
+            count=args.count,
+            sink=sink,
+            engine=Board.Engine.STACK if args.stack else Board.Engine.BITMASK,
+            workers=args.workers,
+            unique=args.unique,
+            validate=args.validate,
+        ):
+            # Save in batches, never prompting about (And leaving be) saved boards
+            if args.save:
+                to_save.append(board)
+                if len(to_save) == 1000 or generated + 1 == args.count:
+                    files.save_boards(
+                        to_save,
+                        on_conflict="skip",
+                        skip_duplicates=args.skip_duplicates,
+                    )
+                    to_save = []
+
+            generated += 1
+            if generated % 1000 == 0 or generated == args.count:
+                elapsed: float = time.perf_counter() - start_time
+                print(
+                    f"\rGenerated {generated}/{args.count} boards"
+                    f" ({generated / elapsed:.1f} boards/sec)",
+                    end="",
+                    file=sys.stderr,
+                )
+    finally:
+        if sink is not None and sink is not sys.stdout:
+            sink.close()
+
+    elapsed: float = time.perf_counter() - start_time
+    print(
+        f"\nGenerated {generated} boards in {elapsed:.2f}s"
+        f" ({generated / max(elapsed, 1e-9):.1f} boards/sec)",
+        file=sys.stderr,
+    )
+    if dedup_index is not None:
+        checked = dedup_index.checked - checked
+        duplicates = dedup_index.duplicates - duplicates
+        print(
+            f"Skipped {duplicates}/{checked} duplicate boards"
+            f" ({duplicates / max(checked, 1):.2%}, and"
+            f" {dedup_index.get_duplicate_rate():.2%} across every run)",
+            file=sys.stderr,
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
     """Where the root logic is executed"""
+    args: argparse.Namespace = parse_args(argv)
+
+    # Headless commands
+    if args.command == "generate":
+        try:
+            cli_generate(args)
+        except BrokenPipeError:
+            # Whatever read `--out -` stopped early (Like `head`), which is fine. Point
+            # stdout at nothing, so flushing it on exit doesn't fail all over again.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        except BoardException as error:
+            # `--validate` found a board breaking the rules
+            sys.exit(f"\n{error}")
+        return
+
     # Update saved boards from disk
     update_board_lists()
 
@@ -0,0 +1,14 @@
+from typing import Any
+
+# NumPy is optional. Everything else works without it, only `arrays.py` and
+# `wfc_stack.py` need it. `np` is typed as `Any` either way, so its uses aren't
+# flagged as possibly None. Check `HAS_NUMPY` before using it.
+np: Any
+try:
+    import numpy
+
+    np = numpy
+except ImportError:
+    np = None
+
+HAS_NUMPY: bool = np is not None
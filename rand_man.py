@@ -1,18 +1,33 @@
 import random, sys
 
 
+class Rng:
+    # A seeded random number generator, owned by whatever is using it.
+    # Every board generation gets its own instance, so generating boards
+    # concurrently can't interleave, and break, each other's RNG values.
+    def __init__(self, seed: int = 0) -> None:
+        self.seed: int = seed
+        self.local_random: random.Random = random.Random(seed)
+
+    def random(self) -> int:
+        """Generate a random integer"""
+        return self.local_random.randint(0, sys.maxsize)
+
+
 class Rand:
     # A static class for managing random number generation with a seed.
-    # This allows for deterministic RNG values throughout the whole project,
-    # though it's currently only use for board generation.
+    # Kept as a facade over a shared `Rng` for backwards compatibility;
+    # board generation now uses its own `Rng` instead.
     seed: int = 0
-    local_random: random.Random = random.Random(seed)
+    rng: Rng = Rng(seed)
+    local_random: random.Random = rng.local_random
 
     def set_seed(val: int) -> None:  # type: ignore
         """Set the seed for the random number generator"""
         Rand.seed: int = val
-        Rand.local_random: random.Random = random.Random(Rand.seed)
+        Rand.rng: Rng = Rng(Rand.seed)
+        Rand.local_random: random.Random = Rand.rng.local_random
 
     def random() -> int:  # type: ignore
         """Generate a random integer"""
-        return Rand.local_random.randint(0, sys.maxsize)
+        return Rand.rng.random()
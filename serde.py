@@ -1,11 +1,72 @@
 from errors import BoardException, DeserializerException
-from typing import Any
+from typing import Any, cast
 from board import Board
-import json
+import json, re, struct
+
+# Binary form: magic number, format version, ID, type, difficulty, then the 81 cells
+# packed 2 per byte (4 bits each, 0 = Empty)
+BINARY_MAGIC: bytes = b"SDKB"
+BINARY_VERSION: int = 1
+BINARY: struct.Struct = struct.Struct("<4sBQBB41s")
+
+# Every valid cell value. Packed cells are written as hex digits, with 0 for empty cells.
+CELL_VALUES: frozenset[str] = frozenset(" 123456789")
+PACKED_VALUES: frozenset[str] = frozenset("0123456789")
+STRING_VALUES: frozenset[str] = frozenset(".123456789")  # With `.` for empty cells
+# A removal mask, as a hexadecimal string
+MASK_PATTERN: re.Pattern[str] = re.compile("[0-9a-f]{1,21}")
+# A derived board's base ID, transform seed, and removal mask
+DERIVE_PATTERN: re.Pattern[str] = re.compile("[0-9]+:-?[0-9]+:[0-9a-f]{1,21}")
+
+
+def is_derivation(value: Any) -> bool:
+    """Checks if `value` is a valid "derive" value (Base ID, transform seed, and mask)"""
+    return (
+        type(value) is str
+        and DERIVE_PATTERN.fullmatch(value) is not None
+        and int(value.split(":")[2], 16) >> 81 == 0
+    )
+
+
+def is_well_formed(data: Any) -> bool:
+    """Quickly checks if `data` is a valid board, in a single pass over its cells"""
+    if type(data) is not dict:
+        return False
+
+    fields: dict[str, Any] = cast(dict[str, Any], data)
+    if (
+        len(fields) != (5 if "derive" in fields else 4)
+        or ("derive" in fields and not is_derivation(fields["derive"]))
+        or type(fields.get("id")) is not str
+        or not fields["id"].isdigit()
+        or type(fields.get("type")) is not int
+        or fields["type"] not in (1, 2)
+        or type(fields.get("difficulty")) is not int
+        or fields["difficulty"] not in (0, 1, 2, 3)
+        or type(fields.get("board")) is not list
+        or len(fields["board"]) != 9
+    ):
+        return False
+
+    try:
+        for row in fields["board"]:
+            if type(row) is not list:
+                return False
+            cells: list[Any] = cast(list[Any], row)
+            if len(cells) != 9 or not CELL_VALUES.issuperset(cells):
+                return False
+    except TypeError:  # A cell can't even be hashed, so it's certainly invalid
+        return False
+
+    return True
 
 
 def validate_data(data: Any) -> None:
     """Validates the data passed to `Board.deserialize()`"""
+    # Nearly every board is valid, so only build the detailed problems when it's not
+    if is_well_formed(data):
+        return
+
     # There are no comments in this function because the code is already hard to read,
     # and adding comments into the mix will just make it even harder.
 
@@ -14,9 +75,11 @@ def validate_data(data: Any) -> None:
         raise DeserializerException(
             f"`data` has a type of '{type(data)}'. Expected a type of '{dict}'!"
         )
-    if len(data) != 4:  # type: ignore
+    # Derived boards store how they were derived alongside their cells
+    expected_length: int = 5 if "board" in data and "derive" in data else 4
+    if len(data) != expected_length:  # type: ignore
         raise DeserializerException(
-            f"`data` has length of '{len(data)}'. Expected a length of '4'!"  # type: ignore
+            f"`data` has length of '{len(data)}'. Expected a length of '{expected_length}'!"  # type: ignore
         )
 
     # Validate key types
@@ -34,8 +97,10 @@ def validate_data(data: Any) -> None:
         queued_exceptions += "`data` does not contain key 'type'!\n"
     if "difficulty" not in data:
         queued_exceptions += "`data` does not contain key 'difficulty'!\n"
-    if "board" not in data:
-        queued_exceptions += "`data` does not contain key 'board'!\n"
+    if "board" not in data and "mask" not in data and "derive" not in data:
+        queued_exceptions += (
+            "`data` does not contain key 'board' (Or 'mask', or 'derive')!\n"
+        )
     if queued_exceptions != "":
         raise DeserializerException(queued_exceptions)
 
@@ -47,7 +112,15 @@ def validate_data(data: Any) -> None:
         queued_exceptions += f"`data[\"type\"]` has a type of '{type(data['type'])}'. Expected a type of '{int}'!\n"  # type: ignore
     if not isinstance(data["difficulty"], int):
         queued_exceptions += f"`data[\"difficulty\"]` has a type of '{type(data['difficulty'])}'. Expected a type of '{int}'!\n"  # type: ignore
-    if not isinstance(data["board"], list):
+    if "mask" in data:
+        if not isinstance(data["mask"], str):
+            queued_exceptions += f"`data[\"mask\"]` has a type of '{type(data['mask'])}'. Expected a type of '{str}'!\n"  # type: ignore
+    if "derive" in data:
+        if not isinstance(data["derive"], str):
+            queued_exceptions += f"`data[\"derive\"]` has a type of '{type(data['derive'])}'. Expected a type of '{str}'!\n"  # type: ignore
+    if "board" not in data:
+        pass
+    elif not isinstance(data["board"], list):
         queued_exceptions += f"`data[\"board\"]` has a type of '{type(data['board'])}'. Expected a type of '{list}'!\n"  # type: ignore
     else:
         for row_index, row in enumerate(data["board"]):  # type: ignore
@@ -68,7 +141,15 @@ def validate_data(data: Any) -> None:
         queued_exceptions += f"`data[\"type\"]` has a value of {data['type']}. Expected a value from [1, 2]!\n"  # Value of '0' means it's ungenerated, which we check for later
     if data["difficulty"] not in [0, 1, 2, 3]:
         queued_exceptions += f"`data[\"difficulty\"]` has a value of {data['difficulty']}. Expected a value from [0, 1, 2, 3]!\n"
-    if len(data["board"]) != 9:  # type: ignore
+    if "mask" in data:
+        if not MASK_PATTERN.fullmatch(data["mask"]) or int(data["mask"], 16) >> 81:  # type: ignore
+            queued_exceptions += f"`data[\"mask\"]` has a value of '{data['mask']}'. Expected an 81-bit hexadecimal string!\n"
+    if "derive" in data:
+        if not is_derivation(data["derive"]):
+            queued_exceptions += f"`data[\"derive\"]` has a value of '{data['derive']}'. Expected '<base ID>:<transform seed>:<removal mask>'!\n"
+    if "board" not in data:
+        pass
+    elif len(data["board"]) != 9:  # type: ignore
         queued_exceptions += f"`data[\"board\"]` has a length of {len(data['board'])}. Expected a length of 9!\n"  # type: ignore
     else:
         for row_index, row in enumerate(data["board"]):  # type: ignore
@@ -76,7 +157,7 @@ def validate_data(data: Any) -> None:
                 queued_exceptions += f'`data["board"][{row_index}]` has a length of {len(row)}. Expected a length of 9!\n'  # type: ignore
             else:
                 for col_index, col in enumerate(row):  # type: ignore
-                    if col not in [" ", "1", "2", "3", "4", "5", "6", "7", "8", "9"]:
+                    if col not in CELL_VALUES:
                         queued_exceptions += f"`data[\"board\"][{row_index}][{col_index}]` has a value of '{col}'. Expected a numerical string, or ' '!\n"  # type: ignore
     if data["type"] == 0:
         queued_exceptions += f"This board has not been generated!\n"
@@ -93,19 +174,51 @@ def deserialize(data_str: str) -> Board:
     validate_data(data)
 
     # Create a new Board instance and populate its attributes
+    if "mask" in data:
+        # Only the removal mask was stored, so regenerate the board from its seed
+        board: Board = Board.from_removal_mask(
+            int(data["id"]), Board.Difficulty(data["difficulty"]), int(data["mask"], 16)
+        )
+        board.type = Board.Type(data["type"])  # Set the board type
+        return board
+    if "derive" in data and "board" not in data:
+        # Only how the board was derived was stored, so derive it again
+        base_id, transform_seed, mask = data["derive"].split(":")
+        board: Board = Board.from_derivation(
+            data["id"],
+            base_id,
+            int(transform_seed),
+            Board.Difficulty(data["difficulty"]),
+            int(mask, 16),
+        )
+        board.type = Board.Type(data["type"])  # Set the board type
+        return board
+
     board: Board = Board()
     board.id = data["id"]  # Set the board's unique ID
-    Board.last_seed = max(int(board.id), Board.last_seed)  # Update the last seed
+    Board.note_seed(int(board.id))  # Update the last seed
     board.type = Board.Type(data["type"])  # Set the board type
     board.difficulty = Board.Difficulty(data["difficulty"])  # Set the difficulty level
     board.board = data["board"]  # Set the board's cell values
     board.generated = True  # Mark the board as generated
+    if "derive" in data:
+        # Keep track of how the board was derived, alongside its cells
+        base_id, transform_seed, _ = data["derive"].split(":")
+        board.base_id = base_id
+        board.transform_seed = int(transform_seed)
 
     return board  # Return the deserialized Board object
 
 
-def serialize(board: Board) -> str:
-    """Serializes a board's data into a JSON string."""
+def serialize(board: Board, mask: bool = False) -> str:
+    """Serializes a board's data into a JSON string.
+
+    With `mask`, only the board's removal mask is stored instead of its cells,
+    since the rest can be regenerated from its ID (See `Board.from_removal_mask()`).
+    Derived boards also store their base's ID and transform seed (And removal mask),
+    under "derive", in either form.
+    Boards that regenerating doesn't reproduce raise a `BoardException`.
+    """
     # Ensure the board has been generated before serializing
     if not board.generated:
         raise BoardException("Called `Board.serialize()` on an ungenerated board!")
@@ -119,5 +232,182 @@ def serialize(board: Board) -> str:
         "board": board.board,  # Board's cell values
     }
 
+    if board.base_id != "":
+        data["derive"] = (
+            f"{board.base_id}:{board.transform_seed}:{board.get_removal_mask():x}"
+        )
+
+    if mask:
+        del data["board"]
+        removal_mask: int = board.get_removal_mask()
+        if board.base_id != "":
+            rebuilt: Board = Board.from_derivation(
+                board.id,
+                board.base_id,
+                board.transform_seed,
+                board.difficulty,
+                removal_mask,
+            )
+        else:
+            data["mask"] = f"{removal_mask:x}"
+            rebuilt = Board.from_removal_mask(
+                int(board.id), board.difficulty, removal_mask
+            )
+
+        # Boards generated with other options (`backtrack` or `propagate`), or edited
+        # by hand, can't be rebuilt from their seed, so they'd silently change
+        if rebuilt.board != board.board:
+            raise BoardException(
+                f"Board {board.id} can't be serialized to the mask form, since it can't be regenerated from its seed!"
+            )
+
     # Convert the dictionary to a JSON string and return it
     return json.dumps(data)
+
+
+def pack_cells(board: list[list[str]]) -> bytes:
+    """Packs a board's 81 cell values into 41 bytes, 4 bits per cell"""
+    cells: str = "".join(value for row in board for value in row)
+    if not CELL_VALUES.issuperset(cells):
+        raise BoardException("Can't pack a board with an invalid cell value!")
+
+    # Pad the 81 cells out to a whole number of bytes
+    return bytes.fromhex(cells.replace(" ", "0") + "0")
+
+
+def unpack_cells(cells: bytes) -> list[list[str]]:
+    """Unpacks cell values packed by `pack_cells()`"""
+    digits: str = cells.hex()[:81]
+    if not PACKED_VALUES.issuperset(digits):
+        raise DeserializerException(
+            "The board's packed cells contain an invalid value!"
+        )
+
+    values: list[str] = list(digits.replace("0", " "))
+    return [values[row * 9 : (row + 1) * 9] for row in range(9)]
+
+
+def validate_header(board_id: str, board_type: int, board_difficulty: int) -> None:
+    """Validates the ID, type, and difficulty of a binary or string form board"""
+    queued_exceptions: str = ""
+    if not board_id.isdigit():
+        queued_exceptions += f"The board's ID has a value of '{board_id}'. Expected a numerical string!\n"
+    if board_type not in [1, 2]:
+        queued_exceptions += f"The board's type has a value of {board_type}. Expected a value from [1, 2]!\n"
+    if board_difficulty not in [0, 1, 2, 3]:
+        queued_exceptions += f"The board's difficulty has a value of {board_difficulty}. Expected a value from [0, 1, 2, 3]!\n"
+    if queued_exceptions != "":
+        raise DeserializerException(queued_exceptions)
+
+
+def build_board(
+    board_id: str, board_type: int, board_difficulty: int, cells: list[list[str]]
+) -> Board:
+    """Creates a generated board from already validated values"""
+    board: Board = Board()
+    board.id = board_id
+    Board.note_seed(int(board.id))  # Update the last seed
+    board.type = Board.Type(board_type)
+    board.difficulty = Board.Difficulty(board_difficulty)
+    board.board = cells
+    board.generated = True
+
+    return board
+
+
+def serialize_binary(board: Board) -> bytes:
+    """Serializes a board's data into 56 bytes."""
+    if not board.generated:
+        raise BoardException(
+            "Called `serde.serialize_binary()` on an ungenerated board!"
+        )
+    if str(int(board.id)) != board.id or int(board.id) >= 1 << 64:
+        raise BoardException(
+            f"Board ID '{board.id}' can't be serialized to the binary form!"
+        )
+
+    return BINARY.pack(
+        BINARY_MAGIC,
+        BINARY_VERSION,
+        int(board.id),
+        int(board.type),
+        int(board.difficulty),
+        pack_cells(board.board),
+    )
+
+
+def deserialize_binary(data: bytes) -> Board:
+    """Deserializes a board's data from its binary form."""
+    if len(data) != BINARY.size:
+        raise DeserializerException(
+            f"`data` has a length of {len(data)}. Expected a length of {BINARY.size}!"
+        )
+
+    magic, version, board_id, board_type, board_difficulty, cells = BINARY.unpack(data)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise DeserializerException(
+            f"`data` is not a version {BINARY_VERSION} binary board!"
+        )
+    validate_header(str(board_id), board_type, board_difficulty)
+    return build_board(str(board_id), board_type, board_difficulty, unpack_cells(cells))
+
+
+def serialize_string(board: Board) -> str:
+    """Serializes a board's data into a string, like `"7:1:0:53..7....(...)"`.
+
+    The last field is the 81 cells, row by row, with `.` for empty cells.
+    """
+    if not board.generated:
+        raise BoardException(
+            "Called `serde.serialize_string()` on an ungenerated board!"
+        )
+
+    cells: str = "".join(value for row in board.board for value in row)
+    return f"{board.id}:{int(board.type)}:{int(board.difficulty)}:{cells.replace(' ', '.')}"
+
+
+def deserialize_string(data: str) -> Board:
+    """Deserializes a board's data from its string form."""
+    fields: list[str] = data.strip().split(":")
+    if len(fields) != 4:
+        raise DeserializerException(
+            f"`data` has {len(fields)} fields. Expected 4 fields!"
+        )
+
+    board_id, board_type, board_difficulty, cells = fields
+    if not board_type.isdigit() or not board_difficulty.isdigit():
+        raise DeserializerException(
+            "The board's type and difficulty are expected to be numerical!"
+        )
+    validate_header(board_id, int(board_type), int(board_difficulty))
+    if len(cells) != 81 or not STRING_VALUES.issuperset(cells):
+        raise DeserializerException(
+            f"The board's cells are '{cells}'. Expected 81 of '1'-'9', or '.'!"
+        )
+
+    values: list[str] = list(cells.replace(".", " "))
+    return build_board(
+        board_id,
+        int(board_type),
+        int(board_difficulty),
+        [values[row * 9 : (row + 1) * 9] for row in range(9)],
+    )
+
+
+def deserialize_any(data: str | bytes) -> Board:
+    """Deserializes a board's data from any of its forms, detecting which one it's in."""
+    if isinstance(data, bytes):
+        if data.startswith(BINARY_MAGIC):
+            return deserialize_binary(data)
+        try:
+            data = data.decode()
+        except UnicodeDecodeError:
+            raise DeserializerException("`data` is not a board in any known form!")
+
+    if data.lstrip().startswith("{"):
+        try:
+            return deserialize(data)
+        except json.JSONDecodeError as err:
+            raise DeserializerException(f"`data` is not valid JSON! ({err})")
+
+    return deserialize_string(data)
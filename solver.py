@@ -0,0 +1,120 @@
+from typing import Optional
+from wfc import ALL_OPTIONS, BOX_OF, COL_OF, ROW_OF
+
+
+class Solver:
+    """A backtracking Sudoku solver, using bitmask candidates and MRV cell choice.
+
+    Cells are addressed by flat index (`y * 9 + x`), with 0 meaning empty, and
+    values placed in every row, column, and box are kept as 9-bit masks.
+    """
+
+    def __init__(self, values: list[int]) -> None:
+        self.values: list[int] = list(values)  # Value of each cell (0 = Empty)
+        self.rows: list[int] = [0] * 9  # Values placed in each row
+        self.cols: list[int] = [0] * 9  # Values placed in each column
+        self.boxes: list[int] = [0] * 9  # Values placed in each 3x3 box
+        self.empties: list[int] = []  # Indices of the cells still empty
+        self.solutions: list[list[int]] = []  # Solutions found so far
+        self.limit: int = 0  # Stop searching once this many solutions are found
+        # Set when the givens already repeat a value, so there can't be a solution
+        self.contradiction: bool = False
+
+        for index, value in enumerate(self.values):
+            if value == 0:
+                self.empties.append(index)
+                continue
+
+            bit: int = 1 << (value - 1)
+            row, col, box = ROW_OF[index], COL_OF[index], BOX_OF[index]
+            if (self.rows[row] | self.cols[col] | self.boxes[box]) & bit:
+                self.contradiction = True
+            self.rows[row] |= bit
+            self.cols[col] |= bit
+            self.boxes[box] |= bit
+
+    def remove(self, index: int) -> None:
+        """Empties a filled cell"""
+        bit: int = 1 << (self.values[index] - 1)
+        self.rows[ROW_OF[index]] ^= bit
+        self.cols[COL_OF[index]] ^= bit
+        self.boxes[BOX_OF[index]] ^= bit
+        self.values[index] = 0
+        self.empties.append(index)
+
+    def place(self, index: int, value: int) -> None:
+        """Fills a cell emptied by `remove()` back in"""
+        bit: int = 1 << (value - 1)
+        self.rows[ROW_OF[index]] |= bit
+        self.cols[COL_OF[index]] |= bit
+        self.boxes[BOX_OF[index]] |= bit
+        self.values[index] = value
+        self.empties.remove(index)
+
+    def solve(self, limit: int) -> list[list[int]]:
+        """Finds up to `limit` solutions, as lists of 81 values"""
+        self.solutions = []
+        self.limit = limit
+        if not self.contradiction and limit > 0:
+            self.__search()
+
+        return self.solutions
+
+    def __search(self) -> None:
+        """Fills the empty cell with the fewest options, trying each option in turn"""
+        rows, cols, boxes, empties = self.rows, self.cols, self.boxes, self.empties
+        if len(empties) == 0:
+            self.solutions.append(list(self.values))
+            return
+
+        # Find the empty cell with the fewest options (Minimum Remaining Values)
+        best: int = -1
+        best_options: int = 0
+        best_count: int = 10
+        for position, index in enumerate(empties):
+            options: int = ALL_OPTIONS & ~(
+                rows[ROW_OF[index]] | cols[COL_OF[index]] | boxes[BOX_OF[index]]
+            )
+            count: int = options.bit_count()
+            if count < best_count:
+                if count == 0:
+                    return  # Dead end, this cell can't be filled
+                best, best_options, best_count = position, options, count
+                if count == 1:
+                    break
+
+        # Take the cell out of `empties` (Swapping it with the last one), and put it
+        # back exactly where it was afterwards
+        index: int = empties[best]
+        empties[best] = empties[-1]
+        empties.pop()
+        row, col, box = ROW_OF[index], COL_OF[index], BOX_OF[index]
+        while best_options:
+            bit: int = best_options & -best_options  # Lowest remaining option
+            best_options ^= bit
+            rows[row] |= bit
+            cols[col] |= bit
+            boxes[box] |= bit
+            self.values[index] = bit.bit_length()
+
+            self.__search()
+
+            rows[row] ^= bit
+            cols[col] ^= bit
+            boxes[box] ^= bit
+            if len(self.solutions) >= self.limit:
+                break
+        self.values[index] = 0
+        empties.append(index)
+        empties[best], empties[-1] = empties[-1], empties[best]
+
+
+def solve(values: list[int]) -> Optional[list[int]]:
+    """Returns the first solution for a grid of 81 values (0 = Empty), if it has one"""
+    solutions: list[list[int]] = Solver(values).solve(1)
+    return solutions[0] if len(solutions) > 0 else None
+
+
+def count_solutions(values: list[int], limit: int = 2) -> int:
+    """Counts the solutions for a grid of 81 values (0 = Empty), stopping at `limit`"""
+    return len(Solver(values).solve(limit))
@@ -0,0 +1,241 @@
+from itertools import permutations
+from rand_man import Rng
+from typing import Optional
+import solver
+
+DIGITS: list[int] = list(range(1, 10))
+VALUES: list[str] = [str(value) for value in DIGITS]
+ORDERS: list[tuple[int, ...]] = list(permutations(range(3)))  # Every order of 3 things
+BAND_ROWS: list[list[int]] = [[0, 1, 2], [3, 4, 5], [6, 7, 8]]  # Rows of each band
+STACK_COLS: list[list[int]] = BAND_ROWS  # Columns of each stack
+
+
+class Transform:
+    """A validity-preserving rearrangement of a Sudoku grid.
+
+    Relabels the digits, shuffles the bands (And the rows within each band), the
+    stacks (And the columns within each stack), then optionally transposes the
+    grid. Every transform is fully determined by its seed.
+    """
+
+    def __init__(self, seed: int) -> None:
+        self.seed: int = seed
+        rng: Rng = Rng(seed)
+
+        # New label of each digit (`digits[value - 1]`)
+        self.digits: list[int] = rng.local_random.sample(DIGITS, 9)
+        # Old row, and column, each new row and column is taken from. Picking from
+        # the 6 orders of 3 is much cheaper than shuffling each triple.
+        choices: list[int] = [rng.local_random.randrange(6) for _ in range(8)]
+        self.rows: list[int] = [
+            (band * 3) + row
+            for band, order in zip(ORDERS[choices[0]], choices[1:4])
+            for row in ORDERS[order]
+        ]
+        self.cols: list[int] = [
+            (stack * 3) + col
+            for stack, order in zip(ORDERS[choices[4]], choices[5:8])
+            for col in ORDERS[order]
+        ]
+        self.transpose: bool = rng.local_random.random() < 0.5
+
+        # Flat index of the old cell every new cell is taken from
+        if self.transpose:
+            self.sources: list[int] = [
+                (self.rows[x] * 9) + self.cols[y] for y in range(9) for x in range(9)
+            ]
+        else:
+            self.sources: list[int] = [
+                (self.rows[y] * 9) + self.cols[x] for y in range(9) for x in range(9)
+            ]
+
+        # Lookup table relabeling a cell's string value (Empty cells stay empty)
+        self.labels: dict[str, str] = dict(zip(VALUES, map(str, self.digits)))
+        self.labels[" "] = " "
+
+    def apply(self, cells: list[str]) -> list[str]:
+        """Transforms 81 row-major cell values"""
+        labels: dict[str, str] = self.labels
+        return [labels[cells[source]] for source in self.sources]
+
+
+class Canonicalizer:
+    """Finds the minimal lexicographic form of a full grid, under every transform.
+
+    The first 2 rows always come from the same band. Once the digits are labeled
+    by the first row, the second row only depends on the column order, so just
+    the column orders keeping it minimal are searched. The rest of the rows,
+    and the labels, follow from those.
+    """
+
+    def __init__(self, values: list[int]) -> None:
+        self.values: list[int] = values  # Value of each cell of the full grid
+        self.best: Optional[list[int]] = None  # Smallest second row found so far
+        # Every (transpose, first row, second row, column order) reaching `best`
+        self.candidates: list[tuple[bool, int, int, list[int]]] = []
+
+        # State of the column order search, for the current 2 rows
+        self.sigma: list[int] = []  # First row column of each second row value
+        self.cols: list[int] = [-1] * 9  # Old column at each new position
+        self.places: list[int] = [-1] * 9  # New position of each old column
+        self.slots: list[int] = [-1] * 3  # Old stack at each new stack
+        self.row: list[int] = []  # Second row so far
+
+    def canonicalize(self) -> tuple[list[int], list[tuple[list[int], list[int]]]]:
+        """Returns the minimal form, and every transform reaching it.
+
+        Transforms are pairs of source indices (Like `Transform.sources`) and the
+        new label of each digit (`labels[0]` staying 0).
+        """
+        for transpose in [False, True]:
+            grid: list[tuple[int, ...]] = self.__get_grid(transpose)
+            for first in range(9):
+                col_of: dict[int, int] = {
+                    value: col for col, value in enumerate(grid[first])
+                }
+                for second in BAND_ROWS[first // 3]:
+                    if second != first:
+                        self.sigma = [col_of[value] for value in grid[second]]
+                        self.__search(0, transpose, first, second)
+
+        results: list[tuple[list[int], list[int], list[int]]] = [
+            self.__build(*candidate) for candidate in self.candidates
+        ]
+        form: list[int] = min(result[0] for result in results)
+        return form, [
+            (sources, labels) for values, sources, labels in results if values == form
+        ]
+
+    def __get_grid(self, transpose: bool) -> list[tuple[int, ...]]:
+        """Returns the grid's rows, or its columns if `transpose`"""
+        if transpose:
+            return [tuple(self.values[x::9]) for x in range(9)]
+        return [tuple(self.values[y * 9 : (y + 1) * 9]) for y in range(9)]
+
+    def __place(self, col: int, position: int) -> None:
+        """Moves an old column to a new position"""
+        self.cols[position] = col
+        self.places[col] = position
+
+    def __search(self, position: int, transpose: bool, first: int, second: int) -> None:
+        """Tries every column for a new position that keeps the second row minimal"""
+        cols, places, slots, row = self.cols, self.places, self.slots, self.row
+        if position == 9:
+            if self.best is None or row < self.best:
+                self.best = list(row)
+                self.candidates = []
+            self.candidates.append((transpose, first, second, list(cols)))
+            return
+
+        slot: int = position // 3
+        if cols[position] != -1:
+            options: list[int] = [cols[position]]
+        elif slots[slot] != -1:
+            options = [col for col in STACK_COLS[slots[slot]] if places[col] == -1]
+        else:
+            options = [
+                col
+                for stack in range(3)
+                if stack not in slots
+                for col in STACK_COLS[stack]
+            ]
+
+        for col in options:
+            placed: list[int] = []  # Columns placed by this option
+            claimed: list[int] = []  # New stacks claimed by this option
+            if places[col] == -1:
+                if slots[slot] == -1:
+                    slots[slot] = col // 3
+                    claimed.append(slot)
+                self.__place(col, position)
+                placed.append(col)
+
+            # Giving `target` anything but the smallest position left would only
+            # make the second row bigger
+            target: int = self.sigma[col]
+            if places[target] == -1:
+                if (target // 3) in slots:
+                    target_slot: int = slots.index(target // 3)
+                else:
+                    target_slot = slots.index(-1)
+                    slots[target_slot] = target // 3
+                    claimed.append(target_slot)
+                self.__place(
+                    target,
+                    next(
+                        spot
+                        for spot in range(target_slot * 3, (target_slot * 3) + 3)
+                        if cols[spot] == -1
+                    ),
+                )
+                placed.append(target)
+
+            row.append(places[target] + 1)
+            if self.best is None or row <= self.best[: len(row)]:
+                self.__search(position + 1, transpose, first, second)
+            row.pop()
+
+            for placed_col in placed:
+                cols[places[placed_col]] = -1
+                places[placed_col] = -1
+            for claimed_slot in claimed:
+                slots[claimed_slot] = -1
+
+    def __build(
+        self, transpose: bool, first: int, second: int, cols: list[int]
+    ) -> tuple[list[int], list[int], list[int]]:
+        """Returns the form, source indices, and labels of a candidate"""
+        grid: list[tuple[int, ...]] = self.__get_grid(transpose)
+        labels: list[int] = [0] * 10
+        for position, col in enumerate(cols):
+            labels[grid[first][col]] = position + 1
+
+        def relabel(row: int) -> list[int]:
+            return [labels[grid[row][col]] for col in cols]
+
+        # The first band is fixed by its first 2 rows. Every other band's rows are
+        # all different, so they're just sorted, then the bands by their first row.
+        (third,) = set(BAND_ROWS[first // 3]) - {first, second}
+        bands: list[list[int]] = sorted(
+            (
+                sorted(BAND_ROWS[band], key=relabel)
+                for band in range(3)
+                if band != first // 3
+            ),
+            key=lambda rows: relabel(rows[0]),
+        )
+        order: list[int] = [first, second, third] + bands[0] + bands[1]
+
+        form: list[int] = [value for row in order for value in relabel(row)]
+        sources: list[int] = [
+            ((col * 9) + row) if transpose else ((row * 9) + col)
+            for row in order
+            for col in cols
+        ]
+        return form, sources, labels
+
+
+def canonical_form(values: list[int]) -> str:
+    """Returns the minimal lexicographic form of a grid of 81 values (0 = Empty).
+
+    Grids that are the same up to symmetry share the same form, as a string of
+    81 characters ("." = Empty). Game grids are aligned by their solution, and
+    then take the smallest result, so two puzzles only share a form when one
+    can be transformed into the other. Puzzles with more than 1 solution are
+    aligned by the first one found, which may miss some of their repeats.
+    """
+    grid: Optional[list[int]] = list(values)
+    if 0 in values:
+        grid = solver.solve(values)
+    if grid is None:
+        # Nothing to align an unsolvable grid by, so it's left as is
+        return "".join(str(value) if value != 0 else "." for value in values)
+
+    form, transforms = Canonicalizer(grid).canonicalize()
+    if 0 in values:
+        form = min(
+            [labels[values[source]] for source in sources]
+            for sources, labels in transforms
+        )
+
+    return "".join(str(value) if value != 0 else "." for value in form)
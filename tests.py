@@ -1,4 +1,9 @@
-import unittest
+from typing import TYPE_CHECKING
+import importlib.util, unittest
+
+if TYPE_CHECKING:
+    # Only for annotating the helpers, every test imports what it needs itself
+    from board import Board
 
 
 class TestBoardMethods(unittest.TestCase):
@@ -130,6 +135,136 @@ class TestBoardMethods(unittest.TestCase):
 
         self.assertEqual(board, deserial)
 
+    def test_deserialize_invalid(self):
+        from board import Board
+        from errors import DeserializerException
+        from typing import Any
+        import json, serde
+
+        board: Board = Board()
+        board.generate(0)
+        data: Any = json.loads(serde.serialize(board))
+        self.assertTrue(serde.is_well_formed(data))
+
+        # Every problem must be caught by the fast path, and reported by the slow one
+        problems: list[tuple[str, Any]] = [
+            ("id", "x"),
+            ("id", 0),
+            ("type", 0),
+            ("difficulty", 4),
+            ("board", data["board"][:8]),
+            ("board", data["board"][:8] + [data["board"][8][:8]]),
+            ("board", data["board"][:8] + [["12", ""] + data["board"][8][2:]]),
+            ("board", data["board"][:8] + [["0"] + data["board"][8][1:]]),
+            ("board", data["board"][:8] + [[1] + data["board"][8][1:]]),
+            ("board", data["board"][:8] + [[[]] + data["board"][8][1:]]),
+            ("board", data["board"][:8] + [tuple(data["board"][8])]),
+        ]
+        for key, value in problems:
+            bad_data: Any = dict(data)
+            bad_data[key] = value
+            self.assertFalse(serde.is_well_formed(bad_data), (key, value))
+            with self.assertRaises(DeserializerException, msg=(key, value)):
+                serde.validate_data(bad_data)
+
+    def test_serialize_mask(self):
+        from board import Board
+        from errors import DeserializerException
+        import json, serde
+
+        board: Board = Board()
+        board.generate(5)
+        board.gameify(Board.Difficulty.EASY)
+
+        serial: str = serde.serialize(board, mask=True)
+        data: dict[str, object] = json.loads(serial)
+
+        self.assertEqual(sorted(data), ["difficulty", "id", "mask", "type"])
+        self.assertEqual(data["mask"], f"{board.get_removal_mask():x}")
+        self.assertEqual(serde.deserialize(serial), board)
+        self.assertEqual(serde.deserialize_any(serial), board)
+
+        for mask in ["", "x", f"{1 << 81:x}", "A"]:
+            with self.assertRaises(DeserializerException):
+                serde.deserialize(json.dumps(dict(data, mask=mask)))
+        with self.assertRaises(DeserializerException):
+            serde.deserialize(json.dumps(dict(data, mask=0)))
+
+    def test_serialize_mask_not_regenerable(self):
+        from board import Board
+        from errors import BoardException
+        import serde
+
+        # Generating with `propagate` gives a different board for the same seed
+        propagated: Board = Board()
+        propagated.generate(7, Board.Engine.BITMASK, propagate=True)
+        propagated.gameify(Board.Difficulty.EASY)
+        # And so does a board edited after it was generated
+        edited: Board = Board()
+        edited.generate(7)
+        edited.board[0][0], edited.board[0][1] = edited.board[0][1], edited.board[0][0]
+
+        for board in [propagated, edited]:
+            with self.assertRaises(BoardException):
+                serde.serialize(board, mask=True)
+
+    def test_serialize_string(self):
+        from board import Board
+        import serde
+
+        board: Board = Board()
+        board.generate(0)
+        board.board[0][1] = " "
+
+        serial: str = serde.serialize_string(board)
+
+        self.assertEqual(serial[:6], "0:1:0:")
+        self.assertEqual(serial[6:15], "1.4682957")
+        self.assertEqual(len(serial), 6 + 81)
+
+    def test_deserialize_other_forms(self):
+        from board import Board
+        import serde
+
+        board: Board = Board()
+        board.generate(0)
+        board.gameify(Board.Difficulty.HARD)
+
+        binary: bytes = serde.serialize_binary(board)
+        string: str = serde.serialize_string(board)
+
+        self.assertEqual(len(binary), 56)
+        self.assertEqual(serde.deserialize_binary(binary), board)
+        self.assertEqual(serde.deserialize_string(string), board)
+
+        # Every form is detected automatically
+        for serial in [binary, string, serde.serialize(board)]:
+            self.assertEqual(serde.deserialize_any(serial), board)
+        self.assertEqual(serde.deserialize_any(string.encode()), board)
+
+    def test_deserialize_other_forms_corrupted(self):
+        from board import Board
+        from errors import DeserializerException
+        import serde
+
+        board: Board = Board()
+        board.generate(0)
+
+        binary: bytes = serde.serialize_binary(board)
+        string: str = serde.serialize_string(board)
+
+        for serial in [
+            binary[:-1],
+            binary[:-1] + b"\xff",
+            b"\xff\xfe",
+            string[:-1],
+            string.replace("0:1:", "0:0:", 1),
+            string[:-1] + "x",
+            "x:1:0:" + string[6:],
+        ]:
+            with self.assertRaises(DeserializerException):
+                serde.deserialize_any(serial)
+
     #
     # ==================================================================================
     # FORMAT
@@ -231,6 +366,21 @@ class TestBoardMethods(unittest.TestCase):
         board2.generate(0)
         self.assertEqual(board1.board, board2.board)
 
+    def test_generate_ignores_rand(self):
+        from board import Board
+        from rand_man import Rand
+
+        board1: Board = Board()
+        board1.generate(0)
+
+        Rand.set_seed(123456)  # type: ignore
+        for _ in range(100):
+            Rand.random()  # type: ignore
+
+        board2: Board = Board()
+        board2.generate(0)
+        self.assertEqual(board1.board, board2.board)
+
     def test_generate_integers_only(self):
         from board import Board
 
@@ -244,6 +394,109 @@ class TestBoardMethods(unittest.TestCase):
                             f"`Board.generate()` generated a non-integer value:\n    Val: '{board.board[y][x]}' ({x}, {y})\n    Seed: {seed}"
                         )
 
+    def test_generate_bitmask_equivalence(self):
+        from board import Board
+
+        for seed in range(100):
+            board1: Board = Board()
+            board1.generate(seed)
+            board2: Board = Board()
+            board2.generate(seed, engine=Board.Engine.BITMASK)
+
+            self.assertEqual(board1, board2)
+
+    def test_generate_bitmask_filled(self):
+        from board import Board
+        import serde
+
+        board: Board = Board()
+        board.generate(0, engine=Board.Engine.BITMASK)
+
+        serial: str = serde.serialize(board)
+        expect_serial: str = (
+            '{"id": "0", "type": 1, "difficulty": 0, "board": [["1", "3", "4", "6", "8", "2", "9", "5", "7"], ["2", "8", "7", "9", "5", "1", "6", "4", "3"], ["9", "6", "5", "7", "4", "3", "8", "1", "2"], ["5", "7", "2", "4", "1", "6", "3", "9", "8"], ["6", "4", "8", "3", "2", "9", "1", "7", "5"], ["3", "9", "1", "5", "7", "8", "4", "2", "6"], ["8", "1", "6", "2", "9", "7", "5", "3", "4"], ["7", "5", "3", "1", "6", "4", "2", "8", "9"], ["4", "2", "9", "8", "3", "5", "7", "6", "1"]]}'
+        )
+
+        self.assertEqual(serial, expect_serial)
+
+    def test_generate_resets_equivalence(self):
+        from board import Board
+
+        for seed in range(50):
+            board1: Board = Board()
+            board1.generate(seed)
+            board2: Board = Board()
+            board2.generate(seed, engine=Board.Engine.BITMASK)
+
+            self.assertEqual(board1.resets, board2.resets)
+
+    def test_generate_backtrack_valid(self):
+        from board import Board
+
+        for seed in range(50):
+            board: Board = Board()
+            board.generate(seed, engine=Board.Engine.BITMASK, backtrack=True)
+
+            self.assertEqual(board.resets, 0)
+            for index in range(9):
+                row: set[str] = set(board.board[index])
+                col: set[str] = set(board.board[y][index] for y in range(9))
+                box: set[str] = set(
+                    board.board[((index // 3) * 3) + (cell // 3)][
+                        ((index % 3) * 3) + (cell % 3)
+                    ]
+                    for cell in range(9)
+                )
+                for group in [row, col, box]:
+                    self.assertEqual(group, set("123456789"))
+
+    def test_generate_backtrack_cell_engine(self):
+        from board import Board
+        from errors import BoardException
+
+        board: Board = Board()
+
+        with self.assertRaises(BoardException):
+            board.generate(0, engine=Board.Engine.CELL, backtrack=True)
+
+    def test_generate_propagate_valid(self):
+        from board import Board
+
+        for seed in range(50):
+            board: Board = Board()
+            board.generate(seed, engine=Board.Engine.BITMASK, propagate=True)
+
+            for index in range(9):
+                row: set[str] = set(board.board[index])
+                col: set[str] = set(board.board[y][index] for y in range(9))
+                box: set[str] = set(
+                    board.board[((index // 3) * 3) + (cell // 3)][
+                        ((index % 3) * 3) + (cell % 3)
+                    ]
+                    for cell in range(9)
+                )
+                for group in [row, col, box]:
+                    self.assertEqual(group, set("123456789"))
+
+    def test_generate_propagate_determinism(self):
+        from board import Board
+
+        board1: Board = Board()
+        board1.generate(0, engine=Board.Engine.BITMASK, propagate=True)
+        board2: Board = Board()
+        board2.generate(0, engine=Board.Engine.BITMASK, propagate=True)
+
+        self.assertEqual(board1, board2)
+
+    def test_generate_propagate_cell_engine(self):
+        from board import Board
+        from errors import BoardException
+
+        board: Board = Board()
+
+        with self.assertRaises(BoardException):
+            board.generate(0, engine=Board.Engine.CELL, propagate=True)
+
     #
     # ==================================================================================
     # GAMEIFY
@@ -344,167 +597,1173 @@ class TestBoardMethods(unittest.TestCase):
 
         self.assertEqual(differences, 46)
 
+    def test_gameify_unique(self):
+        import batch
+        from board import Board
 
-class TestBoardTypes(unittest.TestCase):
-    # ==================================================================================
-    # DIFFICULTY
-    # ==================================================================================
-    def test_difficulty_easy_str(self):
+        for difficulty, num_to_remove in [
+            (Board.Difficulty.EASY, 28),
+            (Board.Difficulty.HARD, 46),
+        ]:
+            for board in batch.generate_many(
+                range(20), difficulty=difficulty, unique=True
+            ):
+                empty: int = sum(row.count(" ") for row in board.board)
+                self.assertLessEqual(empty, num_to_remove)
+                self.assertEqual(board.count_solutions(), 1)
+                self.assertEqual(board.difficulty, difficulty)
+
+    def test_gameify_deterministic(self):
+        import random
         from board import Board
 
-        self.assertEqual(str(Board.Difficulty.EASY), "Easy")
+        boards: list[Board] = []
+        for _ in range(2):
+            random.seed(len(boards))  # The global RNG mustn't matter
+            board: Board = Board()
+            board.generate(7)
+            board.gameify(Board.Difficulty.MEDIUM)
+            boards.append(board)
+        self.assertEqual(boards[0], boards[1])
+
+        # Every difficulty removes a different set of cells
+        other: Board = Board()
+        other.generate(7)
+        other.gameify(Board.Difficulty.EASY)
+        self.assertNotEqual(
+            other.get_removal_mask() & boards[0].get_removal_mask(),
+            other.get_removal_mask(),
+        )
 
-    def test_difficulty_medium_str(self):
+    def test_removal_mask(self):
         from board import Board
 
-        self.assertEqual(str(Board.Difficulty.MEDIUM), "Medium")
+        for unique in [False, True]:
+            board: Board = Board()
+            board.generate(3)
+            self.assertEqual(board.get_removal_mask(), 0)
+            board.gameify(Board.Difficulty.HARD, unique=unique)
+
+            mask: int = board.get_removal_mask()
+            self.assertEqual(mask.bit_count(), 46)
+            self.assertEqual(
+                Board.from_removal_mask(3, Board.Difficulty.HARD, mask), board
+            )
 
-    def test_difficulty_hard_str(self):
+    #
+    # ==================================================================================
+    # SOLVE
+    # ==================================================================================
+    def test_solve_game(self):
+        import batch, checker
+        from board import Board
+        from copy import deepcopy
+        from typing import Optional
+
+        for board in batch.generate_many(range(50)):
+            full: Board = deepcopy(board)
+            board.gameify(Board.Difficulty.HARD)
+
+            solved: Optional[Board] = board.solve()
+            self.assertIsNotNone(solved)
+            self.assertTrue(checker.is_valid(solved))  # type: ignore
+            # The givens are always kept
+            for y in range(9):
+                for x in range(9):
+                    if board.board[y][x] != " ":
+                        self.assertEqual(solved.board[y][x], board.board[y][x])  # type: ignore
+
+            # A puzzle with a unique solution can only be solved back into its board
+            if board.count_solutions() == 1:
+                self.assertEqual(solved, full)
+
+    def test_solve_full(self):
         from board import Board
 
-        self.assertEqual(str(Board.Difficulty.HARD), "Hard")
+        board: Board = Board()
+        board.generate(0)
 
+        self.assertEqual(board.solve(), board)
+        self.assertEqual(board.count_solutions(), 1)
 
-def save_dir_helper() -> str:
-    import pathlib, os, files
+    def test_count_solutions(self):
+        from board import Board
 
-    save_dir: str = os.path.abspath("./test_saved_boards")
-    try:
-        files.delete_path(save_dir)
-    except FileNotFoundError:
-        pass
-    pathlib.Path(save_dir).mkdir(parents=True, exist_ok=False)
+        board: Board = Board()
+        board.generate(0)
 
-    return save_dir
+        # An empty board has countless solutions, so counting stops at the limit
+        empty: Board = Board()
+        empty.id, empty.type, empty.generated = "0", Board.Type.GAME, True
+        self.assertEqual(empty.count_solutions(), 2)
+        self.assertEqual(empty.count_solutions(limit=5), 5)
 
+        # With 2 rows of the same band cleared, swapping them is always another solution
+        board.type = Board.Type.GAME
+        board.board[0] = [" "] * 9
+        board.board[1] = [" "] * 9
+        self.assertEqual(board.count_solutions(), 2)
+        self.assertEqual(board.count_solutions(limit=1), 1)
 
-class TestFilesMethods(unittest.TestCase):
+    def test_solve_impossible(self):
+        from board import Board
+        from errors import BoardException
+
+        board: Board = Board()
+        with self.assertRaises(BoardException):
+            board.solve()
+
+        board.generate(0)
+        board.type = Board.Type.GAME
+        board.board[0][0] = board.board[0][1]
+        self.assertIsNone(board.solve())
+        self.assertEqual(board.count_solutions(), 0)
+
+    #
     # ==================================================================================
-    # LOAD
+    # TRANSFORM
     # ==================================================================================
-    def test_load_saved_boards_empty(self):
+    def test_transform(self):
+        import checker
+        from board import Board
+        from errors import BoardException
+
+        board: Board = Board()
+        board.generate(0)
+        board.gameify(Board.Difficulty.HARD, unique=True)
+
+        derived: Board = board.transform(12, board_id="1000")
+        self.assertEqual(derived.id, "1000")
+        self.assertEqual((derived.base_id, derived.transform_seed), ("0", 12))
+        self.assertEqual(derived.difficulty, Board.Difficulty.HARD)
+        self.assertTrue(checker.is_valid(derived))
+        self.assertEqual(derived.count_solutions(), 1)
+
+        # The same seed always rearranges the board the same way
+        self.assertEqual(board.transform(12, board_id="1000"), derived)
+        self.assertNotEqual(board.transform(13, board_id="1000"), derived)
+        self.assertEqual(
+            sum(row.count(" ") for row in derived.board),
+            sum(row.count(" ") for row in board.board),
+        )
+
+        with self.assertRaises(BoardException):
+            derived.transform(1)
+
+    def test_serialize_derived(self):
+        from board import Board
+        from errors import DeserializerException
+        import json, serde
+
+        board: Board = Board()
+        board.generate(9)
+        derived: Board = board.transform(3, board_id="500")
+
+        for difficulty in [None, Board.Difficulty.MEDIUM]:
+            if difficulty is not None:
+                derived.gameify(difficulty)
+            serial: str = serde.serialize(derived, mask=True)
+            data: dict[str, str] = json.loads(serial)
+
+            self.assertEqual(data["derive"], f"9:3:{derived.get_removal_mask():x}")
+            self.assertNotIn("board", data)
+            deserial: Board = serde.deserialize(serial)
+            self.assertEqual(deserial, derived)
+            self.assertEqual((deserial.base_id, deserial.transform_seed), ("9", 3))
+
+            # The full form keeps the derivation alongside the cells too
+            full: str = serde.serialize(derived)
+            self.assertEqual(json.loads(full)["derive"], data["derive"])
+            self.assertTrue(serde.is_well_formed(json.loads(full)))
+            deserial = serde.deserialize(full)
+            self.assertEqual(deserial, derived)
+            self.assertEqual((deserial.base_id, deserial.transform_seed), ("9", 3))
+            self.assertEqual(serde.serialize(deserial, mask=True), serial)
+
+        # Any transform seed `Board.transform()` takes round trips, even negative ones
+        negative: Board = board.transform(-3, board_id="501")
+        negative.gameify(Board.Difficulty.EASY)
+        for serial in [serde.serialize(negative), serde.serialize(negative, mask=True)]:
+            self.assertEqual(json.loads(serial)["derive"].split(":")[1], "-3")
+            deserial = serde.deserialize(serial)
+            self.assertEqual(deserial, negative)
+            self.assertEqual(deserial.transform_seed, -3)
+
+        # Loading a derived board keeps new IDs after it, like any other board
+        for serial in [serde.serialize(derived), serde.serialize(derived, mask=True)]:
+            Board.last_seed = 0
+            serde.deserialize(serial)
+            self.assertEqual(Board.last_seed, 500)
+
+        for derive in ["9:3", "x:3:0", "9:-:0", f"9:3:{1 << 81:x}", 5]:
+            bad_data: dict[str, object] = dict(json.loads(full), derive=derive)
+            self.assertFalse(serde.is_well_formed(bad_data))
+            with self.assertRaises(DeserializerException):
+                serde.validate_data(bad_data)
+
+    def test_save_derived(self):
         import files
         from board import Board
 
         save_dir: str = save_dir_helper()
 
-        saved_boards: list[Board] = files.load_saved_boards(save_dir=save_dir)
+        board: Board = Board()
+        board.generate(9)
+        derived: Board = board.transform(3, board_id="500")
+        files.save_board(derived, save_dir=save_dir)
 
-        self.assertEqual(saved_boards, [])
+        (loaded,) = files.load_saved_boards(save_dir=save_dir)
+        self.assertEqual(loaded, derived)
+        self.assertEqual((loaded.base_id, loaded.transform_seed), ("9", 3))
 
         files.delete_path(save_dir)
 
-    def test_load_saved_boards(self):
-        import os, files
+    def test_canonical_form(self):
         from board import Board
 
-        save_dir: str = save_dir_helper()
-
-        with open(os.path.abspath(f"{save_dir}/0.board"), "x+") as file:
-            file.write(
-                '{"id": "0", "type": 1, "difficulty": 0, "board": [["1", "3", "4", "6", "8", "2", "9", "5", "7"], ["2", "8", "7", "9", "5", "1", "6", "4", "3"], ["9", "6", "5", "7", "4", "3", "8", "1", "2"], ["5", "7", "2", "4", "1", "6", "3", "9", "8"], ["6", "4", "8", "3", "2", "9", "1", "7", "5"], ["3", "9", "1", "5", "7", "8", "4", "2", "6"], ["8", "1", "6", "2", "9", "7", "5", "3", "4"], ["7", "5", "3", "1", "6", "4", "2", "8", "9"], ["4", "2", "9", "8", "3", "5", "7", "6", "1"]]}'
+        board: Board = Board()
+        board.generate(4)
+        form: str = board.canonical_form()
+        self.assertEqual(len(form), 81)
+        self.assertTrue(form.startswith("123456789"))
+
+        # Every symmetry of a board shares its form, and other boards don't
+        for seed in range(5):
+            self.assertEqual(
+                board.transform(seed, board_id="100").canonical_form(), form
             )
-        with open(os.path.abspath(f"{save_dir}/1.board"), "x+") as file:
-            file.write(
-                '{"id": "1", "type": 1, "difficulty": 0, "board": [["8", "4", "6", "5", "9", "3", "1", "2", "7"], ["9", "2", "3", "1", "4", "7", "8", "6", "5"], ["1", "5", "7", "2", "6", "8", "4", "9", "3"], ["3", "9", "1", "6", "7", "5", "2", "8", "4"], ["5", "7", "4", "8", "2", "9", "3", "1", "6"], ["6", "8", "2", "4", "3", "1", "7", "5", "9"], ["4", "6", "8", "3", "5", "2", "9", "7", "1"], ["7", "1", "5", "9", "8", "4", "6", "3", "2"], ["2", "3", "9", "7", "1", "6", "5", "4", "8"]]}'
+        other: Board = Board()
+        other.generate(5)
+        self.assertNotEqual(other.canonical_form(), form)
+
+        board.gameify(Board.Difficulty.MEDIUM, unique=True)
+        game_form: str = board.canonical_form()
+        self.assertEqual(
+            game_form.count("."), sum(row.count(" ") for row in board.board)
+        )
+        for seed in range(5):
+            self.assertEqual(
+                board.transform(seed, board_id="100").canonical_form(), game_form
             )
-        with open(os.path.abspath(f"{save_dir}/0.txt"), "x+") as file:
-            file.write("test")
-
-        saved_boards: list[Board] = files.load_saved_boards(save_dir=save_dir)
-
-        self.assertEqual(len(saved_boards), 2)
-
-        files.delete_path(save_dir)
 
     #
     # ==================================================================================
-    # SAVE
+    # GRADE
     # ==================================================================================
-    def test_save_board_empty(self):
-        import files
+    def test_grade(self):
+        import grader
         from board import Board
-        from errors import FileException
-
-        save_dir: str = save_dir_helper()
 
         board: Board = Board()
+        board.generate(0)
+        self.assertEqual(board.grade(), grader.Grade(grader.Technique.NONE, 0, 0))
 
-        with self.assertRaises(FileException):
-            files.save_board(board, save_dir=save_dir)
+        board.board[4][4] = " "
+        self.assertEqual(
+            board.grade(), grader.Grade(grader.Technique.NAKED_SINGLE, 1, 1)
+        )
 
-        files.delete_path(save_dir)
+        # Puzzles with many solutions (Or none) can't be solved by logic alone
+        board.board[0] = [" "] * 9
+        board.board[1] = [" "] * 9
+        self.assertEqual(board.grade().hardest, grader.Technique.GUESS)
+        board.board[4][4] = board.board[4][5]
+        self.assertEqual(board.grade().hardest, grader.Technique.GUESS)
 
-    def test_save_board_filled(self):
-        import os, files
+    def test_grade_solves(self):
+        import grader
         from board import Board
 
-        save_dir: str = save_dir_helper()
+        # Whatever the techniques, logic must only ever reach the actual solution
+        for seed in range(30):
+            board: Board = Board()
+            board.generate(seed)
+            full: list[int] = [int(value) for row in board.board for value in row]
+            board.gameify(Board.Difficulty.HARD, graded=True)
+
+            board_grader: grader.Grader = grader.Grader(
+                [
+                    0 if value == " " else int(value)
+                    for row in board.board
+                    for value in row
+                ]
+            )
+            if board_grader.grade().hardest != grader.Technique.GUESS:
+                self.assertEqual(board_grader.values, full)
+
+    def test_grade_techniques(self):
+        import grader, solver
+
+        # Puzzles that each need a technique, and nothing harder, to be solved
+        for technique, puzzle in [
+            (
+                grader.Technique.LOCKED_CANDIDATES,
+                "...8..1.9291...84....9..7..75........1329.4.....4....1....4....36...7.1.942..86..",
+            ),
+            (
+                grader.Technique.NAKED_PAIR,
+                "...6.2.5...79.16..9...4...2.......98...3.9.7539....42.8.6....347..1..........5...",
+            ),
+            (
+                grader.Technique.HIDDEN_PAIR,
+                ".....7.1.26..8........5.4.85...6.......9..1..68...2.4.....9.6..8364..2..91.7.....",
+            ),
+            (
+                grader.Technique.X_WING,
+                "....7..6...21..7...79...2..3.18..4.6...6......5..931.........5.4.63....1....1...9",
+            ),
+        ]:
+            values: list[int] = [0 if cell == "." else int(cell) for cell in puzzle]
+            board_grader: grader.Grader = grader.Grader(values)
+            grade: grader.Grade = board_grader.grade()
+
+            self.assertEqual(grade.hardest, technique)
+            self.assertEqual(grade.get_difficulty(), 3)
+            self.assertEqual(board_grader.values, solver.solve(values))
+
+    def test_grade_score(self):
+        import grader
+
+        # Enough singles raise a puzzle's difficulty, just like harder techniques
+        for score, difficulty in [(44, 1), (grader.MEDIUM_SCORE, 2), (69, 2)]:
+            self.assertEqual(
+                grader.Grade(
+                    grader.Technique.NAKED_SINGLE, score, score
+                ).get_difficulty(),
+                difficulty,
+            )
+        self.assertEqual(
+            grader.Grade(
+                grader.Technique.HIDDEN_SINGLE, 50, grader.HARD_SCORE
+            ).get_difficulty(),
+            3,
+        )
+
+    def test_gameify_graded(self):
+        from board import Board
 
+        for difficulty in [
+            Board.Difficulty.EASY,
+            Board.Difficulty.MEDIUM,
+            Board.Difficulty.HARD,
+        ]:
+            for seed in range(10):
+                board: Board = Board()
+                board.generate(seed)
+                board.gameify(difficulty, graded=True)
+
+                # Boards are labeled by the difficulty they actually grade as
+                self.assertLessEqual(board.difficulty, difficulty)
+                self.assertEqual(board.grade().get_difficulty(), board.difficulty)
+                self.assertEqual(board.count_solutions(), 1)
+
+        # Hard puzzles need more than singles
         board: Board = Board()
         board.generate(0)
-        files.save_board(board, save_dir=save_dir)
-
-        expect_data: str = (
-            '{"id": "0", "type": 1, "difficulty": 0, "board": [["1", "3", "4", "6", "8", "2", "9", "5", "7"], ["2", "8", "7", "9", "5", "1", "6", "4", "3"], ["9", "6", "5", "7", "4", "3", "8", "1", "2"], ["5", "7", "2", "4", "1", "6", "3", "9", "8"], ["6", "4", "8", "3", "2", "9", "1", "7", "5"], ["3", "9", "1", "5", "7", "8", "4", "2", "6"], ["8", "1", "6", "2", "9", "7", "5", "3", "4"], ["7", "5", "3", "1", "6", "4", "2", "8", "9"], ["4", "2", "9", "8", "3", "5", "7", "6", "1"]]}'
-        )
+        board.gameify(Board.Difficulty.HARD, graded=True)
+        self.assertEqual(board.grade().get_difficulty(), Board.Difficulty.HARD)
 
-        with open(os.path.abspath(f"{save_dir}/0.board"), "r") as file:
-            self.assertEqual(file.read(), expect_data)
 
-        files.delete_path(save_dir)
+class TestWaveMethods(unittest.TestCase):
+    # ==================================================================================
+    # ENTROPY BUCKETS
+    # ==================================================================================
+    def test_buckets_match_entropy(self):
+        from wfc import Wave
+
+        wave: Wave = Wave()
+        wave.collapse(0, 1)
+        wave.collapse(40, 5)
+        wave.collapse(80, 9)
+
+        for index in range(81):
+            in_buckets: list[int] = [
+                entropy
+                for entropy, bucket in enumerate(wave.buckets)
+                if bucket & (1 << index)
+            ]
+            if wave.values[index] != 0:
+                self.assertEqual(in_buckets, [])
+            else:
+                self.assertEqual(in_buckets, [wave.get_entropy(index)])
+
+    def test_lowest_entropy_cells_row_major(self):
+        from wfc import Wave
+
+        wave: Wave = Wave()
+        wave.collapse(0, 1)
+
+        self.assertEqual(wave.get_lowest_entropy(), 8)
+        self.assertEqual(
+            wave.get_lowest_entropy_cells(),
+            [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 18, 19, 20, 27, 36, 45, 54, 63, 72],
+        )
 
     #
     # ==================================================================================
-    # DELETE
+    # PROPAGATE
     # ==================================================================================
-    def test_delete_board_none(self):
-        import files
-        from board import Board
-        from errors import FileException
+    def test_propagate_naked_single(self):
+        from wfc import Wave
 
-        save_dir: str = save_dir_helper()
-
-        # Doesn't matter if board is generated or saved, cause the "`save_dir` is empty"
-        # check happens before the "is generated" & "is saved" checks
-        board: Board = Board()
+        wave: Wave = Wave()
+        for x, value in enumerate([1, 2, 3, 4, 5, 6, 7, 8]):
+            wave.collapse(x, value)
+        wave.propagate()
 
-        with self.assertRaises(
-            FileException,
-        ):
-            files.delete_board(board, save_dir=save_dir)
+        self.assertEqual(wave.values[8], 9)
 
-        files.delete_path(save_dir)
+    def test_propagate_hidden_single(self):
+        from wfc import Wave
 
-    def test_delete_board_empty(self):
-        import files
-        from board import Board
-        from errors import FileException
+        # 1 is placed in rows 1 & 2 and columns 1 & 2, so the box's only spot is (0, 0)
+        wave: Wave = Wave()
+        wave.collapse(9 + 4, 1)
+        wave.collapse(18 + 7, 1)
+        wave.collapse(27 + 1, 1)
+        wave.collapse(54 + 2, 1)
+        wave.propagate()
 
-        save_dir: str = save_dir_helper()
+        self.assertEqual(wave.values[0], 1)
 
-        tmp_board: Board = Board()
-        tmp_board.generate(100)
-        files.save_board(tmp_board, save_dir=save_dir)
+    def test_propagate_contradiction(self):
+        from wfc import Wave
 
-        board: Board = Board()
+        # The last cell of row 0 can only be 9, but 9 is already in its column
+        wave: Wave = Wave()
+        wave.collapse(44, 9)
+        for x, value in enumerate([1, 2, 3, 4, 5, 6, 7, 8]):
+            wave.collapse(x, value)
+        wave.propagate()
 
-        with self.assertRaises(
-            FileException,
-        ):
-            files.delete_board(board, save_dir=save_dir)
+        self.assertTrue(wave.has_contradiction())
 
-        files.delete_path(save_dir)
 
-    def test_delete_board_not_saved(self):
-        import files
+class TestBoardTypes(unittest.TestCase):
+    # ==================================================================================
+    # DIFFICULTY
+    # ==================================================================================
+    def test_difficulty_easy_str(self):
         from board import Board
-        from errors import FileException
 
-        save_dir: str = save_dir_helper()
+        self.assertEqual(str(Board.Difficulty.EASY), "Easy")
 
-        tmp_board: Board = Board()
-        tmp_board.generate(100)
+    def test_difficulty_medium_str(self):
+        from board import Board
+
+        self.assertEqual(str(Board.Difficulty.MEDIUM), "Medium")
+
+    def test_difficulty_hard_str(self):
+        from board import Board
+
+        self.assertEqual(str(Board.Difficulty.HARD), "Hard")
+
+
+class TestBatchMethods(unittest.TestCase):
+    # ==================================================================================
+    # GENERATE MANY
+    # ==================================================================================
+    def test_generate_many_serial(self):
+        from board import Board
+        import batch
+
+        boards: list[Board] = batch.generate_many(range(10))
+
+        for seed, board in enumerate(boards):
+            expect_board: Board = Board()
+            expect_board.generate(seed)
+            self.assertEqual(board, expect_board)
+
+    def test_generate_many_workers(self):
+        from board import Board
+        import batch
+
+        seeds: list[int] = [5, 3, 9, 1, 7, 0, 2]
+        serial: list[Board] = batch.generate_many(seeds)
+        parallel: list[Board] = batch.generate_many(seeds, workers=2, chunk_size=2)
+
+        self.assertEqual([board.id for board in parallel], [str(s) for s in seeds])
+        self.assertEqual(serial, parallel)
+
+    def test_generate_many_threads(self):
+        from board import Board
+        import batch
+
+        seeds: list[int] = list(range(20))
+        serial: list[Board] = batch.generate_many(seeds)
+        threaded: list[Board] = batch.generate_many(
+            seeds, workers=4, chunk_size=1, threads=True
+        )
+
+        self.assertEqual(serial, threaded)
+
+    def test_note_seed_threads(self):
+        from board import Board
+        from concurrent.futures import ThreadPoolExecutor
+        import random, serde
+
+        # Every path updating the last seed goes through the same lock
+        Board.last_seed = 0
+        seeds: list[int] = random.Random(0).sample(range(2000), 2000)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(Board.note_seed, seeds))
+        self.assertEqual(Board.last_seed, 1999)
+
+        board: Board = Board()
+        board.generate(3000)
+        Board.last_seed = 0
+        serde.deserialize(serde.serialize(board))
+        self.assertEqual(Board.last_seed, 3000)
+
+    def test_generate_many_difficulty(self):
+        from board import Board
+        import batch
+
+        boards: list[Board] = batch.generate_many(
+            range(4), workers=2, difficulty=Board.Difficulty.MEDIUM
+        )
+
+        for board in boards:
+            self.assertEqual(board.type, Board.Type.GAME)
+            self.assertEqual(board.difficulty, Board.Difficulty.MEDIUM)
+
+    def test_derive_many(self):
+        import batch, checker
+        from board import Board
+
+        base: Board = Board()
+        base.generate(4)
+        boards: list[Board] = batch.derive_many(base, 50)
+
+        self.assertEqual(len({board.id for board in boards}), 50)
+        self.assertEqual(len({str(board.board) for board in boards}), 50)
+        self.assertEqual(checker.check_many(boards), [True] * 50)
+        self.assertEqual([board.transform_seed for board in boards], list(range(50)))
+        self.assertTrue(all(board.base_id == "4" for board in boards))
+
+    #
+    # ==================================================================================
+    # ITER BOARDS
+    # ==================================================================================
+    def test_iter_boards_seeds(self):
+        from board import Board
+        import batch, itertools
+
+        boards: list[Board] = list(itertools.islice(batch.iter_boards(40), 3))
+
+        self.assertEqual([board.id for board in boards], ["40", "41", "42"])
+
+    def test_iter_boards_count(self):
+        from board import Board
+        import batch
+
+        boards: list[Board] = list(
+            batch.iter_boards(0, difficulty=Board.Difficulty.EASY, count=5)
+        )
+
+        self.assertEqual(len(boards), 5)
+        for board in boards:
+            self.assertEqual(board.type, Board.Type.GAME)
+
+    def test_iter_boards_workers(self):
+        from board import Board
+        import batch, itertools
+
+        serial: list[Board] = list(batch.iter_boards(0, count=10))
+        parallel: list[Board] = list(
+            batch.iter_boards(0, count=10, workers=2, chunk_size=3)
+        )
+        endless: list[Board] = list(
+            itertools.islice(batch.iter_boards(0, workers=2, chunk_size=4), 10)
+        )
+
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial, endless)
+
+    def test_iter_boards_sink(self):
+        from board import Board
+        import batch, io, serde
+
+        sink: io.StringIO = io.StringIO()
+        boards: list[Board] = list(batch.iter_boards(0, count=3, sink=sink))
+        lines: list[str] = sink.getvalue().splitlines()
+
+        self.assertEqual([serde.deserialize(line) for line in lines], boards)
+
+    def test_generate_validate(self):
+        from board import Board
+        from errors import BoardException
+        from typing import Any
+        from unittest import mock
+        import batch, io
+
+        # Valid boards pass through untouched
+        self.assertEqual(
+            batch.generate_many(range(3), validate=True), batch.generate_many(range(3))
+        )
+        self.assertEqual(len(list(batch.iter_boards(0, count=3, validate=True))), 3)
+
+        # A broken generator is caught before the board is written anywhere
+        generate_board = batch.generate_board
+
+        def generate_broken(seed: int, *args: Any) -> Board:
+            board: Board = generate_board(seed, *args)
+            board.board[0][0] = board.board[0][1]
+            return board
+
+        sink: io.StringIO = io.StringIO()
+        with mock.patch("batch.generate_board", generate_broken):
+            with self.assertRaises(BoardException):
+                batch.generate_many(range(3), validate=True)
+            with self.assertRaises(BoardException):
+                list(batch.iter_boards(0, count=3, sink=sink, validate=True))
+        self.assertEqual(sink.getvalue(), "")
+
+    def test_write_boards(self):
+        import batch, io
+
+        sink: io.StringIO = io.StringIO()
+        written: int = batch.write_boards(batch.iter_boards(0, count=4), sink)
+
+        self.assertEqual(written, 4)
+        self.assertEqual(len(sink.getvalue().splitlines()), 4)
+
+
+class TestCheckerMethods(unittest.TestCase):
+    # ==================================================================================
+    # VALIDITY
+    # ==================================================================================
+    def test_generated_boards_valid(self):
+        import batch, checker
+        from board import Board
+
+        boards: list[Board] = batch.generate_many(range(200))
+        boards += batch.generate_many(range(200), difficulty=Board.Difficulty.HARD)
+        board: Board = Board()
+        board.generate(0, Board.Engine.CELL)
+        boards.append(board)
+
+        self.assertEqual(checker.check_many(boards), [True] * len(boards))
+        self.assertEqual(checker.find_problems(boards[0]), [])
+
+    def test_invalid_full_board(self):
+        import checker
+        from board import Board
+        from errors import DeserializerException
+
+        board: Board = Board()
+        board.generate(0)
+        board.board[0][0], board.board[0][1] = board.board[0][1], board.board[0][0]
+
+        # Every row is still fine, but 2 columns and a box aren't
+        self.assertFalse(checker.is_valid(board))
+        self.assertEqual(
+            checker.find_problems(board),
+            ["Column 1 contains '3' 2 times!", "Column 2 contains '1' 2 times!"],
+        )
+
+        board.board[0][0] = " "
+        self.assertIn(
+            "Row 1 of a full board has an empty cell!", checker.find_problems(board)
+        )
+        with self.assertRaises(DeserializerException):
+            checker.validate(board)
+
+    def test_invalid_game_board(self):
+        import checker
+        from board import Board
+
+        board: Board = Board()
+        board.generate(0)
+        board.gameify(Board.Difficulty.HARD)
+        self.assertTrue(checker.is_valid(board))
+
+        # Clear a whole row, then repeat a single value in it
+        board.board[4] = [" "] * 9
+        self.assertTrue(checker.is_valid(board))
+        board.board[4][0] = board.board[4][8] = "5"
+        self.assertFalse(checker.is_valid(board))
+        self.assertIn("Row 5 contains '5' 2 times!", checker.find_problems(board))
+
+    #
+    # ==================================================================================
+    # STRICT LOADING
+    # ==================================================================================
+    def test_load_saved_boards_strict(self):
+        import files, io
+        from board import Board
+        from contextlib import redirect_stdout
+        from unittest import mock
+
+        save_dir: str = save_dir_helper()
+
+        # Both the save directory, and an archive, are checked
+        for path in [save_dir, f"{save_dir}/boards.archive"]:
+            boards: list[Board] = boards_helper([1, 2, 3])
+            boards[1].board[0][0] = boards[1].board[0][1]
+            files.save_boards(boards, save_dir=path)
+
+            # Without `strict`, the invalid board loads just fine
+            self.assertEqual(files.load_saved_boards(save_dir=path), boards)
+
+            with mock.patch("builtins.input"), mock.patch("time.sleep"):
+                with redirect_stdout(io.StringIO()):
+                    loaded: list[Board] = files.load_saved_boards(
+                        save_dir=path, strict=True
+                    )
+            self.assertEqual(loaded, [boards[0], boards[2]])
+            self.assertEqual(files.load_saved_boards(save_dir=path), loaded)
+
+        files.delete_path(save_dir)
+
+
+def save_dir_helper() -> str:
+    import pathlib, os, files
+
+    save_dir: str = os.path.abspath("./test_saved_boards")
+    try:
+        files.delete_path(save_dir)
+    except FileNotFoundError:
+        pass
+    pathlib.Path(save_dir).mkdir(parents=True, exist_ok=False)
+
+    return save_dir
+
+
+def boards_helper(seeds: list[int]) -> list["Board"]:
+    from board import Board
+
+    boards: list[Board] = []
+    for seed in seeds:
+        board: Board = Board()
+        board.generate(seed)
+        boards.append(board)
+
+    return boards
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy isn't installed")
+class TestArraysMethods(unittest.TestCase):
+    # ==================================================================================
+    # CONVERSION
+    # ==================================================================================
+    def test_to_stack(self):
+        import arrays, batch
+        from board import Board
+
+        boards: list[Board] = batch.generate_many(range(3))
+        boards += batch.generate_many(range(3), difficulty=Board.Difficulty.HARD)
+        stack = arrays.to_stack(boards)
+
+        self.assertEqual((stack.shape, str(stack.dtype)), ((6, 9, 9), "uint8"))
+        for board, array in zip(boards, stack):
+            self.assertEqual(
+                array.tolist(),
+                [
+                    [0 if value == " " else int(value) for value in row]
+                    for row in board.board
+                ],
+            )
+            self.assertEqual(arrays.to_cells(array), board.board)
+            self.assertEqual(
+                arrays.from_array(array, board.id, board.type, board.difficulty),
+                board,
+            )
+        self.assertEqual(arrays.to_array(boards[4]).tolist(), stack[4].tolist())
+
+    def test_to_cells_invalid(self):
+        import arrays
+        from errors import BoardException
+
+        with self.assertRaises(BoardException):
+            arrays.to_cells(arrays.np.zeros((9, 8), dtype=arrays.np.uint8))
+        with self.assertRaises(BoardException):
+            arrays.to_cells(arrays.np.full((9, 9), 10, dtype=arrays.np.uint8))
+
+    #
+    # ==================================================================================
+    # VALIDITY
+    # ==================================================================================
+    def test_check_stack(self):
+        import arrays, batch, checker
+        from board import Board
+        from unittest import mock
+
+        boards: list[Board] = batch.generate_many(range(50))
+        boards += batch.generate_many(range(50), difficulty=Board.Difficulty.MEDIUM)
+        # Break a full board with a swap, and a game board with a repeat
+        boards[3].board[0][0], boards[3].board[0][1] = (
+            boards[3].board[0][1],
+            boards[3].board[0][0],
+        )
+        boards[7].board[4][4] = " "
+        row: list[str] = next(
+            row for row in boards[60].board if " " in row and len(set(row)) > 1
+        )
+        row[row.index(" ")] = next(value for value in row if value != " ")
+
+        expected: list[bool] = [checker.is_valid(board) for board in boards]
+        self.assertEqual(expected.count(False), 3)
+        self.assertEqual(checker.check_many(boards), expected)
+
+        # The pure Python path is still there without NumPy
+        with mock.patch("arrays.HAS_NUMPY", False):
+            self.assertEqual(checker.check_many(boards), expected)
+            with self.assertRaises(ImportError):
+                arrays.to_stack(boards)
+
+    #
+    # ==================================================================================
+    # MASKS AND STATISTICS
+    # ==================================================================================
+    def test_removal_masks(self):
+        import arrays, batch
+        from board import Board
+
+        full: list[Board] = batch.generate_many(range(5))
+        games: list[Board] = batch.generate_many(
+            range(5), difficulty=Board.Difficulty.EASY
+        )
+        masks: list[int] = arrays.to_removal_masks(arrays.to_stack(games))
+
+        self.assertEqual(masks, [board.get_removal_mask() for board in games])
+        self.assertEqual(
+            arrays.apply_removal_masks(arrays.to_stack(full), masks).tolist(),
+            arrays.to_stack(games).tolist(),
+        )
+
+    def test_statistics(self):
+        import arrays, batch
+        from board import Board
+
+        boards: list[Board] = batch.generate_many(
+            range(4), difficulty=Board.Difficulty.HARD
+        )
+        stack = arrays.to_stack(boards)
+        counts = arrays.count_values(stack)
+
+        self.assertEqual(counts.shape, (4, 10))
+        self.assertEqual(counts.sum(axis=1).tolist(), [81] * 4)
+        self.assertEqual(
+            counts[:, 0].tolist(),
+            [sum(row.count(" ") for row in board.board) for board in boards],
+        )
+        self.assertAlmostEqual(
+            float(arrays.empty_frequency(stack).sum()), counts[:, 0].mean()
+        )
+
+    #
+    # ==================================================================================
+    # STACK GENERATION
+    # ==================================================================================
+    def test_draw_stream(self):
+        from rand_man import Rng
+        import arrays, wfc_stack
+
+        seeds: list[int] = [0, 7, -3, 1 << 40]
+        draws: wfc_stack.DrawStream = wfc_stack.DrawStream(seeds)
+        boards = arrays.np.arange(len(seeds))
+        # Enough draws to need a few more twists than the first one
+        taken: list[list[int]] = [draws.take(boards).tolist() for _ in range(700)]
+
+        for board, seed in enumerate(seeds):
+            rng: Rng = Rng(seed)
+            self.assertEqual(
+                [values[board] for values in taken], [rng.random() for _ in range(700)]
+            )
+
+    def test_generate_stack(self):
+        from board import Board
+        import batch
+
+        seeds: list[int] = list(range(40)) + [12345678901]
+        boards: list[Board] = batch.generate_many(seeds, engine=Board.Engine.STACK)
+
+        for seed, board in zip(seeds, boards):
+            expect_board: Board = Board()
+            expect_board.generate(seed, Board.Engine.BITMASK)
+            self.assertEqual(board, expect_board)
+            self.assertEqual(board.resets, expect_board.resets)
+
+    def test_generate_stack_chunks(self):
+        from board import Board
+        import batch
+
+        serial: list[Board] = batch.generate_many(
+            range(6), difficulty=Board.Difficulty.EASY
+        )
+        stacked: list[Board] = list(
+            batch.iter_boards(
+                0, Board.Difficulty.EASY, count=6, engine=Board.Engine.STACK
+            )
+        )
+        parallel: list[Board] = batch.generate_many(
+            range(6),
+            workers=2,
+            difficulty=Board.Difficulty.EASY,
+            chunk_size=4,
+            engine=Board.Engine.STACK,
+        )
+
+        self.assertEqual(serial, stacked)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(batch.generate_stack([]), [])
+
+
+class TestFilesMethods(unittest.TestCase):
+    # ==================================================================================
+    # LOAD
+    # ==================================================================================
+    def test_load_saved_boards_empty(self):
+        import files
+        from board import Board
+
+        save_dir: str = save_dir_helper()
+
+        saved_boards: list[Board] = files.load_saved_boards(save_dir=save_dir)
+
+        self.assertEqual(saved_boards, [])
+
+        files.delete_path(save_dir)
+
+    def test_load_saved_boards(self):
+        import os, files
+        from board import Board
+
+        save_dir: str = save_dir_helper()
+
+        with open(os.path.abspath(f"{save_dir}/0.board"), "x+") as file:
+            file.write(
+                '{"id": "0", "type": 1, "difficulty": 0, "board": [["1", "3", "4", "6", "8", "2", "9", "5", "7"], ["2", "8", "7", "9", "5", "1", "6", "4", "3"], ["9", "6", "5", "7", "4", "3", "8", "1", "2"], ["5", "7", "2", "4", "1", "6", "3", "9", "8"], ["6", "4", "8", "3", "2", "9", "1", "7", "5"], ["3", "9", "1", "5", "7", "8", "4", "2", "6"], ["8", "1", "6", "2", "9", "7", "5", "3", "4"], ["7", "5", "3", "1", "6", "4", "2", "8", "9"], ["4", "2", "9", "8", "3", "5", "7", "6", "1"]]}'
+            )
+        with open(os.path.abspath(f"{save_dir}/1.board"), "x+") as file:
+            file.write(
+                '{"id": "1", "type": 1, "difficulty": 0, "board": [["8", "4", "6", "5", "9", "3", "1", "2", "7"], ["9", "2", "3", "1", "4", "7", "8", "6", "5"], ["1", "5", "7", "2", "6", "8", "4", "9", "3"], ["3", "9", "1", "6", "7", "5", "2", "8", "4"], ["5", "7", "4", "8", "2", "9", "3", "1", "6"], ["6", "8", "2", "4", "3", "1", "7", "5", "9"], ["4", "6", "8", "3", "5", "2", "9", "7", "1"], ["7", "1", "5", "9", "8", "4", "6", "3", "2"], ["2", "3", "9", "7", "1", "6", "5", "4", "8"]]}'
+            )
+        with open(os.path.abspath(f"{save_dir}/0.txt"), "x+") as file:
+            file.write("test")
+
+        saved_boards: list[Board] = files.load_saved_boards(save_dir=save_dir)
+
+        self.assertEqual(len(saved_boards), 2)
+
+        files.delete_path(save_dir)
+
+    def test_load_saved_boards_other_forms(self):
+        import os, files, serde
+        from board import Board
+
+        save_dir: str = save_dir_helper()
+
+        boards: list[Board] = boards_helper([0, 1])
+        with open(os.path.abspath(f"{save_dir}/0.board"), "xb") as file:
+            file.write(serde.serialize_binary(boards[0]))
+        with open(os.path.abspath(f"{save_dir}/1.board"), "x") as file:
+            file.write(serde.serialize_string(boards[1]))
+
+        self.assertEqual(files.load_saved_boards(save_dir=save_dir), boards)
+
+        files.delete_path(save_dir)
+
+    #
+    # ==================================================================================
+    # SAVE
+    # ==================================================================================
+    def test_save_board_empty(self):
+        import files
+        from board import Board
+        from errors import FileException
+
+        save_dir: str = save_dir_helper()
+
+        board: Board = Board()
+
+        with self.assertRaises(FileException):
+            files.save_board(board, save_dir=save_dir)
+
+        files.delete_path(save_dir)
+
+    def test_save_board_filled(self):
+        import os, files
+        from board import Board
+
+        save_dir: str = save_dir_helper()
+
+        board: Board = Board()
+        board.generate(0)
+        files.save_board(board, save_dir=save_dir)
+
+        expect_data: str = (
+            '{"id": "0", "type": 1, "difficulty": 0, "board": [["1", "3", "4", "6", "8", "2", "9", "5", "7"], ["2", "8", "7", "9", "5", "1", "6", "4", "3"], ["9", "6", "5", "7", "4", "3", "8", "1", "2"], ["5", "7", "2", "4", "1", "6", "3", "9", "8"], ["6", "4", "8", "3", "2", "9", "1", "7", "5"], ["3", "9", "1", "5", "7", "8", "4", "2", "6"], ["8", "1", "6", "2", "9", "7", "5", "3", "4"], ["7", "5", "3", "1", "6", "4", "2", "8", "9"], ["4", "2", "9", "8", "3", "5", "7", "6", "1"]]}'
+        )
+
+        with open(os.path.abspath(f"{save_dir}/0.board"), "r") as file:
+            self.assertEqual(file.read(), expect_data)
+
+        files.delete_path(save_dir)
+
+    def test_save_board_atomic(self):
+        import os, files, serde
+        from board import Board
+
+        save_dir: str = save_dir_helper()
+
+        board: Board = Board()
+        board.generate(0)
+        files.save_board(board, save_dir=save_dir, fsync=True)
+
+        # Only the save itself should be left, without any temporary files
+        self.assertEqual(os.listdir(save_dir), ["0.board"])
+        with open(os.path.abspath(f"{save_dir}/0.board"), "r") as file:
+            self.assertEqual(serde.deserialize(file.read()), board)
+        # The save follows the umask, like any other new file
+        with open(f"{save_dir}/plain", "w"):
+            pass
+        self.assertEqual(
+            os.stat(f"{save_dir}/0.board").st_mode & 0o777,
+            os.stat(f"{save_dir}/plain").st_mode & 0o777,
+        )
+
+        files.delete_path(save_dir)
+
+    def test_save_boards(self):
+        import files
+        from board import Board
+
+        save_dir: str = save_dir_helper()
+
+        boards: list[Board] = []
+        for seed in [10, 2, 7]:
+            board: Board = Board()
+            board.generate(seed)
+            boards.append(board)
+        written: int = files.save_boards(boards, save_dir=save_dir, workers=2)
+
+        self.assertEqual(written, 3)
+        self.assertEqual(
+            files.load_saved_boards(save_dir=save_dir),
+            [boards[1], boards[2], boards[0]],
+        )
+        self.assertEqual(
+            files.get_all_saved_board_files(save_dir=save_dir),
+            ["2.board", "7.board", "10.board"],
+        )
+
+        files.delete_path(save_dir)
+
+    def test_get_all_saved_board_files(self):
+        import files, os, pathlib
+
+        save_dir: str = save_dir_helper()
+
+        # Only files named `<digits>.board` count as saves
+        pathlib.Path(f"{save_dir}/3.board").mkdir(parents=True)
+        for filename in ["100.board", "9.board", "20.board", "x.board", "5.txt"]:
+            with open(f"{save_dir}/{filename}", "w") as file:
+                file.write("")
+
+        self.assertEqual(
+            files.get_all_saved_board_files(save_dir=save_dir),
+            ["9.board", "20.board", "100.board"],
+        )
+        self.assertEqual(
+            files.get_all_saved_board_files(save_dir=save_dir, abs_path=True),
+            [
+                os.path.abspath(f"{save_dir}/{filename}")
+                for filename in ["9.board", "20.board", "100.board"]
+            ],
+        )
+        self.assertEqual(
+            sorted(files.iter_saved_board_files(save_dir=save_dir)),
+            ["100.board", "20.board", "9.board"],
+        )
+
+        files.delete_path(save_dir)
+
+    def test_save_boards_conflicts(self):
+        import files
+        from board import Board
+        from errors import FileException
+
+        save_dir: str = save_dir_helper()
+
+        board: Board = Board()
+        board.generate(0)
+        files.save_board(board, save_dir=save_dir)
+        new_board: Board = Board()
+        new_board.generate(1)
+
+        with self.assertRaises(FileException):
+            files.save_boards(
+                [new_board, board], save_dir=save_dir, on_conflict="error"
+            )
+        self.assertEqual(
+            files.get_all_saved_board_files(save_dir=save_dir), ["0.board"]
+        )
+
+        written: int = files.save_boards(
+            [new_board, board], save_dir=save_dir, on_conflict="skip"
+        )
+        self.assertEqual(written, 1)
+
+        written: int = files.save_boards(
+            [new_board, board], save_dir=save_dir, on_conflict="overwrite"
+        )
+        self.assertEqual(written, 2)
+
+        files.delete_path(save_dir)
+
+    #
+    # ==================================================================================
+    # DELETE
+    # ==================================================================================
+    def test_delete_board_none(self):
+        import files
+        from board import Board
+        from errors import FileException
+
+        save_dir: str = save_dir_helper()
+
+        # Doesn't matter if board is generated or saved, cause the "`save_dir` is empty"
+        # check happens before the "is generated" & "is saved" checks
+        board: Board = Board()
+
+        with self.assertRaises(
+            FileException,
+        ):
+            files.delete_board(board, save_dir=save_dir)
+
+        files.delete_path(save_dir)
+
+    def test_delete_board_empty(self):
+        import files
+        from board import Board
+        from errors import FileException
+
+        save_dir: str = save_dir_helper()
+
+        tmp_board: Board = Board()
+        tmp_board.generate(100)
+        files.save_board(tmp_board, save_dir=save_dir)
+
+        board: Board = Board()
+
+        with self.assertRaises(
+            FileException,
+        ):
+            files.delete_board(board, save_dir=save_dir)
+
+        files.delete_path(save_dir)
+
+    def test_delete_board_not_saved(self):
+        import files
+        from board import Board
+        from errors import FileException
+
+        save_dir: str = save_dir_helper()
+
+        tmp_board: Board = Board()
+        tmp_board.generate(100)
         files.save_board(tmp_board, save_dir=save_dir)
 
         board: Board = Board()
@@ -537,6 +1796,566 @@ class TestFilesMethods(unittest.TestCase):
 
         files.delete_path(save_dir)
 
+    def test_delete_paths(self):
+        import files
+        from board import Board
+
+        save_dir: str = save_dir_helper()
+
+        for seed in range(3):
+            board: Board = Board()
+            board.generate(seed)
+            files.save_board(board, save_dir=save_dir)
+        files.delete_paths(files.get_all_saved_board_files(save_dir, abs_path=True))
+
+        self.assertEqual(files.get_all_saved_board_files(save_dir=save_dir), [])
+
+        files.delete_path(save_dir)
+
+
+class TestArchiveMethods(unittest.TestCase):
+    # ==================================================================================
+    # SAVE & LOAD
+    # ==================================================================================
+    def test_save_and_load(self):
+        import files
+        from board import Board
+
+        save_dir: str = save_dir_helper()
+        archive_path: str = f"{save_dir}/boards.archive"
+
+        boards: list[Board] = boards_helper([10, 2, 7])
+        boards[1].gameify(Board.Difficulty.HARD)
+        for board in boards:
+            files.save_board(board, save_dir=archive_path)
+
+        self.assertEqual(
+            files.load_saved_boards(save_dir=archive_path),
+            [boards[1], boards[2], boards[0]],
+        )
+
+        files.delete_path(save_dir)
+
+    def test_save_boards(self):
+        import archive, files
+        from board import Board
+
+        save_dir: str = save_dir_helper()
+        archive_path: str = f"{save_dir}/boards.archive"
+
+        boards: list[Board] = boards_helper([1, 2])
+        self.assertEqual(files.save_boards(boards, save_dir=archive_path), 2)
+        boards[0].gameify(Board.Difficulty.EASY)
+        written: int = files.save_boards(
+            boards, save_dir=archive_path, on_conflict="skip"
+        )
+        self.assertEqual(written, 0)
+        written: int = files.save_boards(boards[:1], save_dir=archive_path)
+        self.assertEqual(written, 1)
+
+        # The latest record of a board wins
+        with archive.BoardArchive(archive_path) as board_archive:
+            self.assertEqual(board_archive.load("1"), boards[0])
+            self.assertEqual(board_archive.ids(), ["1", "2"])
+
+        files.delete_path(save_dir)
+
+    def test_partial_record(self):
+        import archive, files
+
+        save_dir: str = save_dir_helper()
+        archive_path: str = f"{save_dir}/boards.archive"
+
+        files.save_boards(boards_helper([1, 2]), save_dir=archive_path)
+        with open(archive_path, "ab") as file:
+            file.write(b"\x01\x02\x03")
+
+        # A partially written record is dropped, without losing any earlier ones
+        with archive.BoardArchive(archive_path) as board_archive:
+            self.assertEqual(board_archive.ids(), ["1", "2"])
+            board_archive.save(boards_helper([3])[0])
+        with archive.BoardArchive(archive_path) as board_archive:
+            self.assertEqual(board_archive.ids(), ["1", "2", "3"])
+
+        files.delete_path(save_dir)
+
+    def test_corrupted_record(self):
+        import archive, files, io
+        from board import Board
+        from contextlib import redirect_stdout
+        from unittest import mock
+
+        save_dir: str = save_dir_helper()
+        archive_path: str = f"{save_dir}/boards.archive"
+
+        boards: list[Board] = boards_helper([1, 2, 3])
+        files.save_boards(boards, save_dir=archive_path)
+        # Give the second record's first cell an invalid value (0xA)
+        with open(archive_path, "r+b") as file:
+            file.seek(archive.HEADER.size + archive.RECORD.size + 11)
+            file.write(b"\xa0")
+
+        # Only the corrupted record is reported and deleted, the rest still load
+        with mock.patch("builtins.input"), mock.patch("time.sleep"):
+            with redirect_stdout(io.StringIO()) as output:
+                loaded: list[Board] = files.load_saved_boards(save_dir=archive_path)
+        self.assertEqual(loaded, [boards[0], boards[2]])
+        self.assertIn(f"{archive_path}:2", output.getvalue())
+        self.assertEqual(files.load_saved_boards(save_dir=archive_path), loaded)
+
+        files.delete_path(save_dir)
+
+    def test_not_an_archive(self):
+        import archive, files
+        from errors import FileException
+
+        save_dir: str = save_dir_helper()
+        archive_path: str = f"{save_dir}/boards.archive"
+
+        with open(archive_path, "w") as file:
+            file.write("{}")
+        with self.assertRaises(FileException):
+            archive.BoardArchive(archive_path)
+
+        files.delete_path(save_dir)
+
+    #
+    # ==================================================================================
+    # DELETE
+    # ==================================================================================
+    def test_delete(self):
+        import archive, files, os
+        from board import Board
+        from errors import FileException
+
+        save_dir: str = save_dir_helper()
+        archive_path: str = f"{save_dir}/boards.archive"
+
+        boards: list[Board] = boards_helper([1, 2, 3])
+        files.save_boards(boards, save_dir=archive_path)
+        files.delete_board(boards[1], save_dir=archive_path)
+
+        self.assertEqual(
+            files.load_saved_boards(save_dir=archive_path), [boards[0], boards[2]]
+        )
+        with self.assertRaises(FileException):
+            files.delete_board(boards[1], save_dir=archive_path)
+
+        # Compacting only keeps the live records
+        with archive.BoardArchive(archive_path) as board_archive:
+            board_archive.compact()
+            self.assertEqual(board_archive.load("3"), boards[2])
+        self.assertEqual(
+            os.path.getsize(archive_path),
+            archive.HEADER.size + archive.RECORD.size * 2,
+        )
+
+        files.delete_path(save_dir)
+
+
+class TestDedupMethods(unittest.TestCase):
+    # ==================================================================================
+    # SAVE
+    # ==================================================================================
+    def test_save_board_skip_duplicates(self):
+        from board import Board
+        from contextlib import redirect_stdout
+        from unittest import mock
+        import dedup, files, io
+
+        save_dir: str = save_dir_helper()
+        dedup.indexes.clear()
+
+        board: Board = boards_helper([0])[0]
+        self.assertTrue(
+            files.save_board(board, save_dir=save_dir, skip_duplicates=True)
+        )
+
+        # A symmetry of a saved board isn't saved, unless duplicates are allowed
+        derived: Board = board.transform(7, board_id="50")
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertFalse(
+                files.save_board(derived, save_dir=save_dir, skip_duplicates=True)
+            )
+        self.assertIn("same as saved board 0", output.getvalue())
+
+        # Overwriting a board doesn't count as repeating itself
+        with mock.patch("builtins.input", return_value="y"):
+            with redirect_stdout(io.StringIO()):
+                self.assertTrue(
+                    files.save_board(board, save_dir=save_dir, skip_duplicates=True)
+                )
+        self.assertTrue(files.save_board(derived, save_dir=save_dir))
+
+        dedup_index: dedup.DedupIndex = dedup.get_index(save_dir)
+        self.assertEqual((dedup_index.checked, dedup_index.duplicates), (3, 1))
+        self.assertEqual(dedup_index.find("0", dedup.get_canonical_key(board)), "50")
+
+        files.delete_path(save_dir)
+
+    def test_save_board_no_rescan(self):
+        from unittest import mock
+        import dedup, disk, files, os, time
+
+        save_dir: str = save_dir_helper()
+        dedup.indexes.clear()
+
+        boards = boards_helper([0, 1, 2, 3])
+        files.save_board(boards[0], save_dir=save_dir, skip_duplicates=True)
+
+        # Back to back saves keep the index up to date themselves, without
+        # scanning again
+        with mock.patch(
+            "disk.iter_saved_board_files", wraps=disk.iter_saved_board_files
+        ) as iter_saved_board_files:
+            for board in boards[1:]:
+                files.save_board(board, save_dir=save_dir, skip_duplicates=True)
+        self.assertEqual(iter_saved_board_files.call_count, 0)
+
+        # Saves changed within the last second might change again unnoticed, so
+        # they're scanned once more after they've settled, but only once
+        with mock.patch(
+            "disk.iter_saved_board_files", wraps=disk.iter_saved_board_files
+        ) as iter_saved_board_files:
+            with mock.patch("time.time_ns", return_value=time.time_ns() + 10**10):
+                dedup.get_index(save_dir)
+                dedup.get_index(save_dir)
+        self.assertEqual(iter_saved_board_files.call_count, 1)
+
+        # Nor is the whole index rewritten every time, only in batches (Or at exit)
+        index_path: str = dedup.get_index_path(save_dir)
+        self.assertFalse(os.path.exists(index_path))
+        dedup.write_indexes()
+        self.assertTrue(os.path.exists(index_path))
+        dedup.indexes.clear()
+        self.assertEqual(sorted(dedup.get_index(save_dir).keys), ["0", "1", "2", "3"])
+
+        files.delete_path(save_dir)
+
+    def test_save_stamp_outside_changes(self):
+        from board import Board
+        from unittest import mock
+        import dedup, files, time
+
+        save_dir: str = save_dir_helper()
+        dedup.indexes.clear()
+        boards: list[Board] = boards_helper([0, 1, 2])
+
+        with mock.patch("time.time_ns", return_value=time.time_ns() + 10**10):
+            dedup_index: dedup.DedupIndex = dedup.get_index(save_dir)
+
+            # A board saved behind the index's back, before another is claimed...
+            files.save_board(boards[0], save_dir=save_dir)
+            key: str = dedup.get_canonical_key(boards[1])
+            self.assertIsNone(dedup_index.claim(boards[1].id, key))
+            files.save_board(boards[1], save_dir=save_dir)
+            dedup_index.confirm(boards[1].id, [0, 0])
+            self.assertEqual(sorted(dedup.get_index(save_dir).keys), ["0", "1"])
+
+            # ...or before the index is written, is still picked up by the next scan
+            files.save_board(boards[2], save_dir=save_dir)
+            dedup_index.write()
+            self.assertEqual(sorted(dedup.get_index(save_dir).keys), ["0", "1", "2"])
+
+        files.delete_path(save_dir)
+
+    def test_save_boards_skip_duplicates(self):
+        from board import Board
+        import dedup, files
+
+        for save_dir in [save_dir_helper(), f"{save_dir_helper()}/boards.archive"]:
+            dedup.indexes.clear()
+            boards: list[Board] = boards_helper([0, 1])
+            files.save_boards(boards, save_dir=save_dir, skip_duplicates=True)
+
+            # Repeats of saved boards, and of each other, are all skipped
+            derived: list[Board] = [
+                boards[0].transform(1, board_id="10"),
+                boards[0].transform(2, board_id="11"),
+                boards_helper([2])[0].transform(3, board_id="12"),
+                boards_helper([2])[0].transform(4, board_id="13"),
+            ]
+            written: int = files.save_boards(
+                derived, save_dir=save_dir, skip_duplicates=True
+            )
+            self.assertEqual(written, 1)
+            self.assertEqual(
+                [board.id for board in files.load_saved_boards(save_dir=save_dir)],
+                ["0", "1", "12"],
+            )
+            self.assertEqual(dedup.get_index(save_dir).get_duplicate_rate(), 0.5)
+
+        files.delete_path(save_dir_helper())
+
+    #
+    # ==================================================================================
+    # REFRESH
+    # ==================================================================================
+    def test_refresh(self):
+        import dedup, files
+
+        save_dir: str = save_dir_helper()
+        dedup.indexes.clear()
+
+        files.save_boards(boards_helper([0, 1]), save_dir=save_dir)
+        dedup_index: dedup.DedupIndex = dedup.get_index(save_dir)
+        self.assertEqual(sorted(dedup_index.keys), ["0", "1"])
+        dedup_index.write()
+
+        # The persisted index is reused, and kept up to date with the saves
+        files.delete_path(f"{save_dir}/1.board")
+        files.save_boards(boards_helper([2]), save_dir=save_dir)
+        dedup.indexes.clear()
+        reloaded: dedup.DedupIndex = dedup.get_index(save_dir)
+        self.assertEqual(sorted(reloaded.keys), ["0", "2"])
+        self.assertEqual(reloaded.keys["0"], dedup_index.keys["0"])
+
+        files.delete_path(save_dir)
+
+
+class TestCatalogMethods(unittest.TestCase):
+    # ==================================================================================
+    # REFRESH
+    # ==================================================================================
+    def test_refresh_loads_boards(self):
+        import files
+        from board import Board
+        from catalog import BoardCatalog
+
+        save_dir: str = save_dir_helper()
+
+        boards: list[Board] = boards_helper([3, 1, 2])
+        boards[0].gameify(Board.Difficulty.EASY)
+        files.save_boards(boards, save_dir=save_dir)
+        catalog: BoardCatalog = BoardCatalog(save_dir=save_dir)
+        catalog.refresh()
+
+        self.assertEqual([board.id for board in catalog.saved_boards], ["1", "2", "3"])
+        self.assertEqual([board.id for board in catalog.filled_boards], ["1", "2"])
+        self.assertEqual([board.id for board in catalog.game_boards], ["3"])
+
+        files.delete_path(save_dir)
+
+    def test_refresh_renamed_save(self):
+        import files, io, shutil
+        from catalog import BoardCatalog
+        from contextlib import redirect_stdout
+        from unittest import mock
+
+        save_dir: str = save_dir_helper()
+
+        files.save_boards(boards_helper([1, 2]), save_dir=save_dir)
+        shutil.copy(f"{save_dir}/1.board", f"{save_dir}/7.board")
+
+        # A save under another board's name can't be indexed under either ID
+        catalog: BoardCatalog = BoardCatalog(save_dir=save_dir)
+        with mock.patch("builtins.input"), mock.patch("time.sleep"):
+            with redirect_stdout(io.StringIO()) as output:
+                catalog.refresh()
+        self.assertIn("7.board", output.getvalue())
+        self.assertEqual(sorted(catalog.entries), ["1", "2"])
+        self.assertEqual(
+            files.get_all_saved_board_files(save_dir), ["1.board", "2.board"]
+        )
+
+        files.delete_path(save_dir)
+
+    def test_refresh_last_seed(self):
+        import files
+        from board import Board
+        from catalog import BoardCatalog
+
+        save_dir: str = save_dir_helper()
+
+        files.save_boards(boards_helper([1, 5, 3]), save_dir=save_dir)
+        # A fresh process hasn't seen any seeds yet
+        Board.last_seed = 0
+        BoardCatalog(save_dir=save_dir).refresh()
+
+        self.assertEqual(Board.last_seed, 5)
+
+        files.delete_path(save_dir)
+
+    def test_refresh_incremental(self):
+        import files
+        from board_index import BoardMeta
+        from catalog import BoardCatalog
+
+        save_dir: str = save_dir_helper()
+
+        files.save_boards(boards_helper([1, 2]), save_dir=save_dir)
+        catalog: BoardCatalog = BoardCatalog(save_dir=save_dir)
+        catalog.refresh()
+        indexed: BoardMeta = catalog.entries["1"]
+
+        # Only the new save should be read, the rest are kept as they are
+        files.save_boards(boards_helper([3]), save_dir=save_dir)
+        files.delete_path(f"{save_dir}/2.board")
+        catalog.refresh(force=True)
+
+        self.assertIs(catalog.entries["1"], indexed)
+        self.assertEqual([meta.id for meta in catalog.saved_boards], ["1", "3"])
+
+        files.delete_path(save_dir)
+
+    def test_refresh_uses_index(self):
+        import files, board_index
+        from catalog import BoardCatalog
+        from unittest import mock
+
+        save_dir: str = save_dir_helper()
+
+        files.save_boards(boards_helper([1, 2, 3]), save_dir=save_dir)
+        BoardCatalog(save_dir=save_dir).refresh()
+
+        # A new catalog should list everything from the index, without opening saves
+        catalog: BoardCatalog = BoardCatalog(save_dir=save_dir)
+        with mock.patch("board_index.read_metadata") as read_metadata:
+            catalog.refresh()
+            read_metadata.assert_not_called()
+
+        self.assertEqual([meta.id for meta in catalog.filled_boards], ["1", "2", "3"])
+        self.assertEqual(board_index.load_index(save_dir), catalog.entries)
+
+        files.delete_path(save_dir)
+
+    def test_load_on_demand(self):
+        import files
+        from board import Board
+        from catalog import BoardCatalog
+        from typing import Optional
+
+        save_dir: str = save_dir_helper()
+
+        boards: list[Board] = boards_helper([1, 2])
+        files.save_boards(boards, save_dir=save_dir)
+        catalog: BoardCatalog = BoardCatalog(save_dir=save_dir)
+        catalog.refresh()
+
+        self.assertEqual(catalog.boards, {})
+        board: Optional[Board] = catalog.load("2")
+        self.assertEqual(board, boards[1])
+        self.assertEqual(list(catalog.boards), ["2"])
+        self.assertIsNone(catalog.load("3"))
+
+        files.delete_path(save_dir)
+
+    def test_load_deleted_save(self):
+        import files, os
+        from board import Board
+        from catalog import BoardCatalog
+
+        save_dir: str = save_dir_helper()
+
+        boards: list[Board] = boards_helper([1, 2, 3])
+        files.save_boards(boards[:2], save_dir=save_dir)
+        catalog: BoardCatalog = BoardCatalog(save_dir=save_dir)
+        catalog.refresh()
+        catalog.save(boards[2])
+
+        # Saves deleted behind the catalog's back are forgotten, even once loaded
+        os.remove(f"{save_dir}/1.board")
+        os.remove(f"{save_dir}/3.board")
+        self.assertIsNone(catalog.load("1"))
+        self.assertIsNone(catalog.load("3"))
+        self.assertEqual([meta.id for meta in catalog.saved_boards], ["2"])
+
+        files.delete_path(save_dir)
+
+    #
+    # ==================================================================================
+    # SAVE & DELETE
+    # ==================================================================================
+    def test_save_and_delete(self):
+        import files
+        from board import Board
+        from catalog import BoardCatalog
+
+        save_dir: str = save_dir_helper()
+
+        catalog: BoardCatalog = BoardCatalog(save_dir=save_dir)
+        catalog.refresh()
+        boards: list[Board] = boards_helper([5, 4, 6])
+        for board in boards:
+            catalog.save(board)
+        catalog.delete(boards[0])
+
+        self.assertEqual([board.id for board in catalog.filled_boards], ["4", "6"])
+        self.assertEqual(
+            files.get_all_saved_board_files(save_dir=save_dir), ["4.board", "6.board"]
+        )
+
+        catalog.refresh(force=True)
+        self.assertEqual([board.id for board in catalog.filled_boards], ["4", "6"])
+
+        files.delete_path(save_dir)
+
+
+class TestMainMethods(unittest.TestCase):
+    # ==================================================================================
+    # CLI
+    # ==================================================================================
+    def test_cli_generate_out(self):
+        import main, files, os, serde, contextlib, io
+        from board import Board
+
+        save_dir: str = save_dir_helper()
+        out_path: str = os.path.abspath(f"{save_dir}/boards.jsonl")
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            main.main(
+                ["generate", "--count", "3", "--start", "7", "--out", out_path]
+                + ["--difficulty", "hard"]
+            )
+
+        with open(out_path, "r") as file:
+            boards: list[Board] = [serde.deserialize(line) for line in file]
+
+        self.assertEqual([board.id for board in boards], ["7", "8", "9"])
+        for board in boards:
+            self.assertEqual(board.difficulty, Board.Difficulty.HARD)
+
+        files.delete_path(save_dir)
+
+    def test_cli_generate_misuse(self):
+        from unittest import mock
+        import main, contextlib, io, os, subprocess, sys
+
+        # Skipping duplicates only makes sense when saving
+        with contextlib.redirect_stderr(io.StringIO()) as errors:
+            with self.assertRaises(SystemExit):
+                main.main(["generate", "--count", "1", "--skip-duplicates"])
+        self.assertIn("--skip-duplicates", errors.getvalue())
+
+        # Generating a whole stack at once needs NumPy
+        with mock.patch("optional_numpy.HAS_NUMPY", False):
+            with contextlib.redirect_stderr(io.StringIO()) as errors:
+                with self.assertRaises(SystemExit):
+                    main.main(["generate", "--count", "1", "--stack"])
+        self.assertIn("--stack", errors.getvalue())
+
+        # A reader that stops early (Like `head`) isn't an error
+        cwd: str = os.path.dirname(os.path.abspath(main.__file__))
+        had_save_dir: bool = os.path.isdir(f"{cwd}/saved_boards")
+        process: subprocess.Popen[bytes] = subprocess.Popen(
+            [sys.executable, "main.py", "generate", "--count", "5000", "--out", "-"],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        assert process.stdout is not None and process.stderr is not None
+        process.stdout.readline()
+        process.stdout.close()
+        stderr: bytes = process.stderr.read()
+        process.wait()
+
+        self.assertNotIn(b"Traceback", stderr)
+        self.assertNotIn(b"BrokenPipeError", stderr)
+
+        # Nor does a run that doesn't save create the save directory
+        if not had_save_dir:
+            self.assertFalse(os.path.isdir(f"{cwd}/saved_boards"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -27,33 +27,34 @@ def get_int(text: str) -> int:
 def clear_all_saved_boards() -> None:
     import files
 
-    for file in files.get_all_saved_board_files(abs_path=True):
-        files.delete_path(file)
+    files.delete_paths(files.get_all_saved_board_files(abs_path=True))
 
 
 def clear_all_filled_boards() -> None:
     from board import Board
-    import files, json
+    import board_index, files
 
-    to_delete: list[str] = []
-    for file in files.get_all_saved_board_files(abs_path=True):
-        with open(file, "r") as f:
-            data = json.loads(f.read())
-            if data["type"] == Board.Type.FULL:
-                to_delete.append(file)
-    for file in to_delete:
-        files.delete_path(file)
+    # Only the index is consulted, instead of opening every save file
+    entries = board_index.update_index()
+    to_delete: list[str] = [
+        board_id for board_id, meta in entries.items() if meta.type == Board.Type.FULL
+    ]
+    files.delete_paths(f"{files.save_dir}/{board_id}.board" for board_id in to_delete)
+    for board_id in to_delete:
+        del entries[board_id]
+    board_index.write_index(entries)
 
 
 def clear_all_game_boards() -> None:
     from board import Board
-    import files, json
-
-    to_delete: list[str] = []
-    for file in files.get_all_saved_board_files(abs_path=True):
-        with open(file, "r") as f:
-            data = json.loads(f.read())
-            if data["type"] == Board.Type.GAME:
-                to_delete.append(file)
-    for file in to_delete:
-        files.delete_path(file)
+    import board_index, files
+
+    # Only the index is consulted, instead of opening every save file
+    entries = board_index.update_index()
+    to_delete: list[str] = [
+        board_id for board_id, meta in entries.items() if meta.type == Board.Type.GAME
+    ]
+    files.delete_paths(f"{files.save_dir}/{board_id}.board" for board_id in to_delete)
+    for board_id in to_delete:
+        del entries[board_id]
+    board_index.write_index(entries)
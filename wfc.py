@@ -0,0 +1,310 @@
+from typing import Iterable
+from rand_man import Rng
+
+# Every cell on the board is addressed by a flat index (`y * 9 + x`), so the cells are
+# ordered exactly like the row-major scans in `Board`. Candidates are stored as 9-bit
+# integer masks, where bit `n - 1` being set means the value `n` is still an option.
+ALL_OPTIONS: int = 0b111111111
+
+# Lookup tables mapping a flat cell index to its row, column, and 3x3 box
+ROW_OF: tuple[int, ...] = tuple(index // 9 for index in range(81))
+COL_OF: tuple[int, ...] = tuple(index % 9 for index in range(81))
+BOX_OF: tuple[int, ...] = tuple(
+    ((index // 9) // 3) * 3 + ((index % 9) // 3) for index in range(81)
+)
+
+# Every row, column, and 3x3 box, as tuples of flat cell indices
+UNITS: tuple[tuple[int, ...], ...] = (
+    tuple(tuple(index for index in range(81) if ROW_OF[index] == n) for n in range(9))
+    + tuple(tuple(index for index in range(81) if COL_OF[index] == n) for n in range(9))
+    + tuple(tuple(index for index in range(81) if BOX_OF[index] == n) for n in range(9))
+)
+
+# Every unit as an 81-bit mask of its cells (Bit `index` set means the cell is in it)
+UNIT_MASKS: tuple[int, ...] = tuple(sum(1 << index for index in unit) for unit in UNITS)
+
+# Lookup table mapping a flat cell index to the 3 units it is in
+CELL_UNITS: tuple[tuple[int, ...], ...] = tuple(
+    (ROW_OF[index], 9 + COL_OF[index], 18 + BOX_OF[index]) for index in range(81)
+)
+
+# Lookup table mapping a flat cell index to the 20 cells sharing a row, column or box
+PEERS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(
+        sorted(
+            peer
+            for peer in range(81)
+            if peer != index
+            and (
+                ROW_OF[peer] == ROW_OF[index]
+                or COL_OF[peer] == COL_OF[index]
+                or BOX_OF[peer] == BOX_OF[index]
+            )
+        )
+    )
+    for index in range(81)
+)
+PEER_MASKS: tuple[int, ...] = tuple(sum(1 << peer for peer in peers) for peers in PEERS)
+
+# Mask of all 81 cells
+ALL_CELLS: int = (1 << 81) - 1
+
+
+def nth_option(mask: int, n: int) -> int:
+    """Returns the `n`th (0-based) value, in ascending order, set in `mask`"""
+    for _ in range(n):
+        mask &= mask - 1  # Drop the lowest set bit
+    return (mask & -mask).bit_length()
+
+
+class Wave:
+    """The state of a board mid-collapse, with every cell's options as a bitmask"""
+
+    def __init__(self) -> None:
+        self.options: list[int] = []  # Remaining options of each cell
+        self.values: list[int] = []  # Collapsed value of each cell (0 = Not collapsed)
+        self.rows: list[int] = []  # Values placed in each row
+        self.cols: list[int] = []  # Values placed in each column
+        self.boxes: list[int] = []  # Values placed in each 3x3 box
+        # 81-bit mask of the cells each value (`value - 1`) is still an option for
+        self.positions: list[int] = []
+        # `positions` as of the last time there were no hidden singles left
+        self.settled: list[int] = []
+        # 81-bit mask of the uncollapsed cells with each entropy, so a bucket's cells are
+        # always in row-major order. Bucket 0 holds contradictions.
+        self.buckets: list[int] = []
+        # Undo stack of `(state, index, value)` for every collapse decision
+        self.history: list[tuple[tuple[list[int], ...], int, int]] = []
+        # Set when propagation finds a value with no possible cell left in a unit
+        self.contradiction: bool = False
+        self.resets: int = 0  # Number of times the whole wave was reset
+        self.backtracks: int = 0  # Number of collapse decisions that were undone
+        self.reset()
+
+    def reset(self) -> None:
+        """Resets the wave to its initial, fully uncollapsed, state"""
+        self.options = [ALL_OPTIONS] * 81
+        self.values = [0] * 81
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        self.positions = [ALL_CELLS] * 9
+        self.settled = [ALL_CELLS] * 9
+        self.buckets = [0] * 10
+        self.buckets[9] = ALL_CELLS
+        self.history = []
+        self.contradiction = False
+
+    def get_entropy(self, index: int) -> int:
+        """Returns the entropy of the cell at `index`"""
+        return self.options[index].bit_count()
+
+    def has_contradiction(self) -> bool:
+        """Checks if any uncollapsed cell, or any unit, has run out of options"""
+        return self.contradiction or self.buckets[0] != 0
+
+    def get_lowest_entropy(self) -> int:
+        """Returns the lowest, non-zero, cell entropy (10 if every cell is collapsed)"""
+        for entropy in range(1, 10):
+            if self.buckets[entropy] != 0:
+                return entropy
+
+        return 10
+
+    def get_lowest_entropy_mask(self) -> int:
+        """Returns an 81-bit mask of every cell with the lowest entropy (0 if there's none)"""
+        for entropy in range(1, 10):
+            if self.buckets[entropy] != 0:
+                return self.buckets[entropy]
+
+        return 0
+
+    def get_lowest_entropy_cells(self) -> list[int]:
+        """Returns every cell with the lowest entropy, in row-major order"""
+        cells: list[int] = []
+        mask: int = self.get_lowest_entropy_mask()
+        while mask:
+            lowest: int = mask & -mask
+            cells.append(lowest.bit_length() - 1)
+            mask ^= lowest
+
+        return cells
+
+    def remove_option(self, index: int, value: int) -> None:
+        """Removes `value` from the options of the uncollapsed cell at `index`"""
+        mask: int = self.options[index]
+        bit: int = 1 << (value - 1)
+        if mask & bit:
+            entropy: int = mask.bit_count()
+            self.buckets[entropy] &= ~(1 << index)
+            self.buckets[entropy - 1] |= 1 << index
+            self.options[index] = mask & ~bit
+            self.positions[value - 1] &= ~(1 << index)
+
+    def push(self, index: int, value: int) -> None:
+        """Records the current state, then collapses the cell at `index` into `value`"""
+        state: tuple[list[int], ...] = (
+            self.options[:],
+            self.values[:],
+            self.rows[:],
+            self.cols[:],
+            self.boxes[:],
+            self.positions[:],
+            self.settled[:],
+        )
+        self.history.append((state, index, value))
+        self.collapse(index, value)
+
+    def backtrack(self) -> bool:
+        """Undoes collapse decisions until the wave has no contradiction.
+
+        Every undone decision has its value excluded from the cell it was made
+        on. Returns False if the history ran out before the contradiction did.
+        """
+        while self.has_contradiction():
+            if len(self.history) == 0:
+                return False
+
+            state, index, value = self.history.pop()
+            (
+                self.options,
+                self.values,
+                self.rows,
+                self.cols,
+                self.boxes,
+                self.positions,
+                self.settled,
+            ) = state
+            self.contradiction = False
+            self.buckets = [0] * 10
+            for cell in range(81):
+                if self.values[cell] == 0:
+                    self.buckets[self.options[cell].bit_count()] |= 1 << cell
+
+            self.remove_option(index, value)
+            self.backtracks += 1
+
+        return True
+
+    def collapse(self, index: int, value: int) -> None:
+        """Collapses the cell at `index` into `value`, and propagates it to its peers"""
+        bit: int = 1 << (value - 1)
+        options: list[int] = self.options
+        buckets: list[int] = self.buckets
+
+        # The cell stops being a position for every one of its remaining options
+        remaining: int = options[index]
+        buckets[remaining.bit_count()] &= ~(1 << index)
+        positions: list[int] = self.positions
+        while remaining:
+            lowest: int = remaining & -remaining
+            positions[lowest.bit_length() - 1] &= ~(1 << index)
+            remaining ^= lowest
+        positions[value - 1] &= ~PEER_MASKS[index]
+
+        self.values[index] = value
+        options[index] = 0
+        self.rows[ROW_OF[index]] |= bit
+        self.cols[COL_OF[index]] |= bit
+        self.boxes[BOX_OF[index]] |= bit
+
+        # Remove the collapsed value as an option from every peer, only re-bucketing
+        # the peers that actually lost an option
+        for peer in PEERS[index]:
+            mask: int = options[peer]
+            if mask & bit:
+                entropy: int = mask.bit_count()
+                buckets[entropy] &= ~(1 << peer)
+                buckets[entropy - 1] |= 1 << peer
+                options[peer] = mask & ~bit
+
+    def find_hidden_single(self) -> tuple[int, int]:
+        """Returns `(index, value)` of a value with only one possible cell in a unit.
+
+        Only the units that lost a position since the wave was last settled are
+        checked. Returns `(-1, 0)` if there is none, and flags a contradiction if
+        a unit has a value that can't be placed anywhere.
+        """
+        positions: list[int] = self.positions
+        placed: list[int] = self.rows + self.cols + self.boxes
+        for value in range(9):
+            changed: int = self.settled[value] ^ positions[value]
+            if changed == 0:
+                continue
+
+            # A single changed cell can only affect its own 3 units
+            units: Iterable[int] = range(27)
+            if changed & (changed - 1) == 0:
+                units = CELL_UNITS[changed.bit_length() - 1]
+
+            for unit in units:
+                if not (UNIT_MASKS[unit] & changed) or ((placed[unit] >> value) & 1):
+                    continue
+
+                cells: int = positions[value] & UNIT_MASKS[unit]
+                if cells == 0:
+                    self.contradiction = True
+                    return (-1, 0)
+                if cells & (cells - 1) == 0:
+                    return (cells.bit_length() - 1, value + 1)
+
+        self.settled = positions[:]
+        return (-1, 0)
+
+    def propagate(self) -> None:
+        """Collapses every naked single and hidden single, until none are left.
+
+        Stops as soon as a contradiction is found, leaving it for the caller.
+        """
+        buckets: list[int] = self.buckets
+        while not self.has_contradiction():
+            # Naked single: A cell with only one option left
+            if buckets[1] != 0:
+                index: int = (buckets[1] & -buckets[1]).bit_length() - 1
+                self.collapse(index, self.options[index].bit_length())
+                continue
+
+            # Hidden single: A value with only one possible cell left in a unit
+            index, value = self.find_hidden_single()
+            if index == -1:
+                return
+            self.collapse(index, value)
+
+
+def generate(rng: Rng, backtrack: bool = False, propagate: bool = False) -> Wave:
+    """Runs a bitmask based Wave Function Collapse, using the seeded `rng`.
+
+    By default, consumes `rng` in exactly the same order as the `Cell` based
+    path in `Board.generate()`, so both produce the same board for the same
+    seed. With `backtrack`, a contradiction only rewinds the latest collapse
+    decisions instead of resetting the whole wave. With `propagate`, every
+    collapse is followed by collapsing all naked and hidden singles. Both
+    options change which board a seed generates.
+    Returns the fully collapsed wave.
+    """
+    wave: Wave = Wave()
+
+    while True:
+        # Recover if any cell has run out of options
+        if wave.has_contradiction():
+            if not (backtrack and wave.backtrack()):
+                wave.reset()
+                wave.resets += 1
+
+        # Find all cells with the lowest entropy, without listing them
+        cells: int = wave.get_lowest_entropy_mask()
+        if cells == 0:
+            # Every cell is collapsed, so the board is fully generated
+            return wave
+
+        # Randomly select one of those cells (Counted in row-major order), and
+        # collapse it into a random option
+        index: int = nth_option(cells, rng.random() % cells.bit_count()) - 1
+        mask: int = wave.options[index]
+        value: int = nth_option(mask, rng.random() % mask.bit_count())
+        if backtrack:
+            wave.push(index, value)
+        else:
+            wave.collapse(index, value)
+        if propagate:
+            wave.propagate()
@@ -0,0 +1,179 @@
+from typing import Any
+from optional_numpy import HAS_NUMPY, np
+import array, random, wfc
+
+# NumPy is optional (See `optional_numpy.py`). Only generating a whole stack needs it.
+if HAS_NUMPY:
+    # The 20 peers of every cell, as an `(81, 20)` array of flat indices
+    PEERS: Any = np.array(wfc.PEERS, dtype=np.intp)
+
+# Room for more values added to the drawn values, whenever they run out of it
+DRAW_BLOCK: int = 512
+
+
+class DrawStream:
+    """Every board's `Rng.random()` values, drawn in bulk instead of one at a time.
+
+    `Rng.random()` is `randint(0, sys.maxsize)`, which takes 64 random bits (Two
+    Mersenne Twister outputs, low word first) and retries while they're above
+    `sys.maxsize`. The Mersenne Twister of every board is run side by side on
+    an `(N, 624)` array of their states, one whole twist (624 outputs) at a time.
+    """
+
+    def __init__(self, seeds: list[int]) -> None:
+        # Every board's generator state, as a fresh `Rng(seed)` has it. A fresh
+        # state has used all of its outputs, so every board starts with a twist.
+        keys: array.array[int] = array.array("I")
+        for seed in seeds:
+            keys.extend(random.Random(seed).getstate()[1][:624])
+        self.keys: Any = np.frombuffer(keys, dtype=np.uint32).reshape(-1, 624).copy()
+
+        # Values drawn so far, and how many of them each board has drawn, and used
+        self.values: Any = np.zeros((len(seeds), DRAW_BLOCK), dtype=np.int64)
+        self.filled: Any = np.zeros(len(seeds), dtype=np.intp)
+        self.used: Any = np.zeros(len(seeds), dtype=np.intp)
+
+    def __twist(self, boards: Any) -> Any:
+        """Advances the states of `boards`, returning their next 624 outputs"""
+        old: Any = self.keys[boards]
+        new: Any = np.empty_like(old)
+
+        # Each word mixes with the one after it, and the one 397 places ahead.
+        # Past the first 227 words, that one's already been twisted.
+        mixed: Any = (old & 0x80000000) | (np.roll(old, -1, axis=1) & 0x7FFFFFFF)
+        mixed = (mixed >> 1) ^ ((mixed & 1) * np.uint32(0x9908B0DF))
+        new[:, :227] = old[:, 397:] ^ mixed[:, :227]
+        new[:, 227:454] = new[:, :227] ^ mixed[:, 227:454]
+        new[:, 454:623] = new[:, 227:396] ^ mixed[:, 454:623]
+        last: Any = (old[:, 623] & 0x80000000) | (new[:, 0] & 0x7FFFFFFF)
+        new[:, 623] = new[:, 396] ^ (last >> 1) ^ ((last & 1) * np.uint32(0x9908B0DF))
+        self.keys[boards] = new
+
+        # Tempering
+        new ^= new >> 11
+        new ^= (new << 7) & 0x9D2C5680
+        new ^= (new << 15) & 0xEFC60000
+        new ^= new >> 18
+        return new
+
+    def __refill(self, boards: Any) -> None:
+        """Draws the next values of `boards`, from a twist of their generators"""
+        words: Any = self.__twist(boards).reshape(len(boards), -1, 2).astype(np.int64)
+        # Values above `sys.maxsize` are the retries, so they're skipped
+        kept: Any = words[:, :, 1] < (1 << 31)
+        spots: Any = self.filled[boards, None] + kept.cumsum(axis=1) - 1
+
+        end: int = int(spots[:, -1].max()) + 1
+        if end > self.values.shape[1]:
+            grown: Any = np.zeros((len(self.values), end + DRAW_BLOCK), dtype=np.int64)
+            grown[:, : self.values.shape[1]] = self.values
+            self.values = grown
+        self.values[np.broadcast_to(boards[:, None], kept.shape)[kept], spots[kept]] = (
+            words[:, :, 0] | (words[:, :, 1] << 32)
+        )[kept]
+        self.filled[boards] = spots[:, -1] + 1
+
+    def take(self, boards: Any) -> Any:
+        """Returns the next value of each board in `boards`"""
+        empty: Any = boards[self.used[boards] >= self.filled[boards]]
+        while len(empty) != 0:
+            self.__refill(empty)
+            empty = empty[self.used[empty] >= self.filled[empty]]
+
+        values: Any = self.values[boards, self.used[boards]]
+        self.used[boards] += 1
+        return values
+
+
+class WaveStack:
+    """The state of many boards mid-collapse, advanced together with array operations.
+
+    Every board follows exactly the same steps as `wfc.generate()` with its own
+    seed, so they all end up identical to generating them one at a time.
+    """
+
+    def __init__(self, seeds: list[int]) -> None:
+        self.seeds: list[int] = seeds
+        self.draws: DrawStream = DrawStream(seeds)
+        # Collapsed value of every cell of every board (0 = Not collapsed)
+        self.values: Any = np.zeros((len(seeds), 81), dtype=np.uint8)
+        self.resets: Any = np.zeros(len(seeds), dtype=np.intp)  # Resets per board
+
+        # Only the boards still being collapsed are kept in the working arrays
+        self.boards: Any = np.arange(len(seeds))  # Index of each unfinished board
+        # Options of every cell (`[board, index, value - 1]`, none once collapsed)
+        self.options: Any = np.ones((len(seeds), 81, 9), dtype=bool)
+        self.counts: Any = np.full((len(seeds), 81), 9, dtype=np.uint8)  # Entropies
+        self.open_cells: Any = np.ones((len(seeds), 81), dtype=bool)  # Uncollapsed
+        self.working: Any = np.zeros((len(seeds), 81), dtype=np.uint8)  # Their values
+
+    def step(self) -> None:
+        """Collapses a cell of every unfinished board"""
+        options, counts, open_cells = self.options, self.counts, self.open_cells
+
+        # Reset only the boards that ran out of options somewhere
+        contradictions: Any = (open_cells & (counts == 0)).any(axis=1)
+        if contradictions.any():
+            options[contradictions] = True
+            counts[contradictions] = 9
+            open_cells[contradictions] = True
+            self.working[contradictions] = 0
+            self.resets[self.boards[contradictions]] += 1
+
+        # Boards with every cell collapsed are done
+        entropies: Any = np.where(open_cells, counts, 10)
+        lowest: Any = entropies.min(axis=1)
+        done: Any = lowest == 10
+        if done.any():
+            self.values[self.boards[done]] = self.working[done]
+            keep: Any = ~done
+            self.boards = self.boards[keep]
+            self.options, self.counts = options[keep], counts[keep]
+            self.open_cells, self.working = open_cells[keep], self.working[keep]
+            options, counts, open_cells = self.options, self.counts, self.open_cells
+            entropies, lowest = entropies[keep], lowest[keep]
+            if len(self.boards) == 0:
+                return
+
+        # Pick one of the lowest entropy cells in row-major order, then one of its
+        # options in ascending order, just like `wfc.generate()`
+        rows: Any = np.arange(len(self.boards))
+        ties: Any = entropies == lowest[:, None]
+        picks: Any = self.draws.take(self.boards) % ties.sum(axis=1)
+        cells: Any = (ties.cumsum(axis=1, dtype=np.uint8) > picks[:, None]).argmax(
+            axis=1
+        )
+        picks = self.draws.take(self.boards) % lowest
+        chosen: Any = (
+            options[rows, cells].cumsum(axis=1, dtype=np.uint8) > picks[:, None]
+        ).argmax(axis=1)
+
+        # Collapse the cells, and remove their values from their peers' options
+        self.working[rows, cells] = chosen + 1
+        open_cells[rows, cells] = False
+        options[rows, cells] = False
+        counts[rows, cells] = 0
+        peers: Any = PEERS[cells]
+        lost: Any = options[rows[:, None], peers, chosen[:, None]]
+        options[rows[:, None], peers, chosen[:, None]] = False
+        counts[rows[:, None], peers] -= lost
+
+    def collapse(self) -> Any:
+        """Collapses every board, returning their values as an `(N, 81)` array"""
+        while len(self.boards) != 0:
+            self.step()
+
+        return self.values
+
+
+def generate(seeds: list[int]) -> WaveStack:
+    """Generates a board for every seed at once, returning the fully collapsed stack.
+
+    Every board is identical to `wfc.generate()` with `Rng(seed)`.
+    """
+    if not HAS_NUMPY:
+        raise ImportError("NumPy is needed for `wfc_stack`, but it isn't installed!")
+
+    wave: WaveStack = WaveStack(seeds)
+    wave.collapse()
+    return wave